@@ -12,6 +12,7 @@ from datetime import datetime, timedelta
 from pykrx import stock
 import yfinance as yf
 
+from src.core.config import get_settings
 from src.core.database import get_db, get_async_db
 from src.core.security import get_current_user, User
 from src.models.analysis import AnalysisSession, ReportSection, AgentExecution, AnalysisStatus, ProgressEvent, MessageLog
@@ -38,7 +39,9 @@ router = APIRouter()
 logger = logging.getLogger(__name__)
 
 # Global managers (would be properly initialized in lifespan)
-analysis_manager = AnalysisManager()
+analysis_manager = AnalysisManager(
+    max_concurrent_analyses=get_settings().MAX_CONCURRENT_ANALYSES
+)
 
 # 엔드포인트 순서 맞추기 (CRUD, status, metrics, config 순서)
 # 1. 분석 세션 생성 (POST /start)
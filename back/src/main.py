@@ -164,6 +164,13 @@ async def lifespan(app: FastAPI):
         else:
             logger.warning(f"⚠️ Portfolio database seeding failed: {portfolio_seeding_result.get('error', 'Unknown error')}")
         
+        # Resume analyses interrupted by the last shutdown from their checkpoints
+        try:
+            from src.api.analysis import analysis_manager
+            await analysis_manager.resume_interrupted_analyses()
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to resume interrupted analyses: {e}")
+        
         # Initialize other services here (Redis, external APIs, etc.)
         
         logger.info("Application startup completed")
@@ -4,6 +4,7 @@ import asyncio
 import logging
 import time
 import uuid
+from collections import deque
 from typing import Dict, Any, Optional, List, AsyncGenerator
 from datetime import datetime
 from dataclasses import dataclass
@@ -50,6 +51,8 @@ class AnalysisManager:
         self.max_concurrent_analyses = max_concurrent_analyses
         self.active_analyses: Dict[str, AnalysisTask] = {}
         self.message_queues: Dict[str, asyncio.Queue] = {}
+        # interrupted sessions waiting for a free slot: (session_id, config, user)
+        self.resume_queue: deque = deque()
         self.db_manager = None
         self._initialized = False
         
@@ -87,6 +90,73 @@ class AnalysisManager:
         
         logger.info(f"Started analysis {session_id[:8]} for user {user.username}")
     
+    async def resume_interrupted_analyses(self) -> int:
+        """Restart sessions left running by a previous server process.
+
+        Each session resumes from its graph checkpoint, so completed analyst and
+        debate stages are not run again. At most max_concurrent_analyses run at
+        once; the rest wait in resume_queue and start as running analyses finish.
+        Sessions that cannot be resumed are marked failed.
+        """
+        if not self._initialized:
+            await self.initialize()
+        
+        with self.db_manager.get_session() as db:
+            interrupted = db.execute(
+                select(AnalysisSession).where(AnalysisSession.status == AnalysisStatus.RUNNING)
+            ).scalars().all()
+            sessions = [
+                (
+                    session.session_id,
+                    session.config_snapshot,
+                    User(id=session.user_id, username=session.username),
+                )
+                for session in interrupted
+            ]
+        
+        queued = {session_id for session_id, _, _ in self.resume_queue}
+        for session_id, config_snapshot, user in sessions:
+            if session_id in self.active_analyses or session_id in queued:
+                continue
+            try:
+                config = AnalysisConfigRequest(**config_snapshot)
+            except Exception as e:
+                await self._fail_resume(session_id, None, user, f"Invalid config snapshot: {e}")
+                continue
+            self.resume_queue.append((session_id, config, user))
+        
+        resumed = await self._start_queued_resumes()
+        if resumed:
+            logger.info(f"Resumed {resumed} interrupted analyses")
+        if self.resume_queue:
+            logger.info(f"{len(self.resume_queue)} interrupted analyses queued until a slot is free")
+        return resumed
+    
+    async def _start_queued_resumes(self) -> int:
+        """Start queued interrupted sessions while there are free analysis slots."""
+        started = 0
+        while self.resume_queue and len(self.active_analyses) < self.max_concurrent_analyses:
+            session_id, config, user = self.resume_queue.popleft()
+            if session_id in self.active_analyses:
+                continue
+            try:
+                await self.run_analysis(session_id, config, user)
+                started += 1
+            except Exception as e:
+                await self._fail_resume(session_id, config, user, str(e))
+        return started
+    
+    async def _fail_resume(self, session_id: str, config, user: User, reason: str) -> None:
+        """Mark an interrupted session that could not be resumed as failed."""
+        logger.error(f"Failed to resume analysis {session_id[:8]}: {reason}")
+        try:
+            await self._fail_analysis(
+                AnalysisTask(session_id=session_id, config=config, user=user),
+                f"Could not resume after server restart: {reason}",
+            )
+        except Exception as e:
+            logger.error(f"Failed to mark analysis {session_id[:8]} as failed: {e}")
+    
     async def _execute_analysis(self, analysis_task: AnalysisTask) -> None:
         """Execute the actual analysis."""
         session_id = analysis_task.session_id
@@ -138,7 +208,9 @@ class AnalysisManager:
                 "max_debate_rounds": config.research_depth,
                 "max_risk_discuss_rounds": config.research_depth,
                 "llm_provider": config.llm_provider.value,
-                "session_id": session_id[:8]  # Short ID for collections
+                "session_id": session_id[:8],  # Short ID for collections
+                # checkpoint every node so a restarted server can resume the session
+                "checkpointing": True,
             })
             
             
@@ -152,13 +224,6 @@ class AnalysisManager:
             
             analysis_task.graph = graph
             
-            # Create initial state
-            init_state = graph.propagator.create_initial_state(
-                config.ticker, 
-                config.analysis_date
-            )
-            graph_args = graph.propagator.get_graph_args()
-            
             # Update progress to data collection stage
             with self.db_manager.get_session() as db:
                 result = db.execute(
@@ -180,12 +245,7 @@ class AnalysisManager:
                     db.commit()
             
             # Process analysis stream
-            await self._process_analysis_stream(
-                analysis_task,
-                graph,
-                init_state,
-                graph_args
-            )
+            await self._process_analysis_stream(analysis_task, graph)
             
             # Complete analysis
             await self._complete_analysis(analysis_task)
@@ -199,13 +259,13 @@ class AnalysisManager:
                 del self.active_analyses[session_id]
             if session_id in self.message_queues:
                 del self.message_queues[session_id]
+            # a freed slot goes to the next interrupted session waiting to resume
+            await self._start_queued_resumes()
     
     async def _process_analysis_stream(
         self,
         analysis_task: AnalysisTask,
-        graph: Any,
-        init_state: Any,
-        graph_args: Dict[str, Any]
+        graph: Any
     ) -> None:
         """Process the analysis stream and update database."""
         session_id = analysis_task.session_id
@@ -216,7 +276,13 @@ class AnalysisManager:
         # Process graph stream
         trace = []
         
-        for chunk in graph.graph.stream(init_state, **graph_args):
+        # The session id is the checkpoint run id: an interrupted session resumes
+        # from its last completed node instead of starting over
+        async for chunk in graph.astream(
+            analysis_task.config.ticker,
+            analysis_task.config.analysis_date,
+            run_id=session_id
+        ):
             # Check if analysis was cancelled
             if analysis_task.status == "cancelled":
                 break
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 import datetime
 import typer
 from pathlib import Path
@@ -1096,10 +1096,136 @@ def run_analysis():
         update_display(layout)
 
 
+def read_watchlist(path: Path):
+    """Read tickers from a watchlist file (one per line or comma separated, # comments)."""
+    tickers = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.split("#", 1)[0]
+        tickers.extend(t.strip() for t in line.split(",") if t.strip())
+    return tickers
+
+
 @app.command()
 def analyze():
     run_analysis()
 
 
+@app.command()
+def prefetch(
+    tickers: Optional[List[str]] = typer.Argument(None, help="Tickers to prefetch"),
+    watchlist: Optional[Path] = typer.Option(
+        None, "--watchlist", "-w", help="File with one ticker per line"
+    ),
+    chunk_size: int = typer.Option(50, help="Symbols per bulk download"),
+    max_retries: int = typer.Option(3, help="Download attempts per chunk"),
+    evict: bool = typer.Option(
+        True,
+        help="Delete legacy *-YFin-data-*.csv caches and store files unused for price_store_max_age_days",
+    ),
+):
+    """Warm the local price store for a watchlist with bulk downloads."""
+    from tradingagents.dataflows.price_store import get_price_store, prefetch_prices
+
+    symbols = list(tickers or [])
+    if watchlist:
+        symbols.extend(read_watchlist(watchlist))
+    if not symbols:
+        console.print("[red]No tickers given. Pass tickers or --watchlist.[/red]")
+        raise typer.Exit(code=1)
+
+    if evict:
+        removed = get_price_store().evict_stale()
+        if removed:
+            console.print(f"Evicted {removed} stale price cache files")
+
+    start_time = time.time()
+    with console.status(f"Prefetching prices for {len(symbols)} tickers..."):
+        status = prefetch_prices(symbols, chunk_size=chunk_size, max_retries=max_retries)
+
+    table = Table(title="Price Prefetch", box=box.SIMPLE_HEAD)
+    table.add_column("Status")
+    table.add_column("Count", justify="right")
+    table.add_column("Tickers")
+    for state in ["updated", "reloaded", "fresh", "failed"]:
+        symbols_in_state = [s for s, st in status.items() if st == state]
+        if symbols_in_state:
+            table.add_row(state, str(len(symbols_in_state)), ", ".join(symbols_in_state))
+    console.print(table)
+    console.print(f"Done in {time.time() - start_time:.1f}s")
+
+    if any(st == "failed" for st in status.values()):
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def batch(
+    tickers: Optional[List[str]] = typer.Argument(None, help="Tickers to analyze"),
+    watchlist: Optional[Path] = typer.Option(
+        None, "--watchlist", "-w", help="File with one ticker per line"
+    ),
+    dates: Optional[List[str]] = typer.Option(
+        None, "--date", "-d", help="Analysis date YYYY-MM-DD (repeatable, default today)"
+    ),
+    analysts: Optional[List[AnalystType]] = typer.Option(
+        None, "--analyst", "-a", help="Analyst to include (repeatable, default all)"
+    ),
+    max_concurrency: int = typer.Option(
+        DEFAULT_CONFIG["batch_max_concurrency"], help="Analyses run at once"
+    ),
+    research_depth: int = typer.Option(1, help="Debate and risk discussion rounds"),
+):
+    """Analyze every (ticker, date) pair with one shared graph and print results as they finish."""
+    symbols = list(tickers or [])
+    if watchlist:
+        symbols.extend(read_watchlist(watchlist))
+    if not symbols:
+        console.print("[red]No tickers given. Pass tickers or --watchlist.[/red]")
+        raise typer.Exit(code=1)
+
+    dates = dates or [datetime.datetime.now().strftime("%Y-%m-%d")]
+    for date_str in dates:
+        try:
+            datetime.datetime.strptime(date_str, "%Y-%m-%d")
+        except ValueError:
+            console.print(f"[red]Invalid date: {date_str} (use YYYY-MM-DD)[/red]")
+            raise typer.Exit(code=1)
+
+    config = DEFAULT_CONFIG.copy()
+    config["max_debate_rounds"] = research_depth
+    config["max_risk_discuss_rounds"] = research_depth
+    config["batch_max_concurrency"] = max_concurrency
+
+    selected_analysts = [analyst.value for analyst in (analysts or list(AnalystType))]
+    graph = TradingAgentsGraph(selected_analysts, config=config)
+
+    jobs = [(symbol, date_str) for symbol in symbols for date_str in dates]
+    console.print(
+        f"Running {len(jobs)} analyses ({max_concurrency} at a time) "
+        f"with analysts: {', '.join(selected_analysts)}"
+    )
+
+    table = Table(title="Batch Analysis", box=box.SIMPLE_HEAD)
+    table.add_column("Ticker")
+    table.add_column("Date")
+    table.add_column("Decision")
+
+    start_time = time.time()
+    failed = 0
+    for result in graph.propagate_many(jobs, max_concurrency=max_concurrency):
+        if result["error"] is not None:
+            failed += 1
+            decision = f"[red]failed: {result['error']}[/red]"
+        else:
+            decision = result["decision"].strip()
+        console.print(f"{result['ticker']} {result['trade_date']}: {decision}")
+        table.add_row(result["ticker"], result["trade_date"], decision)
+
+    console.print(table)
+    console.print(f"Done in {time.time() - start_time:.1f}s ({failed} failed)")
+
+    if failed:
+        raise typer.Exit(code=1)
+
+
 if __name__ == "__main__":
     app()
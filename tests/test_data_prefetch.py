@@ -0,0 +1,76 @@
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import tradingagents.dataflows.interface as interface
+from tradingagents.dataflows.config import get_config, set_config
+from tradingagents.dataflows.price_store import PriceStore, get_price_store
+from tradingagents.graph.data_prefetch import DEFAULT_INDICATORS, DataPrefetcher
+
+TICKER = "PREFETCHTEST"
+TRADE_DATE = "2024-06-28"
+
+
+@pytest.fixture
+def stored_prices(tmp_path, monkeypatch):
+    """A year of synthetic bars in a temporary price store; downloads return nothing."""
+    previous = get_config()
+    set_config({"data_cache_dir": str(tmp_path)})
+    monkeypatch.setattr(
+        PriceStore, "_download", staticmethod(lambda symbol, start, end: np.empty(0))
+    )
+
+    dates = pd.bdate_range(end=TRADE_DATE, periods=260)
+    close = 100 + np.cumsum(np.random.default_rng(0).normal(0, 1, len(dates)))
+    frame = pd.DataFrame(
+        {
+            "Open": close,
+            "High": close + 1,
+            "Low": close - 1,
+            "Close": close,
+            "Volume": 1_000_000.0,
+        },
+        index=dates,
+    )
+    get_price_store().write(TICKER, PriceStore.frame_to_bars(frame), replace=True)
+    yield
+    set_config(previous)
+
+
+def test_default_indicators_are_supported():
+    assert set(DEFAULT_INDICATORS) <= set(interface.BEST_IND_PARAMS)
+
+
+def test_prefetch_computes_every_default_indicator(stored_prices):
+    prefetcher = DataPrefetcher({"online_tools": True})
+    status = prefetcher.prefetch(TICKER, TRADE_DATE, ["market"])
+    assert status["indicators"]
+
+    report = interface.get_stock_stats_indicators_window_batch(
+        TICKER, DEFAULT_INDICATORS, TRADE_DATE, 30, True
+    )
+    for indicator in DEFAULT_INDICATORS:
+        assert f"## {indicator} values from" in report
+    assert f"{TRADE_DATE}: {interface.NON_TRADING_DAY}" not in report
+
+
+def test_async_tools_reuse_prefetched_results(monkeypatch):
+    calls = []
+
+    def fake_naver_news(query, curr_date, look_back_days):
+        calls.append(query)
+        return f"## {query} naver news"
+
+    async def unexpected(*args):
+        raise AssertionError("the async tool should reuse the prefetched result")
+
+    monkeypatch.setattr(interface, "get_naver_news", fake_naver_news)
+    monkeypatch.setattr(interface.naver_news_utils, "aget_naver_news", unexpected)
+
+    interface.get_naver_news_sync("Prefetch  Test", TRADE_DATE, 7)
+    result = asyncio.run(interface.aget_naver_news(" Prefetch Test", TRADE_DATE, 7))
+
+    assert result == "## Prefetch Test naver news"
+    assert calls == ["Prefetch Test"]
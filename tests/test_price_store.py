@@ -0,0 +1,93 @@
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import tradingagents.dataflows.interface as interface
+from tradingagents.dataflows.config import get_config, set_config
+from tradingagents.dataflows.price_store import PriceStore, get_price_store
+
+
+def _frame(dates):
+    close = np.linspace(100, 110, len(dates))
+    return pd.DataFrame(
+        {
+            "Open": close,
+            "High": close + 1,
+            "Low": close - 1,
+            "Close": close,
+            "Volume": 1_000_000,
+            "Dividends": 0.0,
+            "Stock Splits": 0.0,
+        },
+        index=pd.DatetimeIndex(dates, name="Date"),
+    )
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """A price store in a temporary data_cache_dir; downloads return nothing."""
+    previous = get_config()
+    set_config({"data_cache_dir": str(tmp_path)})
+    monkeypatch.setattr(
+        PriceStore, "_download", staticmethod(lambda symbol, start, end: np.empty(0))
+    )
+    yield get_price_store()
+    set_config(previous)
+
+
+def _age(store, symbol, days):
+    past = time.time() - days * 86400
+    os.utime(store._path(symbol), (past, past))
+
+
+def test_refresh_evicts_stale_files_at_most_once_per_interval(store, tmp_path):
+    bars = PriceStore.frame_to_bars(_frame(pd.bdate_range("2024-01-01", periods=5)))
+    for symbol in ("OLD", "NEW", "KEEP"):
+        store.write(symbol, bars)
+    for symbol in ("OLD", "KEEP"):
+        _age(store, symbol, store.max_age_days + 1)
+    legacy = tmp_path / "OLD-YFin-data-2020-01-01-2024-01-01.csv"
+    legacy.write_text("Date,Close\n")
+
+    store.refresh("KEEP")
+
+    assert not os.path.exists(store._path("OLD"))
+    assert os.path.exists(store._path("NEW"))
+    # the symbol being refreshed and the legacy CSVs are left alone
+    assert os.path.exists(store._path("KEEP"))
+    assert legacy.exists()
+
+    store.write("OLD", bars)
+    _age(store, "OLD", store.max_age_days + 1)
+    store.refresh("NEW")
+    assert os.path.exists(store._path("OLD"))
+
+
+def test_store_and_history_branches_return_the_same_format(store, monkeypatch):
+    dates = pd.bdate_range("2024-03-01", "2024-03-29")
+    history = _frame(dates)
+    history.index = history.index.tz_localize("America/New_York")
+
+    class FakeTicker:
+        def __init__(self, symbol):
+            pass
+
+        def history(self, start, end):
+            return history[(history.index >= start) & (history.index < end)]
+
+    # bypass the tool result memo so the second call reads the store
+    get_YFin_data_online = interface.get_YFin_data_online.__wrapped__
+    monkeypatch.setattr(interface.yf, "Ticker", FakeTicker)
+    from_history = get_YFin_data_online("FMT", "2024-03-04", "2024-03-15")
+
+    store.write("FMT", PriceStore.frame_to_bars(_frame(dates)))
+    monkeypatch.setattr(store, "_is_fresh", lambda symbol: True)
+    monkeypatch.setattr(interface.yf, "Ticker", None)
+    from_store = get_YFin_data_online("FMT", "2024-03-04", "2024-03-15")
+
+    # identical apart from the "Data retrieved on" header line
+    assert from_store.splitlines()[3:] == from_history.splitlines()[3:]
+    assert "2024-03-04,100" in from_store
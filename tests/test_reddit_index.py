@@ -0,0 +1,110 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from tradingagents.dataflows import reddit_utils
+from tradingagents.dataflows.config import get_config, set_config
+from tradingagents.dataflows.reddit_utils import RedditIndex
+
+
+def _post(title, day, ups, selftext=""):
+    created = datetime(2024, 6, day, 12, tzinfo=timezone.utc).timestamp()
+    return {
+        "title": title,
+        "selftext": selftext,
+        "url": f"https://reddit.com/{title}",
+        "ups": ups,
+        "created_utc": created,
+    }
+
+
+def _write_jsonl(path, posts):
+    with open(path, "w", encoding="utf-8") as f:
+        for post in posts:
+            f.write(json.dumps(post) + "\n")
+
+
+@pytest.fixture
+def reddit_data(tmp_path):
+    """Two subreddit files in one category, plus a temporary data_cache_dir."""
+    previous = get_config()
+    set_config({"data_cache_dir": str(tmp_path / "cache")})
+
+    category_dir = tmp_path / "reddit_data" / "company_news"
+    category_dir.mkdir(parents=True)
+    _write_jsonl(
+        category_dir / "stocks.jsonl",
+        [
+            _post("s-day2-low", 2, 5),
+            _post("s-day1-low", 1, 1),
+            _post("s-day1-high", 1, 50, "Apple earnings"),
+            _post("s-day1-mid", 1, 10, "AAPL guidance"),
+            _post("s-day3-high", 3, 99),
+        ],
+    )
+    _write_jsonl(
+        category_dir / "investing.jsonl",
+        [_post("i-day1", 1, 7, "apple"), _post("i-day2", 2, 3)],
+    )
+    yield tmp_path / "reddit_data", category_dir
+    set_config(previous)
+
+
+def test_top_posts_are_ordered_by_date_then_upvotes(reddit_data):
+    _, category_dir = reddit_data
+    index = RedditIndex(str(category_dir.parent / "index.sqlite3"))
+    path = next(p for p in index.ensure_indexed(str(category_dir)) if p.endswith("stocks.jsonl"))
+
+    posts = index.top_posts(path, "2024-06-01", "2024-06-02", limit_per_day=2)
+
+    assert [(day, post["title"]) for day, post in posts] == [
+        ("2024-06-01", "s-day1-high"),
+        ("2024-06-01", "s-day1-mid"),
+        ("2024-06-02", "s-day2-low"),
+    ]
+
+
+def test_modified_file_is_reindexed(reddit_data):
+    _, category_dir = reddit_data
+    index = RedditIndex(str(category_dir.parent / "index.sqlite3"))
+    path = str(category_dir / "investing.jsonl")
+    index.ensure_indexed(str(category_dir))
+
+    _write_jsonl(category_dir / "investing.jsonl", [_post("i-new", 4, 1)])
+    index.ensure_indexed(str(category_dir))
+
+    posts = index.top_posts(path, "2024-06-01", "2024-06-30", limit_per_day=5)
+    assert [post["title"] for _, post in posts] == ["i-new"]
+
+
+def test_match_results_are_cached_per_key(reddit_data):
+    _, category_dir = reddit_data
+    index = RedditIndex(str(category_dir.parent / "index.sqlite3"))
+    path = str(category_dir / "stocks.jsonl")
+    index.ensure_indexed(str(category_dir))
+    checked = []
+
+    def matcher(post):
+        checked.append(post["title"])
+        return "apple" in post["selftext"].lower()
+
+    first = index.top_posts(path, "2024-06-01", "2024-06-03", 5, "apple", matcher)
+    second = index.top_posts(path, "2024-06-01", "2024-06-03", 5, "apple", matcher)
+
+    assert [post["title"] for _, post in first] == ["s-day1-high"]
+    assert second == first
+    assert sorted(checked) == sorted(
+        ["s-day1-high", "s-day1-mid", "s-day1-low", "s-day2-low", "s-day3-high"]
+    )
+
+
+def test_window_fetch_filters_company_news_and_orders_by_date(reddit_data):
+    data_path, _ = reddit_data
+
+    posts = reddit_utils.fetch_top_from_category_window(
+        "company_news", "2024-06-01", "2024-06-02", 4, query="AAPL", data_path=str(data_path)
+    )
+
+    assert [post["posted_date"] for post in posts] == ["2024-06-01"] * len(posts)
+    assert {post["title"] for post in posts} == {"s-day1-high", "s-day1-mid", "i-day1"}
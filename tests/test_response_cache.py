@@ -0,0 +1,85 @@
+import time
+from datetime import date, timedelta
+
+import pytest
+
+from tradingagents.dataflows import http_utils
+from tradingagents.dataflows.config import get_config, set_config
+from tradingagents.dataflows.http_utils import ResponseCache, cached_response
+
+
+@pytest.fixture
+def response_cache(tmp_path):
+    """A temporary data_cache_dir, so get_response_cache() opens a fresh SQLite file."""
+    previous = get_config()
+    set_config({"data_cache_dir": str(tmp_path), "response_cache_ttl_seconds": 60})
+    yield http_utils.get_response_cache()
+    set_config(previous)
+
+
+def _expires_at(cache, key):
+    with cache._connect() as conn:
+        return conn.execute(
+            "SELECT expires_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()[0]
+
+
+def test_make_key_ignores_secrets_and_none():
+    key = ResponseCache.make_key("news", {"ticker": "AAPL", "from": "2024-01-01"})
+
+    assert key == ResponseCache.make_key(
+        "news", {"from": "2024-01-01", "ticker": "AAPL", "token": "secret", "to": None}
+    )
+    assert key != ResponseCache.make_key("news", {"ticker": "MSFT", "from": "2024-01-01"})
+    assert key != ResponseCache.make_key("insider", {"ticker": "AAPL", "from": "2024-01-01"})
+
+
+def test_past_ranges_are_immutable_and_current_ranges_expire(response_cache):
+    calls = []
+
+    @cached_response("test_news", end_date_param="end_date")
+    def fetch(ticker, end_date):
+        calls.append((ticker, end_date))
+        return [f"{ticker} {end_date}"]
+
+    past = (date.today() - timedelta(days=30)).isoformat()
+    today = date.today().isoformat()
+    for end_date in (past, today):
+        assert fetch("AAPL", end_date) == [f"AAPL {end_date}"]
+        assert fetch("AAPL", end_date=end_date) == [f"AAPL {end_date}"]
+    assert calls == [("AAPL", past), ("AAPL", today)]
+
+    past_key = response_cache.make_key("test_news", {"ticker": "AAPL", "end_date": past})
+    today_key = response_cache.make_key("test_news", {"ticker": "AAPL", "end_date": today})
+    assert _expires_at(response_cache, past_key) is None
+    assert _expires_at(response_cache, today_key) == pytest.approx(time.time() + 60, abs=5)
+
+
+def test_empty_results_are_not_stored(response_cache):
+    calls = []
+
+    @cached_response("test_empty", end_date_param="end_date")
+    def fetch(ticker, end_date):
+        calls.append(ticker)
+        return []
+
+    fetch("AAPL", "2020-01-01")
+    fetch("AAPL", "2020-01-01")
+    assert calls == ["AAPL", "AAPL"]
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"), ttl_seconds=-1)
+    cache.set("ns", "stale", {"v": 1}, immutable=False)
+    cache.set("ns", "kept", {"v": 2}, immutable=True)
+
+    assert cache.get("ns", "stale") == (False, None)
+    assert cache.get("ns", "kept") == (True, {"v": 2})
+
+
+def test_no_ttl_keeps_every_entry(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"), ttl_seconds=None)
+    cache.set("ns", "key", [1, 2], immutable=False)
+
+    assert _expires_at(cache, "key") is None
+    assert cache.get("ns", "key") == (True, [1, 2])
@@ -0,0 +1,51 @@
+import asyncio
+import threading
+
+from tradingagents.dataflows.utils import SingleFlightCache
+
+
+def test_sync_caller_on_the_owning_loop_does_not_deadlock():
+    cache = SingleFlightCache()
+    results = {}
+
+    async def slow():
+        await asyncio.sleep(0.05)
+        return "async"
+
+    async def main():
+        owner = asyncio.create_task(cache.aget_or_compute("key", slow))
+        await asyncio.sleep(0)  # let the owner claim the flight
+        # a sync tool called from a coroutine on the same loop thread
+        results["sync"] = cache.get_or_compute("key", lambda: "sync")
+        results["async"] = await owner
+
+    thread = threading.Thread(target=asyncio.run, args=(main(),), daemon=True)
+    thread.start()
+    thread.join(timeout=5)
+
+    assert not thread.is_alive(), "sync caller blocked the loop running the flight"
+    assert results == {"sync": "sync", "async": "async"}
+    assert cache.get("key") == "async"
+
+
+def test_sync_caller_in_another_thread_joins_the_async_flight():
+    cache = SingleFlightCache()
+    calls = []
+
+    async def slow():
+        calls.append("async")
+        await asyncio.sleep(0.1)
+        return "async"
+
+    def compute():
+        calls.append("sync")
+        return "sync"
+
+    async def main():
+        owner = asyncio.create_task(cache.aget_or_compute("key", slow))
+        await asyncio.sleep(0)
+        joined = await asyncio.to_thread(cache.get_or_compute, "key", compute)
+        return joined, await owner
+
+    assert asyncio.run(main()) == ("async", "async")
+    assert calls == ["async"]
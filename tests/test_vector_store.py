@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+from tradingagents.agents.utils.memory import FinancialSituationMemory, HashingEmbedder
+from tradingagents.agents.utils.vector_store import NumpyVectorStore, create_vector_store
+
+
+def test_numpy_store_returns_nearest_rows_first():
+    store = NumpyVectorStore()
+    store.add(
+        documents=["x", "y", "xy"],
+        metadatas=[{"recommendation": r} for r in ("rx", "ry", "rxy")],
+        embeddings=[[1, 0], [0, 1], [1, 1]],
+    )
+
+    results = store.query([1, 0.1], 2)
+
+    assert [document for document, _, _ in results] == ["x", "xy"]
+    assert results[0][1] == {"recommendation": "rx"}
+    assert results[0][2] == pytest.approx(1 / np.sqrt(1.01), abs=1e-6)
+    assert len(store.query([1, 0], 10)) == 3
+
+
+def test_numpy_store_round_trips_through_disk(tmp_path):
+    path = str(tmp_path / "memory")
+    store = NumpyVectorStore(path)
+    store.add(["a"], [{"recommendation": "ra"}], [[1, 0, 0]], model="m")
+    store.add(["b"], [{"recommendation": "rb"}], [[0, 1, 0]], model="m")
+
+    reopened = NumpyVectorStore(path)
+
+    assert reopened.count() == 2
+    assert reopened.query([0, 1, 0], 1, model="m")[0][:2] == ("b", {"recommendation": "rb"})
+
+
+def test_numpy_store_rejects_other_models(tmp_path):
+    store = NumpyVectorStore(str(tmp_path / "memory"))
+    store.add(["a"], [{"recommendation": "ra"}], [[1, 0, 0]], model="m")
+
+    with pytest.raises(ValueError):
+        store.add(["b"], [{"recommendation": "rb"}], [[1, 0]], model="other")
+    assert store.query([1, 0], 1, model="other") == []
+
+
+def test_persisted_stores_are_kept_per_model(tmp_path):
+    config = {
+        "memory_backend": "numpy",
+        "memory_persist": True,
+        "memory_dir": str(tmp_path),
+    }
+    small = create_vector_store("bull_memory", config, model="hashing-8")
+    large = create_vector_store("bull_memory", config, model="hashing-16")
+
+    assert small is not large
+    assert small is create_vector_store("bull_memory", config, model="hashing-8")
+
+
+def test_memory_matches_situations_with_shared_wording():
+    memory = FinancialSituationMemory(
+        "test_memory",
+        {"memory_backend": "numpy", "memory_persist": False},
+        embedder=HashingEmbedder(256),
+    )
+    memory.add_situations(
+        [
+            ("rising interest rates hurt growth stocks", "trim growth exposure"),
+            ("strong dollar pressures emerging markets", "hedge currency risk"),
+        ]
+    )
+
+    matches = memory.get_memories("interest rates keep rising for growth stocks", 1)
+
+    assert matches[0]["recommendation"] == "trim growth exposure"
+
+
+@pytest.mark.parametrize("backend", ["numpy", "chroma"])
+def test_sessions_share_memories_only_when_persisted(tmp_path, backend):
+    if backend == "chroma":
+        pytest.importorskip("chromadb")
+
+    def session_memory(session_id, persist):
+        config = {
+            "memory_backend": backend,
+            "memory_persist": persist,
+            "memory_dir": str(tmp_path / backend),
+            "session_id": session_id,
+        }
+        return FinancialSituationMemory("session_memory", config, embedder=HashingEmbedder(64))
+
+    first = session_memory("session1", persist=False)
+    first.add_situations([("rates are rising", "trim growth exposure")])
+    assert session_memory("session2", persist=False).get_memories("rates are rising") == []
+
+    first = session_memory("session1", persist=True)
+    first.add_situations([("rates are rising", "trim growth exposure")])
+    shared = session_memory("session2", persist=True).get_memories("rates are rising")
+    assert [match["recommendation"] for match in shared] == ["trim growth exposure"]
@@ -1,5 +1,10 @@
 from .utils.agent_utils import Toolkit, create_msg_delete
-from .utils.agent_states import AgentState, InvestDebateState, RiskDebateState
+from .utils.agent_states import (
+    AgentState,
+    AnalystState,
+    InvestDebateState,
+    RiskDebateState,
+)
 from .utils.memory import FinancialSituationMemory
 
 from .analysts.fundamentals_analyst import create_fundamentals_analyst
@@ -24,6 +29,7 @@ __all__ = [
     "FinancialSituationMemory",
     "Toolkit",
     "AgentState",
+    "AnalystState",
     "create_msg_delete",
     "InvestDebateState",
     "RiskDebateState",
@@ -1,6 +1,7 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 import time
 import json
+from tradingagents.agents.utils.agent_utils import llm_node
 
 
 def create_market_analyst(llm, toolkit):
@@ -13,16 +14,19 @@ def create_market_analyst(llm, toolkit):
         if toolkit.config["online_tools"]:
             tools = [
                 toolkit.get_YFin_data_online,
+                toolkit.get_stockstats_indicators_batch_report_online,
                 toolkit.get_stockstats_indicators_report_online,
             ]
         else:
             tools = [
                 toolkit.get_YFin_data,
+                toolkit.get_stockstats_indicators_batch_report,
                 toolkit.get_stockstats_indicators_report,
             ]
 
+        price_tool, batch_tool, _ = tools
         system_message = (
-            """당신은 금융 시장을 분석하는 임무를 맡은 트레이딩 어시스턴트입니다. 다음 목록에서 주어진 시장 상황이나 트레이딩 전략에 가장 관련성이 높은 지표들을 선택하는 것이 당신의 역할입니다. 중복 없이 상호 보완적인 통찰력을 제공하는 최대 8개의 지표를 선택하는 것이 목표입니다. 카테고리별 지표들은 다음과 같습니다:
+            f"""당신은 금융 시장을 분석하는 임무를 맡은 트레이딩 어시스턴트입니다. 다음 목록에서 주어진 시장 상황이나 트레이딩 전략에 가장 관련성이 높은 지표들을 선택하는 것이 당신의 역할입니다. 중복 없이 상호 보완적인 통찰력을 제공하는 최대 8개의 지표를 선택하는 것이 목표입니다. 카테고리별 지표들은 다음과 같습니다:
 
 이동평균:
 - close_50_sma: 50일 단순이동평균: 중기 트렌드 지표. 사용법: 트렌드 방향을 식별하고 동적 지지/저항 역할. 팁: 가격에 지연이 있으므로 빠른 지표와 결합하여 시기적절한 신호를 얻으세요.
@@ -46,7 +50,7 @@ MACD 관련:
 거래량 기반 지표:
 - vwma: VWMA: 거래량으로 가중된 이동평균. 사용법: 가격 행동을 거래량 데이터와 통합하여 트렌드를 확인. 팁: 거래량 급등으로 인한 왜곡된 결과를 주의하고 다른 거래량 분석과 함께 사용하세요.
 
-다양하고 상호 보완적인 정보를 제공하는 지표를 선택하세요. 중복을 피하세요(예: rsi와 stochrsi를 모두 선택하지 마세요). 또한 주어진 시장 상황에 적합한 이유를 간략히 설명하세요. 도구를 호출할 때는 위에 제공된 지표의 정확한 이름을 사용하세요. 정의된 매개변수이므로 그렇지 않으면 호출이 실패합니다. 지표 생성에 필요한 CSV를 검색하기 위해 먼저 get_YFin_data를 호출해야 합니다. 관찰한 트렌드에 대한 매우 상세하고 미묘한 보고서를 작성하세요. 단순히 트렌드가 혼재되어 있다고 말하지 말고, 트레이더들이 결정을 내리는 데 도움이 될 수 있는 상세하고 세밀한 분석과 통찰력을 제공하세요."""
+다양하고 상호 보완적인 정보를 제공하는 지표를 선택하세요. 중복을 피하세요(예: rsi와 stochrsi를 모두 선택하지 마세요). 또한 주어진 시장 상황에 적합한 이유를 간략히 설명하세요. 도구를 호출할 때는 위에 제공된 지표의 정확한 이름을 사용하세요. 정의된 매개변수이므로 그렇지 않으면 호출이 실패합니다. 선택한 지표들은 지표 목록을 받는 batch 도구({batch_tool.name})로 한 번에 조회하세요. 지표마다 도구를 따로 호출하지 마세요. 지표 생성에 필요한 CSV를 검색하기 위해 먼저 {price_tool.name}를 호출해야 합니다. 관찰한 트렌드에 대한 매우 상세하고 미묘한 보고서를 작성하세요. 단순히 트렌드가 혼재되어 있다고 말하지 말고, 트레이더들이 결정을 내리는 데 도움이 될 수 있는 상세하고 세밀한 분석과 통찰력을 제공하세요."""
             + """ 보고서의 요점을 정리하고 읽기 쉽게 구성된 마크다운 표를 보고서 끝에 반드시 추가해 주세요."""
         )
 
@@ -75,7 +79,7 @@ MACD 관련:
 
         chain = prompt | llm.bind_tools(tools)
 
-        result = chain.invoke(state["messages"])
+        result = yield chain, state["messages"]
 
         report = ""
 
@@ -87,4 +91,4 @@ MACD 관련:
             "market_report": report,
         }
 
-    return market_analyst_node
+    return llm_node(market_analyst_node)
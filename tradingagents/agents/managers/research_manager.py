@@ -1,10 +1,10 @@
 import time
 import json
+from tradingagents.agents.utils.agent_utils import debate_history_context, llm_node
 
 
-def create_research_manager(llm, memory):
+def create_research_manager(llm, memory, config=None):
     def research_manager_node(state) -> dict:
-        history = state["investment_debate_state"].get("history", "")
         market_research_report = state["market_report"]
         sentiment_report = state["sentiment_report"]
         news_report = state["news_report"]
@@ -13,12 +13,16 @@ def create_research_manager(llm, memory):
         investment_debate_state = state["investment_debate_state"]
 
         curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
+        past_memories = yield memory.get_memories, curr_situation, 2
 
         past_memory_str = ""
         for i, rec in enumerate(past_memories, 1):
             past_memory_str += rec["recommendation"] + "\n\n"
 
+        history_context, compaction = yield from debate_history_context(
+            investment_debate_state, llm, config, "Research Manager"
+        )
+
         prompt = f"""포트폴리오 매니저이자 토론 진행자로서, 이번 토론을 다방면(낙관,비관)으로 평가하고 명확한 결정을 내리는 것이 당신의 역할입니다: 하락 분석가, 상승 분석가 중 한 쪽에 동조하거나, 제시된 논증에 기반하여 강력하게 뒷받침되는 경우에만 보유를 선택하세요.
 
 가장 설득력 있는 증거나 논리에 집중하여, 양측의 핵심 포인트를 간결하게 요약하십시오. 당신의 추천(매수, 매도, 또는 보유)은 명확하고 실행 가능해야 합니다. 양측 모두 타당한 포인트가 있다고 해서 단순히 보유를 기본 선택으로 삼지 마시고, 토론에서 가장 강력한 논증에 근거하여 입장을 정하십시오.
@@ -36,11 +40,11 @@ def create_research_manager(llm, memory):
 \"{past_memory_str}\"
 
 토론 히스토리:
-{history}
+{history_context}
 
 답변은 가급적 한글로 작성해주시고, 꼭 필요한 경우에만 영어를 사용해주시기 바랍니다.
 """
-        response = llm.invoke(prompt)
+        response = yield llm, prompt
 
         new_investment_debate_state = {
             "judge_decision": response.content,
@@ -49,6 +53,8 @@ def create_research_manager(llm, memory):
             "bull_history": investment_debate_state.get("bull_history", ""),
             "current_response": response.content,
             "count": investment_debate_state["count"],
+            "turns": investment_debate_state.get("turns", []),
+            **compaction,
         }
 
         return {
@@ -56,4 +62,4 @@ def create_research_manager(llm, memory):
             "investment_plan": response.content,
         }
 
-    return research_manager_node
+    return llm_node(research_manager_node)
@@ -1,13 +1,13 @@
 import time
 import json
+from tradingagents.agents.utils.agent_utils import debate_history_context, llm_node
 
 
-def create_risk_manager(llm, memory):
+def create_risk_manager(llm, memory, config=None):
     def risk_manager_node(state) -> dict:
 
         company_name = state["company_of_interest"]
 
-        history = state["risk_debate_state"]["history"]
         risk_debate_state = state["risk_debate_state"]
         market_research_report = state["market_report"]
         news_report = state["news_report"]
@@ -16,12 +16,16 @@ def create_risk_manager(llm, memory):
         trader_plan = state["investment_plan"]
 
         curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
+        past_memories = yield memory.get_memories, curr_situation, 2
 
         past_memory_str = ""
         for i, rec in enumerate(past_memories, 1):
             past_memory_str += rec["recommendation"] + "\n\n"
 
+        history_context, compaction = yield from debate_history_context(
+            risk_debate_state, llm, config, "Risk Judge"
+        )
+
         prompt = f"""위험 관리 심판이자 토론 진행자로서, 세 명의 위험 분석가—공격적, 중립적, 안전/보수적—간의 토론을 평가하고 트레이더를 위한 최선의 행동 방침을 결정하는 것이 당신의 목표입니다. 당신의 결정은 명확한 추천으로 귀결되어야 합니다: 매수, 매도, 또는 보유. 모든 측면이 타당해 보일 때의 대안이 아니라 구체적인 논증으로 강력하게 뒷받침되는 경우에만 보유를 선택하세요. 명확성과 결단력을 추구하세요.
 
 의사결정 가이드라인:
@@ -37,14 +41,14 @@ def create_risk_manager(llm, memory):
 ---
 
 **분석가 토론 히스토리:**  
-{history}
+{history_context}
 
 ---
 
 답변은 가급적 한글로 작성해주시고, 꼭 필요한 경우에만 영어를 사용해주시기 바랍니다.
 실행 가능한 통찰력과 지속적인 개선에 집중하세요. 과거 교훈을 바탕으로, 모든 관점(낙관, 비관)을 다방면으로 평가하고, 각 결정이 더 나은 결과를 이끌도록 하세요."""
 
-        response = llm.invoke(prompt)
+        response = yield llm, prompt
 
         new_risk_debate_state = {
             "judge_decision": response.content,
@@ -57,6 +61,8 @@ def create_risk_manager(llm, memory):
             "current_safe_response": risk_debate_state["current_safe_response"],
             "current_neutral_response": risk_debate_state["current_neutral_response"],
             "count": risk_debate_state["count"],
+            "turns": risk_debate_state.get("turns", []),
+            **compaction,
         }
 
         return {
@@ -64,4 +70,4 @@ def create_risk_manager(llm, memory):
             "final_trade_decision": response.content,
         }
 
-    return risk_manager_node
+    return llm_node(risk_manager_node)
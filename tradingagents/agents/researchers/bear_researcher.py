@@ -1,9 +1,10 @@
 from langchain_core.messages import AIMessage
 import time
 import json
+from tradingagents.agents.utils.agent_utils import debate_history_context, llm_node
 
 
-def create_bear_researcher(llm, memory):
+def create_bear_researcher(llm, memory, config=None):
     def bear_node(state) -> dict:
         investment_debate_state = state["investment_debate_state"]
         history = investment_debate_state.get("history", "")
@@ -16,12 +17,16 @@ def create_bear_researcher(llm, memory):
         fundamentals_report = state["fundamentals_report"]
 
         curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
+        past_memories = yield memory.get_memories, curr_situation, 2
 
         past_memory_str = ""
         for i, rec in enumerate(past_memories, 1):
             past_memory_str += rec["recommendation"] + "\n\n"
 
+        history_context, compaction = yield from debate_history_context(
+            investment_debate_state, llm, config, "Bear Researcher"
+        )
+
         prompt = f"""당신은 주식 투자에 반대하는 논증을 펼치는 약세 분석가입니다. 당신의 목표는 위험, 도전, 부정적 지표를 강조하는 합리적인 논증을 제시하는 것입니다. 제공된 연구와 데이터를 활용하여 잠재적 하락 요인을 강조하고 강세 논증에 효과적으로 반박하세요.
 
 집중해야 할 핵심 포인트:
@@ -38,14 +43,14 @@ def create_bear_researcher(llm, memory):
 소셜 미디어 감정 보고서: {sentiment_report}
 최신 세계 동향 뉴스: {news_report}
 회사 펀더멘털 보고서: {fundamentals_report}
-토론의 대화 히스토리: {history}
+토론의 대화 히스토리: {history_context}
 마지막 강세 논증: {current_response}
 유사 상황의 성찰과 교훈: {past_memory_str}
 이 정보를 사용하여 설득력 있는 약세 논증을 전달하고, 강세의 주장을 반박하며, 주식 투자의 위험과 약점을 보여주는 역동적인 토론에 참여하세요. 또한 성찰을 다루고 과거의 교훈과 실수로부터 학습해야 합니다.
 답변은 가급적 한글로 작성해주시고, 꼭 필요한 경우에만 영어를 사용해주시기 바랍니다.
 """
 
-        response = llm.invoke(prompt)
+        response = yield llm, prompt
 
         argument = f"Bear Analyst: {response.content}"
 
@@ -55,8 +60,10 @@ def create_bear_researcher(llm, memory):
             "bull_history": investment_debate_state.get("bull_history", ""),
             "current_response": argument,
             "count": investment_debate_state["count"] + 1,
+            "turns": investment_debate_state.get("turns", []) + [argument],
+            **compaction,
         }
 
         return {"investment_debate_state": new_investment_debate_state}
 
-    return bear_node
+    return llm_node(bear_node)
@@ -1,8 +1,9 @@
 import time
 import json
+from tradingagents.agents.utils.agent_utils import debate_history_context, llm_node
 
 
-def create_risky_debator(llm):
+def create_risky_debator(llm, config=None):
     def risky_node(state) -> dict:
         risk_debate_state = state["risk_debate_state"]
         history = risk_debate_state.get("history", "")
@@ -18,6 +19,10 @@ def create_risky_debator(llm):
 
         trader_decision = state["trader_investment_plan"]
 
+        history_context, compaction = yield from debate_history_context(
+            risk_debate_state, llm, config, "Risky Analyst"
+        )
+
         prompt = f"""당신은 공격적(High-Risk) 리스크 분석가입니다. 당신의 역할은 높은 수익과 높은 위험이 수반되는 기회를 적극적으로 옹호하며, 대담한 전략과 경쟁 우위를 강조하는 것입니다. 트레이더의 결정이나 계획을 평가할 때, 잠재적 상승 여력, 성장 가능성, 혁신적 이점에 집중하세요. 위험이 높더라도 그 이점을 부각시키는 데 중점을 두세요. 제공된 시장 데이터와 심리 분석을 활용하여 자신의 주장을 강화하고, 반대 관점에 적극적으로 도전하세요. 특히, 보수적(Safe) 및 중립적(Neutral) 분석가가 제시한 각 논점에 직접적으로 응답하며, 데이터 기반 반박과 설득력 있는 논리를 통해 그들의 신중함이 중요한 기회를 놓치거나 지나치게 보수적일 수 있음을 강조하세요. 다음은 트레이더의 결정입니다:
 
 {trader_decision}
@@ -28,7 +33,7 @@ def create_risky_debator(llm):
 소셜 미디어 심리 보고서: {sentiment_report}
 최신 세계 동향 뉴스: {news_report}
 회사 펀더멘털 보고서: {fundamentals_report}
-현재 대화 히스토리: {history}
+현재 대화 히스토리: {history_context}
 마지막 보수적 분석가의 주장: {current_safe_response}
 마지막 중립적 분석가의 주장: {current_neutral_response}
 만약 다른 관점의 응답이 없다면, 내용을 지어내지 말고 본인의 의견만 제시하세요.
@@ -37,7 +42,7 @@ def create_risky_debator(llm):
 답변은 가급적 한글로 작성해주시고, 꼭 필요한 경우에만 영어를 사용해주시기 바랍니다.
 """
 
-        response = llm.invoke(prompt)
+        response = yield llm, prompt
 
         argument = f"Risky Analyst: {response.content}"
 
@@ -53,8 +58,10 @@ def create_risky_debator(llm):
                 "current_neutral_response", ""
             ),
             "count": risk_debate_state["count"] + 1,
+            "turns": risk_debate_state.get("turns", []) + [argument],
+            **compaction,
         }
 
         return {"risk_debate_state": new_risk_debate_state}
 
-    return risky_node
+    return llm_node(risky_node)
@@ -1,9 +1,10 @@
 from langchain_core.messages import AIMessage
 import time
 import json
+from tradingagents.agents.utils.agent_utils import debate_history_context, llm_node
 
 
-def create_safe_debator(llm):
+def create_safe_debator(llm, config=None):
     def safe_node(state) -> dict:
         risk_debate_state = state["risk_debate_state"]
         history = risk_debate_state.get("history", "")
@@ -19,6 +20,10 @@ def create_safe_debator(llm):
 
         trader_decision = state["trader_investment_plan"]
 
+        history_context, compaction = yield from debate_history_context(
+            risk_debate_state, llm, config, "Safe Analyst"
+        )
+
         prompt = f"""안전/보수적 리스크 분석가로서 당신의 주요 목표는 자산을 보호하고, 변동성을 최소화하며, 안정적이고 신뢰할 수 있는 성장을 보장하는 것입니다. 당신은 안정성, 보안, 리스크 완화에 우선순위를 두며, 잠재적 손실, 경기 침체, 시장 변동성을 신중하게 평가합니다. 트레이더의 결정이나 계획을 평가할 때, 고위험 요소를 비판적으로 검토하고, 해당 결정이 회사에 과도한 리스크를 초래할 수 있는 부분과 더 신중한 대안이 장기적인 이익을 보장할 수 있는 부분을 지적하세요. 다음은 트레이더의 결정입니다:
 
 {trader_decision}
@@ -30,7 +35,7 @@ def create_safe_debator(llm):
 최신 세계 정세 보고서: {news_report}
 기업 펀더멘털 보고서: {fundamentals_report}
 
-현재 대화 내역: {history} 
+현재 대화 내역: {history_context} 
 위험 성향 분석가의 마지막 답변: {current_risky_response} 
 중립 성향 분석가의 마지막 답변: {current_neutral_response}. 
 만약 다른 관점의 답변이 없다면, 내용을 지어내지 말고 당신의 의견만 제시하세요.
@@ -39,7 +44,7 @@ def create_safe_debator(llm):
 답변은 가급적 한글로 작성해주시고, 꼭 필요한 경우에만 영어를 사용해주시기 바랍니다.
 """
 
-        response = llm.invoke(prompt)
+        response = yield llm, prompt
 
         argument = f"Safe Analyst: {response.content}"
 
@@ -57,8 +62,10 @@ def create_safe_debator(llm):
                 "current_neutral_response", ""
             ),
             "count": risk_debate_state["count"] + 1,
+            "turns": risk_debate_state.get("turns", []) + [argument],
+            **compaction,
         }
 
         return {"risk_debate_state": new_risk_debate_state}
 
-    return safe_node
+    return llm_node(safe_node)
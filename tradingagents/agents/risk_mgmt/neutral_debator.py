@@ -1,8 +1,9 @@
 import time
 import json
+from tradingagents.agents.utils.agent_utils import debate_history_context, llm_node
 
 
-def create_neutral_debator(llm):
+def create_neutral_debator(llm, config=None):
     def neutral_node(state) -> dict:
         risk_debate_state = state["risk_debate_state"]
         history = risk_debate_state.get("history", "")
@@ -18,6 +19,10 @@ def create_neutral_debator(llm):
 
         trader_decision = state["trader_investment_plan"]
 
+        history_context, compaction = yield from debate_history_context(
+            risk_debate_state, llm, config, "Neutral Analyst"
+        )
+
         prompt = f"""당신은 중립적 위험 분석가(Neutral Risk Analyst)입니다. 당신의 역할은 트레이더의 결정이나 계획에 대해 잠재적 이익과 위험을 모두 균형 있게 평가하고, 균형 잡힌 시각을 제공하는 것입니다. 시장의 전반적 트렌드, 경제적 변화 가능성, 분산 투자 전략 등을 고려하여 장점과 단점을 모두 분석하는 데 중점을 두세요.
         
 트레이더의 결정은 다음과 같습니다:
@@ -30,7 +35,7 @@ def create_neutral_debator(llm):
 소셜 미디어 감정 보고서: {sentiment_report}
 최신 세계 동향 뉴스: {news_report}
 회사 펀더멘털 보고서: {fundamentals_report}
-현재 대화 히스토리: {history}
+현재 대화 히스토리: {history_context}
 마지막 공격적 분석가의 응답: {current_risky_response}
 마지막 보수적 분석가의 응답: {current_safe_response}
 만약 다른 관점의 응답이 없다면, 내용을 지어내지 말고 본인의 의견만 제시하세요.
@@ -39,7 +44,7 @@ def create_neutral_debator(llm):
 답변은 가급적 한글로 작성해주시고, 꼭 필요한 경우에만 영어를 사용해주시기 바랍니다.
 """
 
-        response = llm.invoke(prompt)
+        response = yield llm, prompt
 
         argument = f"Neutral Analyst: {response.content}"
 
@@ -55,8 +60,10 @@ def create_neutral_debator(llm):
             "current_safe_response": risk_debate_state.get("current_safe_response", ""),
             "current_neutral_response": argument,
             "count": risk_debate_state["count"] + 1,
+            "turns": risk_debate_state.get("turns", []) + [argument],
+            **compaction,
         }
 
         return {"risk_debate_state": new_risk_debate_state}
 
-    return neutral_node
+    return llm_node(neutral_node)
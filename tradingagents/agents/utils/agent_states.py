@@ -19,6 +19,9 @@ class InvestDebateState(TypedDict):
     current_response: Annotated[str, "Latest response"]  # Last response
     judge_decision: Annotated[str, "Final judge decision"]  # Last response
     count: Annotated[int, "Length of the current conversation"]  # Conversation length
+    turns: Annotated[list, "Every argument in order, one entry per turn"]
+    summary: Annotated[str, "Running summary of compacted older turns"]
+    summarized_turns: Annotated[int, "Number of turns folded into the summary"]
 
 
 # Risk management team state
@@ -45,6 +48,22 @@ class RiskDebateState(TypedDict):
     ]  # Last response
     judge_decision: Annotated[str, "Judge's decision"]
     count: Annotated[int, "Length of the current conversation"]  # Conversation length
+    turns: Annotated[list, "Every argument in order, one entry per turn"]
+    summary: Annotated[str, "Running summary of compacted older turns"]
+    summarized_turns: Annotated[int, "Number of turns folded into the summary"]
+
+
+# Analyst branch state (parallel mode): each analyst runs its tool loop on its own messages
+class AnalystState(MessagesState):
+    company_of_interest: Annotated[str, "Company that we are interested in trading"]
+    trade_date: Annotated[str, "What date we are trading at"]
+
+    market_report: Annotated[str, "Report from the Market Analyst"]
+    sentiment_report: Annotated[str, "Report from the Social Media Analyst"]
+    news_report: Annotated[
+        str, "Report from the News Researcher of current world affairs"
+    ]
+    fundamentals_report: Annotated[str, "Report from the Fundamentals Researcher"]
 
 
 class AgentState(MessagesState):
@@ -3,8 +3,10 @@ from typing import List
 from typing import Annotated
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.messages import RemoveMessage
+from langchain_core.runnables import Runnable, RunnableLambda
 from langchain_core.tools import tool
 from datetime import date, timedelta, datetime
+import asyncio
 import functools
 import pandas as pd
 import os
@@ -31,6 +33,164 @@ def create_msg_delete():
     return delete_messages
 
 
+def llm_node(step_node, name=None):
+    """
+    Build a graph node that works in both sync (invoke/stream) and async
+    (ainvoke/astream) graph runs from one node body.
+
+    step_node is a generator over the state that yields each blocking call as
+    (target, *args) and gets the result sent back: runnables (LLMs, chains) go through
+    invoke / ainvoke, plain callables (memory lookups) run directly / in a worker
+    thread. The generator's return value is the node's state update.
+    """
+
+    def run(state):
+        steps = step_node(state)
+        try:
+            target, *args = next(steps)
+            while True:
+                if isinstance(target, Runnable):
+                    result = target.invoke(*args)
+                else:
+                    result = target(*args)
+                target, *args = steps.send(result)
+        except StopIteration as done:
+            return done.value
+
+    async def arun(state):
+        steps = step_node(state)
+        try:
+            target, *args = next(steps)
+            while True:
+                if isinstance(target, Runnable):
+                    result = await target.ainvoke(*args)
+                else:
+                    result = await asyncio.to_thread(target, *args)
+                target, *args = steps.send(result)
+        except StopIteration as done:
+            return done.value
+
+    return RunnableLambda(run, afunc=arun, name=name or step_node.__name__)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for mixed Korean/English text (about 2 characters per token)."""
+    return len(text) // 2
+
+
+def debate_token_budget(config, node_name=None):
+    """
+    Token budget for one debate node's history. config["debate_token_budget"] is a
+    number for every node, or a mapping from graph node name ("Bull Researcher",
+    "Risk Judge", ...) to budget with an optional "default" entry.
+    """
+    budget = config.get("debate_token_budget", 3000)
+    if isinstance(budget, dict):
+        return budget.get(node_name, budget.get("default", 3000))
+    return budget
+
+
+def debate_history_context(debate_state, llm, config=None, node_name=None):
+    """
+    History text to put in a debate prompt, plus the state fields to carry forward.
+
+    Generator for llm_node bodies (use with `yield from`). Without compaction this is
+    the full history string. With config["debate_compaction"] the last
+    debate_keep_turns turns stay verbatim and older turns are folded, with one LLM
+    call, into a running summary kept in the debate state. Verbatim turns are
+    dropped into the summary further while summary + turns exceed
+    the node's debate_token_budget (the latest turn is always kept).
+    """
+    turns = debate_state.get("turns", [])
+    summary = debate_state.get("summary", "")
+    summarized_turns = debate_state.get("summarized_turns", 0)
+    carried = {"summary": summary, "summarized_turns": summarized_turns}
+
+    if not config or not config.get("debate_compaction", False):
+        return debate_state.get("history", ""), carried
+
+    keep_turns = max(1, config.get("debate_keep_turns", 2))
+    token_budget = debate_token_budget(config, node_name)
+
+    recent_start = max(summarized_turns, len(turns) - keep_turns)
+    while recent_start < len(turns) - 1 and estimate_tokens(
+        summary + "\n".join(turns[recent_start:])
+    ) > token_budget:
+        recent_start += 1
+
+    if recent_start > summarized_turns:
+        older_turns = "\n\n".join(turns[summarized_turns:recent_start])
+        prompt = f"""다음은 진행 중인 투자 토론의 이전 요약과 그 이후의 발언들입니다. 이를 하나의 요약으로 합쳐 주세요.
+각 발언자의 핵심 주장, 근거가 된 수치와 사실, 아직 반박되지 않은 쟁점을 빠짐없이 남기고 표현은 간결하게 줄이세요.
+요약은 약 {token_budget // 4} 토큰 이내로 작성하고, 요약 외의 다른 말은 덧붙이지 마세요.
+
+이전 요약:
+{summary or "(없음)"}
+
+새로 요약할 발언:
+{older_turns}
+"""
+        response = yield llm, prompt
+        summary = response.content
+        summarized_turns = recent_start
+
+    recent = "\n".join(turns[summarized_turns:])
+    if summary:
+        history = f"[이전 토론 요약]\n{summary}\n\n[최근 발언]\n{recent}"
+    else:
+        history = recent
+    return history, {"summary": summary, "summarized_turns": summarized_turns}
+
+
+def with_coroutine(coroutine):
+    """
+    Attach an async implementation to a sync @tool. Sync graph runs keep calling the
+    tool body; async runs (ainvoke/astream) await the coroutine, so several tool calls
+    from one analyst turn share the event loop instead of holding a thread each.
+    """
+
+    def attach(structured_tool):
+        structured_tool.coroutine = coroutine
+        return structured_tool
+
+    return attach
+
+
+async def _aget_finnhub_news(ticker: str, start_date: str, end_date: str):
+    look_back_days = (
+        datetime.strptime(end_date, "%Y-%m-%d") - datetime.strptime(start_date, "%Y-%m-%d")
+    ).days
+    return await interface.aget_finnhub_news(ticker, end_date, look_back_days)
+
+
+async def _aget_finnhub_company_insider_sentiment(ticker: str, curr_date: str):
+    return await interface.aget_finnhub_company_insider_sentiment(ticker, curr_date, 30)
+
+
+async def _aget_finnhub_company_insider_transactions(ticker: str, curr_date: str):
+    return await interface.aget_finnhub_company_insider_transactions(ticker, curr_date, 30)
+
+
+async def _aget_simfin_balance_sheet(ticker: str, freq: str, curr_date: str):
+    return await interface.aget_simfin_balance_sheet(ticker, freq, curr_date)
+
+
+async def _aget_simfin_cashflow(ticker: str, freq: str, curr_date: str):
+    return await interface.aget_simfin_cashflow(ticker, freq, curr_date)
+
+
+async def _aget_simfin_income_stmt(ticker: str, freq: str, curr_date: str):
+    return await interface.aget_simfin_income_statements(ticker, freq, curr_date)
+
+
+async def _aget_google_news(query: str, curr_date: str):
+    return await interface.aget_google_news(query, curr_date, 30)
+
+
+async def _aget_naver_news(query: str, curr_date: str, look_back_days: int = 7):
+    return await interface.aget_naver_news(query, curr_date, look_back_days)
+
+
 class Toolkit:
     _config = DEFAULT_CONFIG.copy()
 
@@ -66,6 +226,7 @@ class Toolkit:
         return global_news_result
 
     @staticmethod
+    @with_coroutine(_aget_finnhub_news)
     @tool
     def get_finnhub_news(
         ticker: Annotated[
@@ -221,6 +382,65 @@ class Toolkit:
 
     @staticmethod
     @tool
+    def get_stockstats_indicators_batch_report(
+        symbol: Annotated[str, "ticker symbol of the company"],
+        indicators: Annotated[
+            List[str], "technical indicators to get the analysis and report of"
+        ],
+        curr_date: Annotated[
+            str, "The current trading date you are trading on, YYYY-mm-dd"
+        ],
+        look_back_days: Annotated[int, "how many days to look back"] = 30,
+    ) -> str:
+        """
+        Retrieve several stock stats indicators for a given ticker symbol in a single call.
+        Args:
+            symbol (str): Ticker symbol of the company, e.g. AAPL, TSM
+            indicators (List[str]): Technical indicators to get the analysis and report of, e.g. ["rsi", "macd", "boll"]
+            curr_date (str): The current trading date you are trading on, YYYY-mm-dd
+            look_back_days (int): How many days to look back, default is 30
+        Returns:
+            str: A combined report with the stock stats values of every requested indicator for the specified ticker symbol.
+        """
+
+        result_stockstats = interface.get_stock_stats_indicators_window_batch(
+            symbol, indicators, curr_date, look_back_days, False
+        )
+
+        return result_stockstats
+
+    @staticmethod
+    @tool
+    def get_stockstats_indicators_batch_report_online(
+        symbol: Annotated[str, "ticker symbol of the company"],
+        indicators: Annotated[
+            List[str], "technical indicators to get the analysis and report of"
+        ],
+        curr_date: Annotated[
+            str, "The current trading date you are trading on, YYYY-mm-dd"
+        ],
+        look_back_days: Annotated[int, "how many days to look back"] = 30,
+    ) -> str:
+        """
+        Retrieve several stock stats indicators for a given ticker symbol in a single call.
+        Args:
+            symbol (str): Ticker symbol of the company, e.g. AAPL, TSM
+            indicators (List[str]): Technical indicators to get the analysis and report of, e.g. ["rsi", "macd", "boll"]
+            curr_date (str): The current trading date you are trading on, YYYY-mm-dd
+            look_back_days (int): How many days to look back, default is 30
+        Returns:
+            str: A combined report with the stock stats values of every requested indicator for the specified ticker symbol.
+        """
+
+        result_stockstats = interface.get_stock_stats_indicators_window_batch(
+            symbol, indicators, curr_date, look_back_days, True
+        )
+
+        return result_stockstats
+
+    @staticmethod
+    @with_coroutine(_aget_finnhub_company_insider_sentiment)
+    @tool
     def get_finnhub_company_insider_sentiment(
         ticker: Annotated[str, "ticker symbol for the company"],
         curr_date: Annotated[
@@ -244,6 +464,7 @@ class Toolkit:
         return data_sentiment
 
     @staticmethod
+    @with_coroutine(_aget_finnhub_company_insider_transactions)
     @tool
     def get_finnhub_company_insider_transactions(
         ticker: Annotated[str, "ticker symbol"],
@@ -268,6 +489,7 @@ class Toolkit:
         return data_trans
 
     @staticmethod
+    @with_coroutine(_aget_simfin_balance_sheet)
     @tool
     def get_simfin_balance_sheet(
         ticker: Annotated[str, "ticker symbol"],
@@ -292,6 +514,7 @@ class Toolkit:
         return data_balance_sheet
 
     @staticmethod
+    @with_coroutine(_aget_simfin_cashflow)
     @tool
     def get_simfin_cashflow(
         ticker: Annotated[str, "ticker symbol"],
@@ -316,6 +539,7 @@ class Toolkit:
         return data_cashflow
 
     @staticmethod
+    @with_coroutine(_aget_simfin_income_stmt)
     @tool
     def get_simfin_income_stmt(
         ticker: Annotated[str, "ticker symbol"],
@@ -342,6 +566,7 @@ class Toolkit:
         return data_income_stmt
 
     @staticmethod
+    @with_coroutine(_aget_google_news)
     @tool
     def get_google_news(
         query: Annotated[str, "Query to search with"],
@@ -362,6 +587,7 @@ class Toolkit:
         return google_news_results
 
     @staticmethod
+    @with_coroutine(_aget_naver_news)
     @tool
     def get_naver_news(
         query: Annotated[str, "Query to search with (company name or ticker)"],
@@ -1,87 +1,166 @@
-import chromadb
-from chromadb.config import Settings
-from openai import OpenAI
+import hashlib
+import re
 
+import numpy as np
+
+from tradingagents.dataflows.utils import SingleFlightCache
+
+from tradingagents.agents.utils.vector_store import create_vector_store
+
+# Process-wide embedding cache shared by every memory and graph instance.
+# The nodes of one run all embed the same situation text, so it is embedded once.
+# Embeddings never go stale; only the LRU size bound evicts entries.
+EMBEDDING_CACHE_SIZE = 1024
+_embedding_cache = SingleFlightCache(ttl_seconds=float("inf"), maxsize=EMBEDDING_CACHE_SIZE)
+
+# Texts sent per embeddings request by add_situations (the API accepts up to 2048)
+EMBEDDING_BATCH_SIZE = 256
+
+MEMORY_EMBEDDERS = ("openai", "hashing")
+
+
+class OpenAIEmbedder:
+    """Embeddings from the OpenAI-compatible endpoint at config["backend_url"]."""
+
+    def __init__(self, config):
+        from openai import OpenAI
 
-class FinancialSituationMemory:
-    def __init__(self, name, config):
         if config["backend_url"] == "http://localhost:11434/v1":
-            self.embedding = "nomic-embed-text"
+            self.name = "nomic-embed-text"
         else:
-            self.embedding = "text-embedding-3-small"
+            self.name = "text-embedding-3-small"
         self.client = OpenAI(base_url=config["backend_url"])
-        self.chroma_client = chromadb.Client(Settings(allow_reset=True))
-        
-        # Create unique collection name using session_id if available
-        if "session_id" in config:
-            unique_name = f"{name}_{config['session_id']}"
-        else:
-            unique_name = name
-            
-        try:
-            # Try to get existing collection first
-            self.situation_collection = self.chroma_client.get_collection(name=unique_name)
-        except:
-            # If collection doesn't exist, create it
-            self.situation_collection = self.chroma_client.create_collection(name=unique_name)
+
+    def embed(self, texts):
+        response = self.client.embeddings.create(model=self.name, input=texts)
+        # the API may return items out of order; index maps them back to the input
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+
+class HashingEmbedder:
+    """
+    Offline embedder: word unigrams and bigrams hashed into a fixed number of signed
+    buckets. Needs no network or model, so memories work in tests and air-gapped
+    runs; it matches shared wording only, not meaning.
+    """
+
+    def __init__(self, dim=512):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def _bucket(self, token):
+        digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+        value = int.from_bytes(digest, "little")
+        return value % self.dim, 1.0 if value >> 63 else -1.0
+
+    def embed(self, texts):
+        embeddings = []
+        for text in texts:
+            vector = np.zeros(self.dim, dtype=np.float32)
+            words = re.findall(r"\w+", text.lower())
+            for token in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+                index, sign = self._bucket(token)
+                vector[index] += sign
+            norm = np.linalg.norm(vector)
+            embeddings.append((vector / norm if norm else vector).tolist())
+        return embeddings
+
+
+def create_embedder(config):
+    """Embedder for config["memory_embedder"]: a name, or any object with name and embed(texts)."""
+    embedder = config.get("memory_embedder") or "openai"
+    if not isinstance(embedder, str):
+        return embedder
+    if embedder == "openai":
+        return OpenAIEmbedder(config)
+    if embedder == "hashing":
+        return HashingEmbedder(config.get("hashing_embedding_dim", 512))
+    raise ValueError(
+        f"Unsupported memory_embedder: {embedder} (choose from {', '.join(MEMORY_EMBEDDERS)})"
+    )
+
+
+class FinancialSituationMemory:
+    def __init__(self, name, config, embedder=None):
+        self.embedder = embedder or create_embedder(config)
+        self.store = create_vector_store(name, config, model=self.embedder.name)
+
+    def _embedding_key(self, text):
+        return (self.embedder.name, hashlib.sha256(text.encode("utf-8")).hexdigest())
 
     def get_embedding(self, text):
-        """Get OpenAI embedding for a text"""
-        
-        response = self.client.embeddings.create(
-            model=self.embedding, input=text
+        """Get the embedding for a text (cached per model and text hash)"""
+        return _embedding_cache.get_or_compute(
+            self._embedding_key(text), lambda: self.embedder.embed([text])[0]
         )
-        return response.data[0].embedding
 
-    def add_situations(self, situations_and_advice):
-        """Add financial situations and their corresponding advice. Parameter is a list of tuples (situation, rec)"""
+    def get_embeddings(self, texts):
+        """Embeddings for several texts; the uncached ones are requested in batches"""
+        keys = [self._embedding_key(text) for text in texts]
+        embeddings = [_embedding_cache.get(key) for key in keys]
 
-        situations = []
-        advice = []
-        ids = []
-        embeddings = []
+        missing = {}
+        for i, (key, embedding) in enumerate(zip(keys, embeddings)):
+            if embedding is None:
+                missing.setdefault(key, []).append(i)
+
+        pending = list(missing.items())
+        for start in range(0, len(pending), EMBEDDING_BATCH_SIZE):
+            batch = pending[start : start + EMBEDDING_BATCH_SIZE]
+            created = self.embedder.embed([texts[indexes[0]] for _, indexes in batch])
+            for (key, indexes), embedding in zip(batch, created):
+                _embedding_cache.put(key, embedding)
+                for i in indexes:
+                    embeddings[i] = embedding
 
-        offset = self.situation_collection.count()
+        return embeddings
+
+    def add_situations(self, situations_and_advice):
+        """Add financial situations and their corresponding advice. Parameter is a list of tuples (situation, rec)"""
+        if not situations_and_advice:
+            return
 
-        for i, (situation, recommendation) in enumerate(situations_and_advice):
-            situations.append(situation)
-            advice.append(recommendation)
-            ids.append(str(offset + i))
-            embeddings.append(self.get_embedding(situation))
+        situations = [situation for situation, _ in situations_and_advice]
+        advice = [recommendation for _, recommendation in situations_and_advice]
 
-        self.situation_collection.add(
+        self.store.add(
             documents=situations,
             metadatas=[{"recommendation": rec} for rec in advice],
-            embeddings=embeddings,
-            ids=ids,
+            embeddings=self.get_embeddings(situations),
+            model=self.embedder.name,
         )
 
     def get_memories(self, current_situation, n_matches=1):
-        """Find matching recommendations using OpenAI embeddings"""
+        """Find matching recommendations by embedding similarity"""
+        if self.store.count() == 0:
+            return []
         query_embedding = self.get_embedding(current_situation)
 
-        results = self.situation_collection.query(
-            query_embeddings=[query_embedding],
-            n_results=n_matches,
-            include=["metadatas", "documents", "distances"],
-        )
-
-        matched_results = []
-        for i in range(len(results["documents"][0])):
-            matched_results.append(
-                {
-                    "matched_situation": results["documents"][0][i],
-                    "recommendation": results["metadatas"][0][i]["recommendation"],
-                    "similarity_score": 1 - results["distances"][0][i],
-                }
+        return [
+            {
+                "matched_situation": document,
+                "recommendation": metadata["recommendation"],
+                "similarity_score": similarity,
+            }
+            for document, metadata, similarity in self.store.query(
+                query_embedding, n_matches, model=self.embedder.name
             )
-
-        return matched_results
+        ]
 
 
 if __name__ == "__main__":
-    # Example usage
-    matcher = FinancialSituationMemory()
+    from tradingagents.default_config import DEFAULT_CONFIG
+
+    # Example usage (offline: hashing embedder, numpy index kept in memory)
+    matcher = FinancialSituationMemory(
+        "example_memory",
+        {
+            **DEFAULT_CONFIG,
+            "memory_backend": "numpy",
+            "memory_embedder": "hashing",
+            "memory_persist": False,
+        },
+    )
 
     # Example data
     example_data = [
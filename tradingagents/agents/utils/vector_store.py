@@ -0,0 +1,258 @@
+import json
+import os
+import re
+import threading
+import uuid
+
+import numpy as np
+
+MEMORY_DIR_NAME = "agent_memory"
+MEMORY_BACKENDS = ("chroma", "numpy")
+
+# One chroma client per directory, shared by every memory in the process
+# (chroma does not support several clients on the same path)
+_chroma_clients = {}
+_chroma_lock = threading.Lock()
+
+# Numpy stores are shared per file the same way, so every graph in the process
+# appends to (and searches) the same matrix
+_numpy_stores = {}
+_numpy_lock = threading.Lock()
+
+
+def memory_dir(config):
+    return config.get("memory_dir") or os.path.join(
+        config["data_cache_dir"], MEMORY_DIR_NAME
+    )
+
+
+def store_name(name, model=None):
+    """
+    Storage name for one memory's embeddings from one model, so switching the
+    embedder (or the backend_url that picks its model) starts a separate store
+    instead of mixing vectors of different sizes.
+    """
+    if not model:
+        return name
+    return f"{name}__{re.sub(r'[^A-Za-z0-9_.-]', '_', model)}"
+
+
+def _get_chroma_client(config):
+    # chromadb is imported lazily: it is slow to import and unused by the numpy backend
+    import chromadb
+    from chromadb.config import Settings
+
+    if not config.get("memory_persist", False):
+        return chromadb.Client(Settings(allow_reset=True))
+    path = os.path.abspath(memory_dir(config))
+    with _chroma_lock:
+        client = _chroma_clients.get(path)
+        if client is None:
+            os.makedirs(path, exist_ok=True)
+            client = chromadb.PersistentClient(
+                path=path, settings=Settings(allow_reset=True, anonymized_telemetry=False)
+            )
+            _chroma_clients[path] = client
+        return client
+
+
+class ChromaVectorStore:
+    """Memory rows in a chroma collection (persistent per memory name and model if memory_persist)."""
+
+    def __init__(self, name, config, model=None):
+        self.chroma_client = _get_chroma_client(config)
+
+        # 영구 저장 시에는 메모리 이름·임베딩 모델별 컬렉션 하나를 모든 세션이 이어서
+        # 사용하고, 인메모리 모드에서만 session_id로 컬렉션을 분리
+        if "session_id" in config and not config.get("memory_persist", False):
+            unique_name = f"{name}_{config['session_id']}"
+        else:
+            unique_name = store_name(name, model)
+
+        self.collection = self.chroma_client.get_or_create_collection(name=unique_name)
+
+    def count(self):
+        return self.collection.count()
+
+    def add(self, documents, metadatas, embeddings, model=None):
+        self.collection.add(
+            documents=documents,
+            metadatas=metadatas,
+            embeddings=embeddings,
+            # the collection is shared across sessions and processes, so count()
+            # based ids could collide
+            ids=[uuid.uuid4().hex for _ in documents],
+        )
+
+    def query(self, embedding, n_results, model=None):
+        """[(document, metadata, similarity)] for the n_results nearest rows"""
+        results = self.collection.query(
+            query_embeddings=[embedding],
+            n_results=n_results,
+            include=["metadatas", "documents", "distances"],
+        )
+        return [
+            (document, metadata, 1 - distance)
+            for document, metadata, distance in zip(
+                results["documents"][0], results["metadatas"][0], results["distances"][0]
+            )
+        ]
+
+
+class NumpyVectorStore:
+    """
+    Brute-force cosine search over a matrix of L2-normalized embeddings.
+
+    Sized for agent memories (hundreds to a few thousand rows), where one matrix
+    product per query is faster than starting chroma. With a path, the matrix is
+    kept in <path>.npy (opened memory-mapped) and documents/metadata in the
+    <path>.json sidecar; both are rewritten atomically on every add, and a file
+    changed by another process is reloaded before the next add or query.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._matrix = None
+        self._rows = []
+        self._model = None
+        self._mtime = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._load()
+
+    @property
+    def _matrix_path(self):
+        return f"{self.path}.npy"
+
+    @property
+    def _sidecar_path(self):
+        return f"{self.path}.json"
+
+    def _sidecar_mtime(self):
+        try:
+            return os.stat(self._sidecar_path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _load(self):
+        mtime = self._sidecar_mtime()
+        if mtime is None:
+            return
+        with open(self._sidecar_path, "r", encoding="utf-8") as f:
+            sidecar = json.load(f)
+        matrix = np.load(self._matrix_path, mmap_mode="r")
+        rows = sidecar["rows"]
+        # a crash between the two renames leaves the matrix one write ahead
+        count = min(len(rows), matrix.shape[0])
+        self._matrix = matrix[:count]
+        self._rows = rows[:count]
+        self._model = sidecar.get("model")
+        self._mtime = mtime
+
+    def _refresh(self):
+        if self.path and self._sidecar_mtime() != self._mtime:
+            self._load()
+
+    def _save(self, matrix, rows, model):
+        tmp_matrix = f"{self.path}.{uuid.uuid4().hex}.tmp.npy"
+        tmp_sidecar = f"{self.path}.{uuid.uuid4().hex}.tmp.json"
+        np.save(tmp_matrix, matrix)
+        with open(tmp_sidecar, "w", encoding="utf-8") as f:
+            json.dump({"model": model, "rows": rows}, f, ensure_ascii=False)
+        # matrix first: the sidecar decides how many rows are valid
+        os.replace(tmp_matrix, self._matrix_path)
+        os.replace(tmp_sidecar, self._sidecar_path)
+        self._matrix = np.load(self._matrix_path, mmap_mode="r")
+        self._rows = rows
+        self._model = model
+        self._mtime = self._sidecar_mtime()
+
+    @staticmethod
+    def _normalize(vectors):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+    def count(self):
+        with self._lock:
+            self._refresh()
+            return len(self._rows)
+
+    def add(self, documents, metadatas, embeddings, model=None):
+        new = self._normalize(embeddings)
+        new_rows = [
+            {"document": document, "metadata": metadata}
+            for document, metadata in zip(documents, metadatas)
+        ]
+        with self._lock:
+            self._refresh()
+            if self._matrix is not None and len(self._rows):
+                if self._matrix.shape[1] != new.shape[1] or (
+                    model and self._model and model != self._model
+                ):
+                    raise ValueError(
+                        f"Memory {self.path} holds {self._model} embeddings "
+                        f"({self._matrix.shape[1]} dims); cannot add {model} "
+                        f"embeddings ({new.shape[1]} dims)"
+                    )
+                matrix = np.concatenate([self._matrix, new])
+            else:
+                matrix = new
+            rows = self._rows + new_rows
+            model = self._model or model
+            if self.path:
+                self._save(matrix, rows, model)
+            else:
+                self._matrix, self._rows, self._model = matrix, rows, model
+
+    def query(self, embedding, n_results, model=None):
+        """[(document, metadata, cosine similarity)] for the n_results nearest rows"""
+        query = self._normalize(embedding)
+        with self._lock:
+            self._refresh()
+            matrix, rows, stored_model = self._matrix, self._rows, self._model
+        if not rows:
+            return []
+        if matrix.shape[1] != query.shape[-1] or (
+            model and stored_model and model != stored_model
+        ):
+            print(
+                f"Memory {self.path} holds {stored_model} embeddings "
+                f"({matrix.shape[1]} dims); skipping {model} query "
+                f"({query.shape[-1]} dims)"
+            )
+            return []
+        similarities = np.asarray(matrix @ query)
+        n_results = min(n_results, len(rows))
+        if n_results < len(rows):
+            top = np.argpartition(-similarities, n_results - 1)[:n_results]
+        else:
+            top = np.arange(len(rows))
+        top = top[np.argsort(-similarities[top])]
+        return [
+            (rows[i]["document"], rows[i]["metadata"], float(similarities[i]))
+            for i in top
+        ]
+
+
+def create_vector_store(name, config, model=None):
+    """
+    Vector store for one memory, chosen by config["memory_backend"]. model is the
+    embedder name; persisted stores are kept apart per model.
+    """
+    backend = config.get("memory_backend", "chroma")
+    if backend == "chroma":
+        return ChromaVectorStore(name, config, model)
+    if backend == "numpy":
+        if not config.get("memory_persist", False):
+            return NumpyVectorStore()
+        path = os.path.abspath(os.path.join(memory_dir(config), "numpy", store_name(name, model)))
+        with _numpy_lock:
+            store = _numpy_stores.get(path)
+            if store is None:
+                store = _numpy_stores[path] = NumpyVectorStore(path)
+            return store
+    raise ValueError(
+        f"Unsupported memory_backend: {backend} (choose from {', '.join(MEMORY_BACKENDS)})"
+    )
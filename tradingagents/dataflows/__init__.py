@@ -2,8 +2,9 @@ from .finnhub_utils import get_data_in_range
 from .googlenews_utils import getNewsData
 from .naver_news_utils import get_naver_news, get_naver_search_client
 from .yfin_utils import YFinanceUtils
-from .reddit_utils import fetch_top_from_category
+from .reddit_utils import fetch_top_from_category, fetch_top_from_category_window
 from .stockstats_utils import StockstatsUtils
+from .price_store import get_price_store, prefetch_prices
 from .yfin_utils import YFinanceUtils
 
 from .interface import (
@@ -21,6 +22,7 @@ from .interface import (
     get_simfin_income_statements,
     # Technical analysis functions
     get_stock_stats_indicators_window,
+    get_stock_stats_indicators_window_batch,
     get_stockstats_indicator,
     # Market data functions
     get_YFin_data_window,
@@ -42,8 +44,10 @@ __all__ = [
     "get_simfin_income_statements",
     # Technical analysis functions
     "get_stock_stats_indicators_window",
+    "get_stock_stats_indicators_window_batch",
     "get_stockstats_indicator",
     # Market data functions
     "get_YFin_data_window",
     "get_YFin_data",
+    "prefetch_prices",
 ]
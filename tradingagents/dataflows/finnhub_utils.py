@@ -1,47 +1,16 @@
+import asyncio
 import json
 import os
 import requests
-from datetime import datetime
+import threading
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
 from typing import List, Dict, Any
-import yfinance as yf
-
-def is_korea_stock(ticker: str):
-    if ticker.isdigit() and len(ticker) == 6:
-        return True
-    return False
-
-def guess_korea_market(ticker: str):
-    # 이미 .KS나 .KQ가 붙어 있으면 제거
-    if ticker.endswith(".KS") or ticker.endswith(".KQ"):
-        ticker = ticker[:-3]
-    # 코스피: .KS, 코스닥: .KQ
-    if is_korea_stock(ticker):
-        try:
-            info_ks = yf.Ticker(ticker + ".KS").info
-            if info_ks and "shortName" in info_ks and info_ks.get("exchange") == "KSC":
-                return f"{ticker}.KS"
-        except Exception:
-            pass
-        try:
-            info_kq = yf.Ticker(ticker + ".KQ").info
-            if info_kq and "shortName" in info_kq and info_kq.get("exchange") == "KOE":
-                return f"{ticker}.KQ"
-        except Exception:
-            pass
-    return ticker
-
-def get_korea_stock_name(ticker: str):
-    """
-    한국 주식 티커에 대해 종목 이름을 반환합니다. (pykrx 사용)
-    """
-    if is_korea_stock(ticker):
-        try:
-            from pykrx import stock
-            ticker_name = stock.get_market_ticker_name(ticker)
-            return ticker_name
-        except Exception:
-            return ""
-    return ""
+
+from .ticker_utils import is_korea_stock, guess_korea_market, get_korea_stock_name
+from .utils import single_flight
+from .http_utils import get_finnhub_client, cached_response
 
 
 def get_data_in_range(ticker, start_date, end_date, data_type, data_dir, period=None):
@@ -92,6 +61,30 @@ def get_opendartreader_api_key():
         raise ValueError("OPENDARTREADER_API_KEY 환경 변수가 설정되지 않았습니다.")
     return api_key
 
+
+_dart_client = None
+_dart_client_key = None
+_dart_client_lock = threading.Lock()
+
+
+def get_dart_client():
+    """
+    프로세스 전체에서 공유하는 OpenDartReader 클라이언트를 반환합니다.
+    생성 시 DART 고유번호(corp code) 목록을 불러오므로 하루에 한 번만 새로 만들고,
+    목록 자체는 OpenDartReader가 날짜별 파일로 디스크에 캐시합니다.
+    """
+    global _dart_client, _dart_client_key
+    import OpenDartReader
+
+    api_key = get_opendartreader_api_key()
+    client_key = (api_key, date.today())
+    with _dart_client_lock:
+        if _dart_client is None or _dart_client_key != client_key:
+            _dart_client = OpenDartReader(api_key)
+            _dart_client_key = client_key
+        return _dart_client
+
+@cached_response("finnhub.company_news", end_date_param="end_date")
 def fetch_company_news_online(ticker: str, start_date: str, end_date: str) -> List[Dict[str, Any]]:
     """
     Finnhub API를 사용하여 회사 뉴스를 가져옵니다.
@@ -121,7 +114,7 @@ def fetch_company_news_online(ticker: str, start_date: str, end_date: str) -> Li
     }
     
     try:
-        response = requests.get(url, params=params)
+        response = get_finnhub_client().get(url, params=params)
         response.raise_for_status()
         news_data = response.json()
         print(f"Finnhub에서 {len(news_data)}개의 회사 뉴스 결과를 수집했습니다.")
@@ -131,6 +124,7 @@ def fetch_company_news_online(ticker: str, start_date: str, end_date: str) -> Li
         return []
 
 
+@cached_response("finnhub.insider_sentiment", end_date_param="end_date")
 def fetch_insider_sentiment_online(ticker: str, start_date: str, end_date: str) -> List[Dict[str, Any]]:
     """
     한국 주식인 경우 빈 데이터 반환 (DART에서 제공하지 않음), 그 외에는 Finnhub API를 사용합니다.
@@ -157,7 +151,7 @@ def fetch_insider_sentiment_online(ticker: str, start_date: str, end_date: str)
     }
     
     try:
-        response = requests.get(url, params=params)
+        response = get_finnhub_client().get(url, params=params)
         response.raise_for_status()
         data = response.json()
         senti_data = data.get('data', [])
@@ -168,6 +162,7 @@ def fetch_insider_sentiment_online(ticker: str, start_date: str, end_date: str)
         return []
 
 
+@cached_response("finnhub.insider_transactions", end_date_param="end_date")
 def fetch_insider_transactions_online(ticker: str, start_date: str, end_date: str) -> List[Dict[str, Any]]:
     """
     한국 주식인 경우 빈 데이터 반환 (DART에서 제공하지 않음), 그 외에는 Finnhub API를 사용합니다.
@@ -193,7 +188,7 @@ def fetch_insider_transactions_online(ticker: str, start_date: str, end_date: st
     }
     
     try:
-        response = requests.get(url, params=params)
+        response = get_finnhub_client().get(url, params=params)
         response.raise_for_status()
         data = response.json()
         trans_data = data.get('data', [])
@@ -204,6 +199,84 @@ def fetch_insider_transactions_online(ticker: str, start_date: str, end_date: st
         return []
 
 
+# DART sj_div -> Finnhub report 키
+DART_STATEMENT_KEYS = {"BS": "bs", "IS": "ic", "CIS": "ic", "CF": "cf"}
+# DART 보고서 코드 -> (period, quarter)
+DART_REPORT_PERIODS = {"11013": ("Q1", 1), "11012": ("H1", 2), "11014": ("Q3", 3)}
+DART_MAX_WORKERS = 5
+
+
+def convert_dart_to_finnhub_format(df: pd.DataFrame, ticker: str) -> Dict[str, Any]:
+    """
+    OpenDartReader 재무제표 DataFrame을 Finnhub financials-reported 형식으로 변환합니다.
+    금액 파싱과 재무제표 구분은 전체 DataFrame에 대해 한 번에 처리하고,
+    연도/재무제표별 항목은 groupby 한 번으로 나눕니다.
+    """
+    # 쉼표 제거 후 숫자로 변환, 숫자가 아닌 값은 0
+    amount_str = df['thstrm_amount'].astype(str).str.replace(',', '', regex=False)
+    is_number = amount_str.str.replace('.', '', regex=False).str.replace('-', '', regex=False).str.isdigit()
+    amount = pd.to_numeric(amount_str.where(is_number), errors='coerce').astype(float)
+    amount = amount.astype(object).where(amount.notna(), 0)
+
+    statements = pd.DataFrame({
+        "bsns_year": df['bsns_year'],
+        "statement": df['sj_div'].map(DART_STATEMENT_KEYS),
+        "concept": df['account_nm'],  # 한글 계정명 그대로 사용
+        "value": amount,
+        "unit": "KRW",
+    })
+    items_by_statement = {
+        key: group[["concept", "value", "unit"]].to_dict("records")
+        for key, group in statements.dropna(subset=["statement"]).groupby(
+            ["bsns_year", "statement"], sort=False
+        )
+    }
+
+    # 연도별 첫 행에서 보고서 정보 추출
+    first_rows = df.drop_duplicates('bsns_year')
+    converted_data = []
+    for _, first_row in first_rows.iterrows():
+        year = first_row['bsns_year']
+        form_name = first_row['__dart_form_name'] if '__dart_form_name' in df.columns else '사업보고서'
+        report_code = first_row['__dart_report_code'] if '__dart_report_code' in df.columns else '11011'
+        # filedDate: 가장 최근 frmtrm_dt
+        filed_date = first_row.get('frmtrm_dt', f"{year}-12-31")
+        period, quarter = DART_REPORT_PERIODS.get(report_code, ("FY", 0))
+
+        # Create Finnhub-like structure
+        report_entry = {
+            "symbol": ticker,
+            "cik": ticker,  # Use ticker as CIK for Korean stocks
+            "accessNumber": f"dart-{ticker}-{year}-{report_code}",
+            "year": int(year),
+            "quarter": quarter,
+            "form": form_name,
+            "filedDate": filed_date,
+            "period": period,
+            "report": {}
+        }
+        for key in ("bs", "ic", "cf"):
+            if (year, key) in items_by_statement:
+                report_entry["report"][key] = items_by_statement[(year, key)]
+
+        converted_data.append(report_entry)
+
+    return {
+        "symbol": ticker,
+        "data": converted_data
+    }
+
+
+def _has_financials(result) -> bool:
+    # 실패/빈 응답은 캐시하지 않아 다음 호출에서 다시 시도합니다
+    return isinstance(result, dict) and bool(result.get("data"))
+
+
+# 재무제표/손익계산서/현금흐름표 도구가 같은 인자로 연달아 호출하므로,
+# 동시에 들어온 호출은 하나의 조회를 공유하고 결과는 10분간 재사용합니다.
+# 조회 결과는 디스크 응답 캐시에도 저장됩니다 (to_date가 과거면 만료 없음).
+@single_flight(ttl_seconds=600, maxsize=64, cache_if=_has_financials)
+@cached_response("finnhub.financials_reported", end_date_param="to_date", cache_if=_has_financials)
 def fetch_financials_reported_online(ticker: str, freq: str = "annual", from_date: str = None, to_date: str = None) -> Dict[str, Any]:
     """
     한국 주식인 경우 OpenDartReader, 그 외에는 Finnhub API를 사용하여 재무제표 데이터를 가져옵니다.
@@ -219,9 +292,7 @@ def fetch_financials_reported_online(ticker: str, freq: str = "annual", from_dat
     """
     if is_korea_stock(ticker):
         try:
-            import OpenDartReader
-            dart_api_key = get_opendartreader_api_key()
-            dart = OpenDartReader(dart_api_key)
+            dart = get_dart_client()
 
             # from_date가 YYYYMMDD 형식의 문자열로 들어오면, 연도/월 추출
 
@@ -263,13 +334,9 @@ def fetch_financials_reported_online(ticker: str, freq: str = "annual", from_dat
                 base_year = int(from_date[:4])
                 years_to_try = [base_year - i for i in range(4)]
 
-            fs_data = None
-            fs_data_list = []
-            report_code_form_map = {}  # year: (report_code, form)
-            for year in years_to_try:
+            def fetch_yearly_statements(year):
+                report_code, form_name = get_report_code_and_form(base_year, year, from_date)
                 try:
-                    report_code, form_name = get_report_code_and_form(base_year, year, from_date)
-                    report_code_form_map[year] = (report_code, form_name)
                     if report_code != "11011":
                         yearly_data = dart.finstate(ticker, year, report_code)
                     else:
@@ -278,18 +345,27 @@ def fetch_financials_reported_online(ticker: str, freq: str = "annual", from_dat
                         # form 정보도 같이 저장
                         yearly_data['__dart_form_name'] = form_name
                         yearly_data['__dart_report_code'] = report_code
-                        fs_data_list.append(yearly_data)
+                        return yearly_data
                 except Exception as fs_error:
                     print(f"{year}년 {form_name}({report_code}) 재무제표 조회 실패: {fs_error}")
-                    continue
+                return None
+
+            # 연도별 재무제표와 기업 개황을 동시에 조회 (결과는 연도 순서 유지)
+            fs_data = None
+            with ThreadPoolExecutor(max_workers=DART_MAX_WORKERS) as executor:
+                company_future = executor.submit(dart.company, ticker)
+                fs_data_list = [
+                    yearly_data
+                    for yearly_data in executor.map(fetch_yearly_statements, years_to_try)
+                    if yearly_data is not None
+                ]
             if fs_data_list:
-                import pandas as pd
                 fs_data = pd.concat(fs_data_list, ignore_index=True)
 
             # 기업 개황 정보 가져오기
             company_info = None
             try:
-                company_info = dart.company(ticker)
+                company_info = company_future.result()
                 print(f"OpenDartReader에서 기업 개황 정보를 수집했습니다.")
             except Exception as e:
                 print(f"기업 개황 정보 가져오기 실패: {e}")
@@ -305,114 +381,6 @@ def fetch_financials_reported_online(ticker: str, freq: str = "annual", from_dat
                 print(f"OpenDartReader에서 {len(fs_data)}개의 재무제표 결과를 수집했습니다.")
 
                 # Finnhub 형식으로 변환
-                def convert_dart_to_finnhub_format(df, ticker):
-                    # Get unique business years
-                    years = df['bsns_year'].unique()
-                    converted_data = []
-
-                    for year in years:
-                        year_data = df[df['bsns_year'] == year]
-                        # form_name, report_code 추출
-                        form_name = year_data['__dart_form_name'].iloc[0] if '__dart_form_name' in year_data.columns else '사업보고서'
-                        report_code = year_data['__dart_report_code'].iloc[0] if '__dart_report_code' in year_data.columns else '11011'
-
-                        # filedDate: 가장 최근 frmtrm_dt
-                        filed_date = year_data.iloc[0].get('frmtrm_dt', f"{year}-12-31")
-
-                        # 분기 정보 추출
-                        if report_code == '11013':
-                            period = "Q1"
-                            quarter = 1
-                        elif report_code == '11012':
-                            period = "H1"
-                            quarter = 2
-                        elif report_code == '11014':
-                            period = "Q3"
-                            quarter = 3
-                        else:
-                            period = "FY"
-                            quarter = 0
-
-                        # Create Finnhub-like structure
-                        report_entry = {
-                            "symbol": ticker,
-                            "cik": ticker,  # Use ticker as CIK for Korean stocks
-                            "accessNumber": f"dart-{ticker}-{year}-{report_code}",
-                            "year": int(year),
-                            "quarter": quarter,
-                            "form": form_name,
-                            "filedDate": filed_date,
-                            "period": period,
-                            "report": {}
-                        }
-                        
-                        # Convert balance sheet (BS) - Finnhub 형식: 리스트로 변환
-                        bs_data = year_data[year_data['sj_div'] == 'BS']
-                        if not bs_data.empty:
-                            bs_list = []
-                            for _, row in bs_data.iterrows():
-                                account_name = row['account_nm']
-                                try:
-                                    # Remove commas and convert to number
-                                    amount_str = str(row['thstrm_amount']).replace(',', '')
-                                    amount = float(amount_str) if amount_str.replace('.', '').replace('-', '').isdigit() else 0
-                                except (ValueError, TypeError):
-                                    amount = 0
-                                
-                                bs_list.append({
-                                    "concept": account_name,  # 한글 계정명 그대로 사용
-                                    "value": amount,
-                                    "unit": "KRW"
-                                })
-                            report_entry["report"]["bs"] = bs_list
-                        
-                        # Convert income statement (IS) - Finnhub 형식: 리스트로 변환
-                        is_data = year_data[year_data['sj_div'].isin(['IS', 'CIS'])]
-                        if not is_data.empty:
-                            is_list = []
-                            for _, row in is_data.iterrows():
-                                account_name = row['account_nm']
-                                try:
-                                    # Remove commas and convert to number
-                                    amount_str = str(row['thstrm_amount']).replace(',', '')
-                                    amount = float(amount_str) if amount_str.replace('.', '').replace('-', '').isdigit() else 0
-                                except (ValueError, TypeError):
-                                    amount = 0
-                                
-                                is_list.append({
-                                    "concept": account_name,  # 한글 계정명 그대로 사용
-                                    "value": amount,
-                                    "unit": "KRW"
-                                })
-                            report_entry["report"]["ic"] = is_list
-                        
-                        # Convert cash flow (CF) - Finnhub 형식: 리스트로 변환
-                        cf_data = year_data[year_data['sj_div'] == 'CF']
-                        if not cf_data.empty:
-                            cf_list = []
-                            for _, row in cf_data.iterrows():
-                                account_name = row['account_nm']
-                                try:
-                                    # Remove commas and convert to number
-                                    amount_str = str(row['thstrm_amount']).replace(',', '')
-                                    amount = float(amount_str) if amount_str.replace('.', '').replace('-', '').isdigit() else 0
-                                except (ValueError, TypeError):
-                                    amount = 0
-                                
-                                cf_list.append({
-                                    "concept": account_name,  # 한글 계정명 그대로 사용
-                                    "value": amount,
-                                    "unit": "KRW"
-                                })
-                            report_entry["report"]["cf"] = cf_list
-                        
-                        converted_data.append(report_entry)
-                    
-                    return {
-                        "symbol": ticker,
-                        "data": converted_data
-                    }
-                
                 return convert_dart_to_finnhub_format(fs_data, ticker)
             else:
                 print(f"OpenDartReader에서 0개의 재무제표 결과를 수집했습니다.")
@@ -445,7 +413,7 @@ def fetch_financials_reported_online(ticker: str, freq: str = "annual", from_dat
             params['to'] = to_date
         
         try:
-            response = requests.get(url, params=params)
+            response = get_finnhub_client().get(url, params=params)
             response.raise_for_status()
             data = response.json()
             if isinstance(data, dict) and "data" in data and isinstance(data["data"], list):
@@ -510,3 +478,114 @@ def fetch_cash_flow_online(ticker: str, freq: str = "annual", from_date: str = N
     data = fetch_financials_reported_online(ticker, freq, from_date, to_date)
     print(f"[Finnhub]fetch_cash_flow_online")
     return data
+
+
+# ---------------------------------------------------------------------------
+# asyncio 버전: 같은 rate limit, 같은 응답 캐시를 공유합니다.
+# ---------------------------------------------------------------------------
+
+FINNHUB_API_URL = "https://finnhub.io/api/v1"
+
+
+def _finnhub_range_params(url: str, ticker: str, start_date: str, end_date: str) -> Dict[str, Any]:
+    # guess_korea_market이 yfinance를 호출할 수 있어 async 함수에서는 스레드로 실행합니다
+    ticker_market = guess_korea_market(ticker.upper())
+    print(f"Finnhub API 호출 🔍: {url}: {ticker_market}, {start_date}, {end_date}")
+    return {
+        'symbol': ticker_market,
+        'from': start_date,
+        'to': end_date,
+        'token': get_finnhub_api_key()
+    }
+
+
+async def _afetch_finnhub_json(url: str, params: Dict[str, Any]) -> Any:
+    response = await get_finnhub_client().aget(url, params=params)
+    response.raise_for_status()
+    return response.json()
+
+
+@cached_response("finnhub.company_news", end_date_param="end_date")
+async def afetch_company_news_online(ticker: str, start_date: str, end_date: str) -> List[Dict[str, Any]]:
+    """fetch_company_news_online의 async 버전."""
+    url = f"{FINNHUB_API_URL}/company-news"
+    params = await asyncio.to_thread(_finnhub_range_params, url, ticker, start_date, end_date)
+    try:
+        news_data = await _afetch_finnhub_json(url, params)
+        print(f"Finnhub에서 {len(news_data)}개의 회사 뉴스 결과를 수집했습니다.")
+        return news_data
+    except Exception as e:
+        print(f"뉴스 데이터 가져오기 실패: {e}")
+        return []
+
+
+@cached_response("finnhub.insider_sentiment", end_date_param="end_date")
+async def afetch_insider_sentiment_online(ticker: str, start_date: str, end_date: str) -> List[Dict[str, Any]]:
+    """fetch_insider_sentiment_online의 async 버전."""
+    url = f"{FINNHUB_API_URL}/stock/insider-sentiment"
+    params = await asyncio.to_thread(_finnhub_range_params, url, ticker, start_date, end_date)
+    try:
+        data = await _afetch_finnhub_json(url, params)
+        senti_data = data.get('data', [])
+        print(f"Finnhub에서 {len(senti_data)}개의 내부자 감정 데이터 결과를 수집했습니다.")
+        return senti_data
+    except Exception as e:
+        print(f"내부자 감정 데이터 가져오기 실패: {e}")
+        return []
+
+
+@cached_response("finnhub.insider_transactions", end_date_param="end_date")
+async def afetch_insider_transactions_online(ticker: str, start_date: str, end_date: str) -> List[Dict[str, Any]]:
+    """fetch_insider_transactions_online의 async 버전."""
+    url = f"{FINNHUB_API_URL}/stock/insider-transactions"
+    params = await asyncio.to_thread(_finnhub_range_params, url, ticker, start_date, end_date)
+    try:
+        data = await _afetch_finnhub_json(url, params)
+        trans_data = data.get('data', [])
+        print(f"Finnhub에서 {len(trans_data)}개의 내부자 거래 데이터 결과를 수집했습니다.")
+        return trans_data
+    except Exception as e:
+        print(f"내부자 거래 데이터 가져오기 실패: {e}")
+        return []
+
+
+@single_flight(cache_if=_has_financials, cache=fetch_financials_reported_online.cache)
+async def afetch_financials_reported_online(ticker: str, freq: str = "annual", from_date: str = None, to_date: str = None) -> Dict[str, Any]:
+    """
+    fetch_financials_reported_online의 async 버전 (동기 버전과 같은 single-flight 캐시 사용).
+    한국 주식(OpenDartReader)은 동기 라이브러리라 스레드에서 실행하고,
+    그 외에는 Finnhub을 async로 호출합니다.
+    """
+    if is_korea_stock(ticker):
+        # __wrapped__: 이 호출이 이미 같은 키의 flight를 잡고 있으므로 memo를 다시 거치지 않음
+        return await asyncio.to_thread(
+            fetch_financials_reported_online.__wrapped__, ticker, freq, from_date, to_date
+        )
+    return await _afetch_finnhub_financials_reported(ticker, freq, from_date, to_date)
+
+
+@cached_response("finnhub.financials_reported", end_date_param="to_date", cache_if=_has_financials)
+async def _afetch_finnhub_financials_reported(ticker: str, freq: str = "annual", from_date: str = None, to_date: str = None) -> Dict[str, Any]:
+    url = f"{FINNHUB_API_URL}/stock/financials-reported"
+    ticker_market = await asyncio.to_thread(guess_korea_market, ticker.upper())
+    print(f"Finnhub API 호출 🔍: {url}: {ticker_market}, {freq}, {from_date}, {to_date}")
+    params = {
+        'symbol': ticker_market,
+        'freq': freq,
+        'token': get_finnhub_api_key()
+    }
+    if from_date:
+        params['from'] = from_date
+    if to_date:
+        params['to'] = to_date
+
+    try:
+        data = await _afetch_finnhub_json(url, params)
+        if isinstance(data, dict) and "data" in data and isinstance(data["data"], list):
+            print(f"Finnhub에서 {len(data['data'])}개의 재무제표(As Reported) 결과를 수집했습니다.")
+        else:
+            print(f"Finnhub에서 재무제표(As Reported) 데이터를 수집했습니다.")
+        return data
+    except Exception as e:
+        print(f"재무제표 데이터 가져오기 실패: {e}")
+        return {}
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import requests
 from bs4 import BeautifulSoup
@@ -15,33 +16,9 @@ from tenacity import (
 from duckduckgo_search import DDGS
 from datetime import datetime
 
+from .ticker_utils import get_stock_name
+from .http_utils import cached_response
 
-def is_korea_stock(ticker: str):
-    if ticker.isdigit() and len(ticker) == 6:
-        return True
-    return False
-
-def get_stock_name(ticker: str):
-    """
-    주식 티커에 대해 종목 이름을 반환합니다.
-    한국 주식이면 pykrx, 아니면 yfinance를 사용합니다.
-    """
-    if is_korea_stock(ticker):
-        try:
-            from pykrx import stock
-            ticker_name = stock.get_market_ticker_name(ticker)
-            return ticker_name
-        except Exception:
-            return ""
-    else:
-        try:
-            import yfinance as yf
-            ticker_obj = yf.Ticker(ticker)
-            info = ticker_obj.info
-            # shortName이 있으면 그걸, 없으면 longName, 둘 다 없으면 ""
-            return info.get("shortName") or info.get("longName") or ""
-        except Exception:
-            return ""
 
 def is_rate_limited(response):
     """Check if the response indicates rate limiting (status code 429)"""
@@ -137,6 +114,8 @@ def make_request(url, headers):
 
 #     return news_results
 
+# DuckDuckGo는 날짜 범위가 아니라 최근 1달 결과를 주므로 지난 날짜도 TTL 동안만 캐시
+@cached_response("duckduckgo.news")
 def getNewsData(query, start_date, end_date):
     """
     구글 뉴스 크롤링 대신, 최신 웹 검색 API(예: DuckDuckGo, SerpAPI, Bing Web Search 등)를 활용하여
@@ -223,3 +202,14 @@ def getNewsData(query, start_date, end_date):
 
     print(f"DuckDuckGo에서 {len(news_results)}개의 뉴스 결과를 수집했습니다.")
     return news_results
+
+
+# DuckDuckGo는 날짜 범위가 아니라 최근 1달 결과를 주므로 지난 날짜도 TTL 동안만 캐시
+@cached_response("duckduckgo.news")
+async def agetNewsData(query, start_date, end_date):
+    """
+    getNewsData의 async 버전.
+    duckduckgo-search는 동기 라이브러리만 제공하므로 검색은 스레드에서 실행합니다.
+    (같은 응답 캐시를 공유하므로 캐시 히트는 스레드 없이 반환됩니다)
+    """
+    return await asyncio.to_thread(getNewsData.__wrapped__, query, start_date, end_date)
@@ -0,0 +1,521 @@
+# pooled, rate-limited HTTP client and persistent response cache shared by the online dataflows
+
+import asyncio
+import hashlib
+import inspect
+import json
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from contextlib import AsyncExitStack, asynccontextmanager, contextmanager
+from datetime import date, datetime
+from functools import wraps
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .config import get_config
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+RESPONSE_CACHE_FILE = "response_cache.sqlite3"
+# never part of a cache key
+SECRET_PARAMS = {"token", "api_key", "apikey", "key", "client_secret"}
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, bursts of up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take(self) -> float:
+        """Take a token if one is available (returns 0), else return the seconds to wait."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self):
+        """Block until one token is available, then take it."""
+        while True:
+            wait = self._take()
+            if not wait:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Same as acquire() but yields to the event loop while waiting."""
+        while True:
+            wait = self._take()
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+
+class RateLimitedClient:
+    """
+    requests.Session 기반 HTTP 클라이언트.
+    keep-alive 커넥션 풀을 공유하고, 모든 스레드가 하나의 token bucket으로 호출 속도를 맞추며,
+    429/5xx 및 연결 오류는 backoff 후 제한된 횟수만큼 재시도합니다.
+    엔드포인트(path)별 호출 수, 오류 수, 지연 시간을 집계합니다.
+    aget()은 같은 token bucket과 통계를 쓰는 httpx.AsyncClient 버전입니다. AsyncClient는
+    event loop마다 하나를 async_session() 범위 동안만 공유하고, 마지막 사용자가 나갈 때 닫습니다.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int = 60,
+        max_retries: int = 3,
+        backoff_seconds: float = 1.0,
+        timeout: float = 30,
+        pool_size: int = 10,
+        max_backoff_seconds: float = 60.0,
+    ):
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        # upper bound for any single wait, including a server's Retry-After
+        self.max_backoff_seconds = max_backoff_seconds
+        self.timeout = timeout
+        # burst는 분당 한도의 1/6 (10초 분량)까지만 허용
+        self.bucket = TokenBucket(
+            requests_per_minute / 60.0, max(1, requests_per_minute // 6)
+        )
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.pool_size = pool_size
+        # httpx.AsyncClient connections belong to one event loop: loop -> [client, users]
+        self._async_clients = weakref.WeakKeyDictionary()
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._stats_lock = threading.Lock()
+
+    def _record(self, endpoint: str, seconds: float, error: bool):
+        with self._stats_lock:
+            stats = self._stats.setdefault(
+                endpoint,
+                {"calls": 0, "errors": 0, "retries": 0, "total_seconds": 0.0, "max_seconds": 0.0},
+            )
+            stats["calls"] += 1
+            stats["errors"] += int(error)
+            stats["total_seconds"] += seconds
+            stats["max_seconds"] = max(stats["max_seconds"], seconds)
+
+    def _record_retry(self, endpoint: str):
+        with self._stats_lock:
+            self._stats[endpoint]["retries"] += 1
+
+    def _retry_wait(self, attempt: int, response: Optional[requests.Response]) -> float:
+        wait = self.backoff_seconds * (2 ** attempt)
+        if response is not None:
+            try:
+                wait = max(0.0, float(response.headers["Retry-After"]))
+            except (KeyError, ValueError):
+                pass
+        return min(wait, self.max_backoff_seconds)
+
+    def get(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> requests.Response:
+        """
+        GET `url` with rate limiting and retries. Returns the last response
+        (callers still call raise_for_status()); re-raises the last connection
+        error once retries are exhausted.
+        """
+        # latency is tracked per path so query parameters (and API tokens) never become keys
+        endpoint = urlparse(url).path
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+            start = time.monotonic()
+            try:
+                response = self.session.get(
+                    url, params=params, headers=headers, timeout=self.timeout
+                )
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                self._record(endpoint, time.monotonic() - start, error=True)
+                if attempt == self.max_retries:
+                    raise
+                self._record_retry(endpoint)
+                time.sleep(self._retry_wait(attempt, None))
+                continue
+
+            retryable = response.status_code in RETRY_STATUS_CODES
+            self._record(endpoint, time.monotonic() - start, error=retryable)
+            if not retryable or attempt == self.max_retries:
+                return response
+            self._record_retry(endpoint)
+            wait = self._retry_wait(attempt, response)
+            print(f"HTTP {response.status_code} from {endpoint}, retrying in {wait:.1f}s")
+            time.sleep(wait)
+        return response
+
+    @asynccontextmanager
+    async def async_session(self):
+        """
+        Share one pooled httpx.AsyncClient on the running loop for the duration of
+        the block. Nested and concurrent sessions on the loop reuse the client; it
+        is closed (aclose) when the last of them exits.
+        """
+        import httpx
+
+        loop = asyncio.get_running_loop()
+        entry = self._async_clients.get(loop)
+        if entry is None:
+            client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.pool_size,
+                    max_keepalive_connections=self.pool_size,
+                ),
+            )
+            entry = self._async_clients[loop] = [client, 0]
+        entry[1] += 1
+        try:
+            yield entry[0]
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                if self._async_clients.get(loop) is entry:
+                    del self._async_clients[loop]
+                await entry[0].aclose()
+
+    async def aget(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Async get(): returns the last httpx.Response, or re-raises the last transport error.
+        Outside an async_session() the request opens (and closes) its own client.
+        """
+        async with self.async_session() as client:
+            return await self._aget(client, url, params, headers)
+
+    async def _aget(self, client, url, params, headers):
+        import httpx
+
+        endpoint = urlparse(url).path
+        for attempt in range(self.max_retries + 1):
+            await self.bucket.acquire_async()
+            start = time.monotonic()
+            try:
+                response = await client.get(url, params=params, headers=headers)
+            except httpx.TransportError:
+                self._record(endpoint, time.monotonic() - start, error=True)
+                if attempt == self.max_retries:
+                    raise
+                self._record_retry(endpoint)
+                await asyncio.sleep(self._retry_wait(attempt, None))
+                continue
+
+            retryable = response.status_code in RETRY_STATUS_CODES
+            self._record(endpoint, time.monotonic() - start, error=retryable)
+            if not retryable or attempt == self.max_retries:
+                return response
+            self._record_retry(endpoint)
+            wait = self._retry_wait(attempt, response)
+            print(f"HTTP {response.status_code} from {endpoint}, retrying in {wait:.1f}s")
+            await asyncio.sleep(wait)
+        return response
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-endpoint counters, with avg_seconds derived from the totals."""
+        with self._stats_lock:
+            snapshot = {endpoint: dict(stats) for endpoint, stats in self._stats.items()}
+        for stats in snapshot.values():
+            stats["avg_seconds"] = stats["total_seconds"] / stats["calls"] if stats["calls"] else 0.0
+        return snapshot
+
+
+_finnhub_client: Optional[RateLimitedClient] = None
+_clients_lock = threading.Lock()
+
+
+def get_finnhub_client() -> RateLimitedClient:
+    """Return the process-wide Finnhub client (one API key, one quota)."""
+    global _finnhub_client
+    with _clients_lock:
+        if _finnhub_client is None:
+            config = get_config()
+            _finnhub_client = RateLimitedClient(
+                requests_per_minute=config.get("finnhub_requests_per_minute", 60),
+                max_retries=config.get("finnhub_max_retries", 3),
+                timeout=config.get("finnhub_timeout", 30),
+            )
+    return _finnhub_client
+
+
+_naver_client: Optional[RateLimitedClient] = None
+
+
+def get_naver_client() -> RateLimitedClient:
+    """Return the process-wide Naver Open API client (10 requests/second)."""
+    global _naver_client
+    with _clients_lock:
+        if _naver_client is None:
+            _naver_client = RateLimitedClient(requests_per_minute=600, max_retries=2)
+    return _naver_client
+
+
+@asynccontextmanager
+async def async_http_session():
+    """
+    Keep the Finnhub and Naver async clients pooled across every aget() in the
+    block (e.g. one graph run) and close them when it ends.
+    """
+    async with AsyncExitStack() as stack:
+        for client in (get_finnhub_client(), get_naver_client()):
+            await stack.enter_async_context(client.async_session())
+        yield
+
+
+_RESPONSE_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    namespace TEXT NOT NULL,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_by_access ON responses (accessed_at);
+"""
+
+
+def _parse_date(value) -> Optional[date]:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str):
+        for fmt in ("%Y-%m-%d", "%Y%m%d", "%m/%d/%Y"):
+            try:
+                return datetime.strptime(value[:10], fmt).date()
+            except ValueError:
+                continue
+    return None
+
+
+class ResponseCache:
+    """
+    data_cache_dir 아래 SQLite에 저장하는 API 응답 캐시.
+    오늘 이전에 끝나는 기간의 응답은 바뀌지 않으므로 만료 없이 보관하고,
+    오늘이 포함된 기간(또는 기간을 알 수 없는 호출)은 ttl_seconds 동안만 사용합니다.
+    ttl_seconds가 None이면 모든 항목을 만료 없이 보관합니다.
+    전체 크기가 max_bytes를 넘으면 가장 오래 사용되지 않은 항목부터 지웁니다.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: Optional[float] = 900,
+        max_bytes: int = 256 * 1024 * 1024,
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._stats_lock = threading.Lock()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_RESPONSE_CACHE_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def make_key(namespace: str, params: Dict[str, Any]) -> str:
+        normalized = {
+            name: value
+            for name, value in params.items()
+            if name.lower() not in SECRET_PARAMS and value is not None
+        }
+        payload = json.dumps([namespace, normalized], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _count(self, namespace: str, field: str):
+        with self._stats_lock:
+            stats = self._stats.setdefault(namespace, {"hits": 0, "misses": 0, "stores": 0})
+            stats[field] += 1
+
+    def get(self, namespace: str, key: str) -> Tuple[bool, Any]:
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and (row[1] is None or row[1] > now):
+                conn.execute(
+                    "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+                self._count(namespace, "hits")
+                return True, json.loads(row[0])
+        self._count(namespace, "misses")
+        return False, None
+
+    def set(self, namespace: str, key: str, value: Any, immutable: bool):
+        try:
+            payload = json.dumps(value, ensure_ascii=False)
+        except (TypeError, ValueError):
+            return
+        now = time.time()
+        if immutable or self.ttl_seconds is None:
+            expires_at = None
+        else:
+            expires_at = now + self.ttl_seconds
+        size = len(payload.encode("utf-8"))
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, namespace, payload, size, expires_at, now),
+            )
+            self._evict(conn, now)
+        self._count(namespace, "stores")
+
+    def _evict(self, conn, now: float):
+        conn.execute(
+            "DELETE FROM responses WHERE expires_at IS NOT NULL AND expires_at <= ?",
+            (now,),
+        )
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # LRU: trim to 90% so eviction does not run on every insert
+        target = total - int(self.max_bytes * 0.9)
+        freed = 0
+        stale_keys = []
+        for key, size in conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at"
+        ):
+            stale_keys.append((key,))
+            freed += size
+            if freed >= target:
+                break
+        conn.executemany("DELETE FROM responses WHERE key = ?", stale_keys)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/store counters per namespace plus the current entry count and size."""
+        with self._connect() as conn:
+            entries, total = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        with self._stats_lock:
+            namespaces = {name: dict(stats) for name, stats in self._stats.items()}
+        return {"entries": entries, "bytes": total, "namespaces": namespaces}
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM responses")
+
+
+_response_caches: Dict[str, ResponseCache] = {}
+_response_caches_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Return the process-wide response cache for the configured data_cache_dir."""
+    config = get_config()
+    path = os.path.join(config["data_cache_dir"], RESPONSE_CACHE_FILE)
+    with _response_caches_lock:
+        cache = _response_caches.get(path)
+        if cache is None:
+            cache = ResponseCache(
+                path,
+                ttl_seconds=config.get("response_cache_ttl_seconds", 900),
+                max_bytes=config.get("response_cache_max_mb", 256) * 1024 * 1024,
+            )
+            _response_caches[path] = cache
+    return cache
+
+
+def cached_response(
+    namespace: str,
+    end_date_param: Optional[str] = None,
+    cache_if: Optional[Callable[[Any], bool]] = bool,
+    vary_on_config: Tuple[str, ...] = (),
+):
+    """
+    Decorator persisting a fetcher's JSON-serializable result in the response cache.
+
+    The key is the namespace plus the bound arguments (secrets excluded) and any
+    config values named in vary_on_config. When the argument named end_date_param
+    is a date before today the entry never expires; otherwise it uses the TTL.
+    Results rejected by cache_if (by default empty ones, which is also what the
+    fetchers return on errors) are not stored. Coroutine functions are supported;
+    their SQLite reads and writes run in a worker thread.
+    """
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        def lookup(args, kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            params = dict(bound.arguments)
+            if vary_on_config:
+                config = get_config()
+                params["__config__"] = {name: config.get(name) for name in vary_on_config}
+            cache = get_response_cache()
+            key = cache.make_key(namespace, params)
+            hit, value = cache.get(namespace, key)
+            return cache, key, params, hit, value
+
+        def store(cache, key, params, value):
+            if cache_if is None or cache_if(value):
+                end_date = _parse_date(params.get(end_date_param)) if end_date_param else None
+                cache.set(
+                    namespace,
+                    key,
+                    value,
+                    immutable=end_date is not None and end_date < date.today(),
+                )
+
+        if inspect.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                cache, key, params, hit, value = await asyncio.to_thread(lookup, args, kwargs)
+                if hit:
+                    return value
+                value = await func(*args, **kwargs)
+                await asyncio.to_thread(store, cache, key, params, value)
+                return value
+
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            cache, key, params, hit, value = lookup(args, kwargs)
+            if hit:
+                return value
+            value = func(*args, **kwargs)
+            store(cache, key, params, value)
+            return value
+
+        return wrapper
+
+    return decorator
@@ -1,10 +1,12 @@
-from typing import Annotated, Dict
-from .reddit_utils import fetch_top_from_category
+from typing import Annotated, Dict, List
+from .reddit_utils import fetch_top_from_category_window
 from .yfin_utils import *
 from .stockstats_utils import *
 from .googlenews_utils import *
 from .naver_news_utils import get_naver_news
+from . import naver_news_utils
 from .finnhub_utils import get_data_in_range, fetch_company_news_online, fetch_insider_sentiment_online, fetch_insider_transactions_online, fetch_balance_sheet_online, fetch_income_statement_online, fetch_cash_flow_online
+from .finnhub_utils import afetch_company_news_online, afetch_insider_sentiment_online, afetch_insider_transactions_online, afetch_financials_reported_online
 from dateutil.relativedelta import relativedelta
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
@@ -15,47 +17,59 @@ from tqdm import tqdm
 import yfinance as yf
 from openai import OpenAI
 from .config import get_config, set_config, DATA_DIR
-
-
-def is_korea_stock(ticker: str):
-    if ticker.isdigit() and len(ticker) == 6:
-        return True
-    return False
-
-def guess_korea_market(ticker: str):
-    # 이미 .KS나 .KQ가 붙어 있으면 제거
-    if ticker.endswith(".KS") or ticker.endswith(".KQ"):
-        ticker = ticker[:-3]
-    # 코스피: .KS, 코스닥: .KQ
-    if is_korea_stock(ticker):
-        try:
-            info_ks = yf.Ticker(ticker + ".KS").info
-            if info_ks and "shortName" in info_ks and info_ks.get("exchange") == "KSC":
-                return f"{ticker}.KS"
-        except Exception:
-            pass
-        try:
-            info_kq = yf.Ticker(ticker + ".KQ").info
-            if info_kq and "shortName" in info_kq and info_kq.get("exchange") == "KOE":
-                return f"{ticker}.KQ"
-        except Exception:
-            pass
-    return ticker
-
-def get_korea_stock_name(ticker: str):
+from .ticker_utils import is_korea_stock, guess_korea_market, get_korea_stock_name
+from .price_store import (
+    ACTION_COLUMNS,
+    PRICE_COLUMNS,
+    get_price_store,
+    slice_offline_price_frame,
+)
+from .http_utils import cached_response
+from .utils import single_flight
+
+# web search answers depend on the model that produced them; web search returns
+# current pages whatever curr_date is, so these use the TTL even for past dates
+OPENAI_CACHE_CONFIG = ("backend_url", "quick_think_llm")
+
+# Tool reports are shared in-process: a call with the same arguments as one that is
+# running (e.g. in the Data Prefetch node) or finished recently joins or reuses it.
+TOOL_RESULT_TTL_SECONDS = 1800
+
+
+def _is_tool_result(result) -> bool:
+    # "No ... data available" / API error reports are retried on the next call
+    return bool(result) and not str(result).startswith(("No ", "Naver News API Error"))
+
+
+def _normalize_tool_args(arguments: Dict) -> Dict:
+    # the analysts spell tickers, queries and frequencies freely; one spelling, one key
+    for name in ("ticker", "symbol"):
+        if isinstance(arguments.get(name), str):
+            arguments[name] = arguments[name].strip().upper()
+    if isinstance(arguments.get("query"), str):
+        arguments["query"] = " ".join(arguments["query"].split())
+    if isinstance(arguments.get("freq"), str):
+        arguments["freq"] = arguments["freq"].strip().lower()
+    return arguments
+
+
+def shared_tool_result(func=None, *, share_with=None):
     """
-    한국 주식 티커에 대해 종목 이름을 반환합니다. (pykrx 사용)
+    Memoize a tool report in-process on its normalized arguments. An async version
+    passes share_with=<sync tool> so both use one memo: sync runs, async runs and
+    the Data Prefetch node then reuse or join each other's calls.
     """
-    if is_korea_stock(ticker):
-        try:
-            from pykrx import stock
-            ticker_name = stock.get_market_ticker_name(ticker)
-            return ticker_name
-        except Exception:
-            return ""
-    return ""
+    decorator = single_flight(
+        ttl_seconds=TOOL_RESULT_TTL_SECONDS,
+        maxsize=256,
+        cache_if=_is_tool_result,
+        normalize=_normalize_tool_args,
+        cache=share_with.cache if share_with is not None else None,
+    )
+    return decorator(func) if func is not None else decorator
 
-    
+
+@shared_tool_result
 def get_finnhub_news(
     ticker: Annotated[
         str,
@@ -75,12 +89,33 @@ def get_finnhub_news(
         str: formatted string containing the news of the company in the time frame
 
     """
+    before = _look_back_start(curr_date, look_back_days)
+    result = fetch_company_news_online(ticker, before, curr_date)
+    return _format_finnhub_news(ticker, before, curr_date, result)
+
+
+@shared_tool_result(share_with=get_finnhub_news)
+async def aget_finnhub_news(
+    ticker: Annotated[
+        str,
+        "Search query of a company's, e.g. 'AAPL, TSM, etc.",
+    ],
+    curr_date: Annotated[str, "Current date in yyyy-mm-dd format"],
+    look_back_days: Annotated[int, "how many days to look back"],
+):
+    """Async version of get_finnhub_news."""
+    before = _look_back_start(curr_date, look_back_days)
+    result = await afetch_company_news_online(ticker, before, curr_date)
+    return _format_finnhub_news(ticker, before, curr_date, result)
+
+
+def _look_back_start(curr_date: str, look_back_days: int) -> str:
     start_date = datetime.strptime(curr_date, "%Y-%m-%d")
     before = start_date - relativedelta(days=look_back_days)
-    before = before.strftime("%Y-%m-%d")
+    return before.strftime("%Y-%m-%d")
 
-    result = fetch_company_news_online(ticker, before, curr_date)
-    
+
+def _format_finnhub_news(ticker, before, curr_date, result) -> str:
     if len(result) == 0:
         return ""
 
@@ -98,6 +133,7 @@ def get_finnhub_news(
     return f"## {ticker} News, from {before} to {curr_date}:\n" + str(combined_result)
 
 
+@shared_tool_result
 def get_finnhub_company_insider_sentiment(
     ticker: Annotated[str, "ticker symbol for the company"],
     curr_date: Annotated[
@@ -116,12 +152,27 @@ def get_finnhub_company_insider_sentiment(
         str: a report of the sentiment data
     """
 
-    date_obj = datetime.strptime(curr_date, "%Y-%m-%d")
-    before = date_obj - relativedelta(days=look_back_days)
-    before = before.strftime("%Y-%m-%d")
-
+    before = _look_back_start(curr_date, look_back_days)
     data = fetch_insider_sentiment_online(ticker, before, curr_date)
-    
+    return _format_insider_sentiment(ticker, before, curr_date, data)
+
+
+@shared_tool_result(share_with=get_finnhub_company_insider_sentiment)
+async def aget_finnhub_company_insider_sentiment(
+    ticker: Annotated[str, "ticker symbol for the company"],
+    curr_date: Annotated[
+        str,
+        "current date of you are trading at, yyyy-mm-dd",
+    ],
+    look_back_days: Annotated[int, "number of days to look back"],
+):
+    """Async version of get_finnhub_company_insider_sentiment."""
+    before = _look_back_start(curr_date, look_back_days)
+    data = await afetch_insider_sentiment_online(ticker, before, curr_date)
+    return _format_insider_sentiment(ticker, before, curr_date, data)
+
+
+def _format_insider_sentiment(ticker, before, curr_date, data) -> str:
     if len(data) == 0:
         return ""
 
@@ -144,6 +195,7 @@ def get_finnhub_company_insider_sentiment(
     )
 
 
+@shared_tool_result
 def get_finnhub_company_insider_transactions(
     ticker: Annotated[str, "ticker symbol"],
     curr_date: Annotated[
@@ -162,12 +214,27 @@ def get_finnhub_company_insider_transactions(
         str: a report of the company's insider transaction/trading information
     """
 
-    date_obj = datetime.strptime(curr_date, "%Y-%m-%d")
-    before = date_obj - relativedelta(days=look_back_days)
-    before = before.strftime("%Y-%m-%d")
-
+    before = _look_back_start(curr_date, look_back_days)
     data = fetch_insider_transactions_online(ticker, before, curr_date)
-    
+    return _format_insider_transactions(ticker, before, curr_date, data)
+
+
+@shared_tool_result(share_with=get_finnhub_company_insider_transactions)
+async def aget_finnhub_company_insider_transactions(
+    ticker: Annotated[str, "ticker symbol"],
+    curr_date: Annotated[
+        str,
+        "current date you are trading at, yyyy-mm-dd",
+    ],
+    look_back_days: Annotated[int, "how many days to look back"],
+):
+    """Async version of get_finnhub_company_insider_transactions."""
+    before = _look_back_start(curr_date, look_back_days)
+    data = await afetch_insider_transactions_online(ticker, before, curr_date)
+    return _format_insider_transactions(ticker, before, curr_date, data)
+
+
+def _format_insider_transactions(ticker, before, curr_date, data) -> str:
     if len(data) == 0:
         return ""
 
@@ -192,6 +259,7 @@ def get_finnhub_company_insider_transactions(
     )
 
 
+@shared_tool_result
 def get_simfin_balance_sheet(
     ticker: Annotated[str, "ticker symbol"],
     freq: Annotated[
@@ -213,7 +281,24 @@ def get_simfin_balance_sheet(
     """
     # curr_date를 to_date로 사용하여 해당 날짜 이전의 재무제표만 가져오기
     data = fetch_balance_sheet_online(ticker, freq, to_date=curr_date)
-    
+    return _format_balance_sheet(ticker, freq, data)
+
+
+@shared_tool_result(share_with=get_simfin_balance_sheet)
+async def aget_simfin_balance_sheet(
+    ticker: Annotated[str, "ticker symbol"],
+    freq: Annotated[
+        str,
+        "reporting frequency of the company's financial history: annual / quarterly",
+    ],
+    curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
+):
+    """Async version of get_simfin_balance_sheet."""
+    data = await afetch_financials_reported_online(ticker, freq, to_date=curr_date)
+    return _format_balance_sheet(ticker, freq, data)
+
+
+def _format_balance_sheet(ticker, freq, data) -> str:    
     if not data or 'data' not in data:
         return f"No balance sheet data available for {ticker}"
     
@@ -301,6 +386,7 @@ def get_simfin_balance_sheet(
     return result_str
 
 
+@shared_tool_result
 def get_simfin_cashflow(
     ticker: Annotated[str, "ticker symbol"],
     freq: Annotated[
@@ -322,7 +408,24 @@ def get_simfin_cashflow(
     """
     # curr_date를 to_date로 사용하여 해당 날짜 이전의 현금흐름표만 가져오기
     data = fetch_cash_flow_online(ticker, freq, to_date=curr_date)
-    
+    return _format_cashflow(ticker, freq, data)
+
+
+@shared_tool_result(share_with=get_simfin_cashflow)
+async def aget_simfin_cashflow(
+    ticker: Annotated[str, "ticker symbol"],
+    freq: Annotated[
+        str,
+        "reporting frequency of the company's financial history: annual / quarterly",
+    ],
+    curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
+):
+    """Async version of get_simfin_cashflow."""
+    data = await afetch_financials_reported_online(ticker, freq, to_date=curr_date)
+    return _format_cashflow(ticker, freq, data)
+
+
+def _format_cashflow(ticker, freq, data) -> str:    
     if not data or 'data' not in data:
         return f"No cash flow data available for {ticker}"
     
@@ -420,6 +523,7 @@ def get_simfin_cashflow(
     return result_str
 
 
+@shared_tool_result
 def get_simfin_income_statements(
     ticker: Annotated[str, "ticker symbol"],
     freq: Annotated[
@@ -441,7 +545,24 @@ def get_simfin_income_statements(
     """
     # curr_date를 to_date로 사용하여 해당 날짜 이전의 손익계산서만 가져오기
     data = fetch_income_statement_online(ticker, freq, to_date=curr_date)
-    
+    return _format_income_statement(ticker, freq, data)
+
+
+@shared_tool_result(share_with=get_simfin_income_statements)
+async def aget_simfin_income_statements(
+    ticker: Annotated[str, "ticker symbol"],
+    freq: Annotated[
+        str,
+        "reporting frequency of the company's financial history: annual / quarterly",
+    ],
+    curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
+):
+    """Async version of get_simfin_income_statements."""
+    data = await afetch_financials_reported_online(ticker, freq, to_date=curr_date)
+    return _format_income_statement(ticker, freq, data)
+
+
+def _format_income_statement(ticker, freq, data) -> str:    
     if not data or 'data' not in data:
         return f"No income statement data available for {ticker}"
     
@@ -520,19 +641,32 @@ def get_simfin_income_statements(
     return result_str
 
 
+@shared_tool_result
 def get_google_news(
     query: Annotated[str, "Query to search with"],
     curr_date: Annotated[str, "Curr date in yyyy-mm-dd format"],
     look_back_days: Annotated[int, "how many days to look back"],
 ) -> str:
     query = query.replace(" ", "+")
+    before = _look_back_start(curr_date, look_back_days)
+    news_results = getNewsData(query, before, curr_date)
+    return _format_google_news(query, before, curr_date, news_results)
 
-    start_date = datetime.strptime(curr_date, "%Y-%m-%d")
-    before = start_date - relativedelta(days=look_back_days)
-    before = before.strftime("%Y-%m-%d")
 
-    news_results = getNewsData(query, before, curr_date)
+@shared_tool_result(share_with=get_google_news)
+async def aget_google_news(
+    query: Annotated[str, "Query to search with"],
+    curr_date: Annotated[str, "Curr date in yyyy-mm-dd format"],
+    look_back_days: Annotated[int, "how many days to look back"],
+) -> str:
+    """Async version of get_google_news."""
+    query = query.replace(" ", "+")
+    before = _look_back_start(curr_date, look_back_days)
+    news_results = await agetNewsData(query, before, curr_date)
+    return _format_google_news(query, before, curr_date, news_results)
 
+
+def _format_google_news(query, before, curr_date, news_results) -> str:
     news_str = ""
 
     for news in news_results:
@@ -546,6 +680,7 @@ def get_google_news(
     return f"## {query} Google News, from {before} to {curr_date}:\n\n{news_str}"
 
 
+@shared_tool_result
 def get_naver_news_sync(
     query: Annotated[str, "Query to search with"],
     curr_date: Annotated[str, "Curr date in yyyy-mm-dd format"],
@@ -565,6 +700,17 @@ def get_naver_news_sync(
     return get_naver_news(query, curr_date, look_back_days)
 
 
+@shared_tool_result(share_with=get_naver_news_sync)
+async def aget_naver_news(
+    query: Annotated[str, "Query to search with"],
+    curr_date: Annotated[str, "Curr date in yyyy-mm-dd format"],
+    look_back_days: Annotated[int, "how many days to look back"],
+) -> str:
+    """네이버 뉴스 API를 사용한 뉴스 검색 (async 함수)"""
+    return await naver_news_utils.aget_naver_news(query, curr_date, look_back_days)
+
+
+@shared_tool_result
 def get_reddit_global_news(
     start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
     look_back_days: Annotated[int, "how many days to look back"],
@@ -583,26 +729,15 @@ def get_reddit_global_news(
     before = start_date - relativedelta(days=look_back_days)
     before = before.strftime("%Y-%m-%d")
 
-    posts = []
-    # iterate from start_date to end_date
-    curr_date = datetime.strptime(before, "%Y-%m-%d")
-
-    total_iterations = (start_date - curr_date).days + 1
-    pbar = tqdm(desc=f"Getting Global News on {start_date}", total=total_iterations)
-
-    while curr_date <= start_date:
-        curr_date_str = curr_date.strftime("%Y-%m-%d")
-        fetch_result = fetch_top_from_category(
-            "global_news",
-            curr_date_str,
-            max_limit_per_day,
-            data_path=os.path.join(DATA_DIR, "reddit_data"),
-        )
-        posts.extend(fetch_result)
-        curr_date += relativedelta(days=1)
-        pbar.update(1)
-
-    pbar.close()
+    # one indexed range query covers every day from before to start_date
+    posts = fetch_top_from_category_window(
+        "global_news",
+        before,
+        start_date.strftime("%Y-%m-%d"),
+        max_limit_per_day,
+        data_path=os.path.join(DATA_DIR, "reddit_data"),
+    )
+    curr_date = start_date + relativedelta(days=1)
 
     if len(posts) == 0:
         return ""
@@ -617,6 +752,7 @@ def get_reddit_global_news(
     return f"## Global News Reddit, from {before} to {curr_date}:\n{news_str}"
 
 
+@shared_tool_result
 def get_reddit_company_news(
     ticker: Annotated[str, "ticker symbol of the company"],
     start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
@@ -637,31 +773,16 @@ def get_reddit_company_news(
     before = start_date - relativedelta(days=look_back_days)
     before = before.strftime("%Y-%m-%d")
 
-    posts = []
-    # iterate from start_date to end_date
-    curr_date = datetime.strptime(before, "%Y-%m-%d")
-
-    total_iterations = (start_date - curr_date).days + 1
-    pbar = tqdm(
-        desc=f"Getting Company News for {ticker} on {start_date}",
-        total=total_iterations,
+    # one indexed range query covers every day from before to start_date
+    posts = fetch_top_from_category_window(
+        "company_news",
+        before,
+        start_date.strftime("%Y-%m-%d"),
+        max_limit_per_day,
+        ticker,
+        data_path=os.path.join(DATA_DIR, "reddit_data"),
     )
-
-    while curr_date <= start_date:
-        curr_date_str = curr_date.strftime("%Y-%m-%d")
-        fetch_result = fetch_top_from_category(
-            "company_news",
-            curr_date_str,
-            max_limit_per_day,
-            ticker,
-            data_path=os.path.join(DATA_DIR, "reddit_data"),
-        )
-        posts.extend(fetch_result)
-        curr_date += relativedelta(days=1)
-
-        pbar.update(1)
-
-    pbar.close()
+    curr_date = start_date + relativedelta(days=1)
 
     if len(posts) == 0:
         return ""
@@ -676,6 +797,106 @@ def get_reddit_company_news(
     return f"##{ticker} News Reddit, from {before} to {curr_date}:\n\n{news_str}"
 
 
+BEST_IND_PARAMS = {
+    # Moving Averages
+    "close_50_sma": (
+        "50 SMA: A medium-term trend indicator. "
+        "Usage: Identify trend direction and serve as dynamic support/resistance. "
+        "Tips: It lags price; combine with faster indicators for timely signals."
+    ),
+    "close_200_sma": (
+        "200 SMA: A long-term trend benchmark. "
+        "Usage: Confirm overall market trend and identify golden/death cross setups. "
+        "Tips: It reacts slowly; best for strategic trend confirmation rather than frequent trading entries."
+    ),
+    "close_5_ema": (
+        "5 EMA: A responsive short-term average. "
+        "Usage: Capture quick shifts in momentum and potential entry points. "
+        "Tips: Prone to noise in choppy markets; use alongside longer averages for filtering false signals."
+    ),
+    # MACD Related
+    "macd": (
+        "MACD: Computes momentum via differences of EMAs. "
+        "Usage: Look for crossovers and divergence as signals of trend changes. "
+        "Tips: Confirm with other indicators in low-volatility or sideways markets."
+    ),
+    "macds": (
+        "MACD Signal: An EMA smoothing of the MACD line. "
+        "Usage: Use crossovers with the MACD line to trigger trades. "
+        "Tips: Should be part of a broader strategy to avoid false positives."
+    ),
+    "macdh": (
+        "MACD Histogram: Shows the gap between the MACD line and its signal. "
+        "Usage: Visualize momentum strength and spot divergence early. "
+        "Tips: Can be volatile; complement with additional filters in fast-moving markets."
+    ),
+    # Momentum Indicators
+    "rsi": (
+        "RSI: Measures momentum to flag overbought/oversold conditions. "
+        "Usage: Apply 70/30 thresholds and watch for divergence to signal reversals. "
+        "Tips: In strong trends, RSI may remain extreme; always cross-check with trend analysis."
+    ),
+    # Volatility Indicators
+    "boll": (
+        "Bollinger Middle: A 20 SMA serving as the basis for Bollinger Bands. "
+        "Usage: Acts as a dynamic benchmark for price movement. "
+        "Tips: Combine with the upper and lower bands to effectively spot breakouts or reversals."
+    ),
+    "boll_ub": (
+        "Bollinger Upper Band: Typically 2 standard deviations above the middle line. "
+        "Usage: Signals potential overbought conditions and breakout zones. "
+        "Tips: Confirm signals with other tools; prices may ride the band in strong trends."
+    ),
+    "boll_lb": (
+        "Bollinger Lower Band: Typically 2 standard deviations below the middle line. "
+        "Usage: Indicates potential oversold conditions. "
+        "Tips: Use additional analysis to avoid false reversal signals."
+    ),
+    "atr": (
+        "ATR: Averages true range to measure volatility. "
+        "Usage: Set stop-loss levels and adjust position sizes based on current market volatility. "
+        "Tips: It's a reactive measure, so use it as part of a broader risk management strategy."
+    ),
+    # Volume-Based Indicators
+    "vwma": (
+        "VWMA: A moving average weighted by volume. "
+        "Usage: Confirm trends by integrating price action with volume data. "
+        "Tips: Watch for skewed results from volume spikes; use in combination with other volume analyses."
+    ),
+    "mfi": (
+        "MFI: The Money Flow Index is a momentum indicator that uses both price and volume to measure buying and selling pressure. "
+        "Usage: Identify overbought (>80) or oversold (<20) conditions and confirm the strength of trends or reversals. "
+        "Tips: Use alongside RSI or MACD to confirm signals; divergence between price and MFI can indicate potential reversals."
+    ),
+}
+
+
+def _check_supported_indicators(indicators):
+    unsupported = [ind for ind in indicators if ind not in BEST_IND_PARAMS]
+    if unsupported:
+        raise ValueError(
+            f"Indicator {', '.join(unsupported)} is not supported. Please choose from: {list(BEST_IND_PARAMS.keys())}"
+        )
+
+
+def _format_indicator_window(indicator, window, before, end_date, online):
+    if not online:
+        # only do the trading dates
+        window = window[window != NON_TRADING_DAY]
+
+    ind_string = "".join(
+        f"{date}: {value}\n" for date, value in window.items()
+    )
+
+    return (
+        f"## {indicator} values from {before.strftime('%Y-%m-%d')} to {end_date}:\n\n"
+        + ind_string
+        + "\n\n"
+        + BEST_IND_PARAMS.get(indicator, "No description available.")
+    )
+
+
+@shared_tool_result
 def get_stock_stats_indicators_window(
     symbol: Annotated[str, "ticker symbol of the company"],
     indicator: Annotated[str, "technical indicator to get the analysis and report of"],
@@ -686,131 +907,79 @@ def get_stock_stats_indicators_window(
     online: Annotated[bool, "to fetch data online or offline"],
 ) -> str:
 
-    best_ind_params = {
-        # Moving Averages
-        "close_50_sma": (
-            "50 SMA: A medium-term trend indicator. "
-            "Usage: Identify trend direction and serve as dynamic support/resistance. "
-            "Tips: It lags price; combine with faster indicators for timely signals."
-        ),
-        "close_200_sma": (
-            "200 SMA: A long-term trend benchmark. "
-            "Usage: Confirm overall market trend and identify golden/death cross setups. "
-            "Tips: It reacts slowly; best for strategic trend confirmation rather than frequent trading entries."
-        ),
-        "close_5_ema": (
-            "5 EMA: A responsive short-term average. "
-            "Usage: Capture quick shifts in momentum and potential entry points. "
-            "Tips: Prone to noise in choppy markets; use alongside longer averages for filtering false signals."
-        ),
-        # MACD Related
-        "macd": (
-            "MACD: Computes momentum via differences of EMAs. "
-            "Usage: Look for crossovers and divergence as signals of trend changes. "
-            "Tips: Confirm with other indicators in low-volatility or sideways markets."
-        ),
-        "macds": (
-            "MACD Signal: An EMA smoothing of the MACD line. "
-            "Usage: Use crossovers with the MACD line to trigger trades. "
-            "Tips: Should be part of a broader strategy to avoid false positives."
-        ),
-        "macdh": (
-            "MACD Histogram: Shows the gap between the MACD line and its signal. "
-            "Usage: Visualize momentum strength and spot divergence early. "
-            "Tips: Can be volatile; complement with additional filters in fast-moving markets."
-        ),
-        # Momentum Indicators
-        "rsi": (
-            "RSI: Measures momentum to flag overbought/oversold conditions. "
-            "Usage: Apply 70/30 thresholds and watch for divergence to signal reversals. "
-            "Tips: In strong trends, RSI may remain extreme; always cross-check with trend analysis."
-        ),
-        # Volatility Indicators
-        "boll": (
-            "Bollinger Middle: A 20 SMA serving as the basis for Bollinger Bands. "
-            "Usage: Acts as a dynamic benchmark for price movement. "
-            "Tips: Combine with the upper and lower bands to effectively spot breakouts or reversals."
-        ),
-        "boll_ub": (
-            "Bollinger Upper Band: Typically 2 standard deviations above the middle line. "
-            "Usage: Signals potential overbought conditions and breakout zones. "
-            "Tips: Confirm signals with other tools; prices may ride the band in strong trends."
-        ),
-        "boll_lb": (
-            "Bollinger Lower Band: Typically 2 standard deviations below the middle line. "
-            "Usage: Indicates potential oversold conditions. "
-            "Tips: Use additional analysis to avoid false reversal signals."
-        ),
-        "atr": (
-            "ATR: Averages true range to measure volatility. "
-            "Usage: Set stop-loss levels and adjust position sizes based on current market volatility. "
-            "Tips: It's a reactive measure, so use it as part of a broader risk management strategy."
-        ),
-        # Volume-Based Indicators
-        "vwma": (
-            "VWMA: A moving average weighted by volume. "
-            "Usage: Confirm trends by integrating price action with volume data. "
-            "Tips: Watch for skewed results from volume spikes; use in combination with other volume analyses."
-        ),
-        "mfi": (
-            "MFI: The Money Flow Index is a momentum indicator that uses both price and volume to measure buying and selling pressure. "
-            "Usage: Identify overbought (>80) or oversold (<20) conditions and confirm the strength of trends or reversals. "
-            "Tips: Use alongside RSI or MACD to confirm signals; divergence between price and MFI can indicate potential reversals."
-        ),
-    }
-
-    if indicator not in best_ind_params:
-        raise ValueError(
-            f"Indicator {indicator} is not supported. Please choose from: {list(best_ind_params.keys())}"
-        )
+    _check_supported_indicators([indicator])
 
     end_date = curr_date
     curr_date = datetime.strptime(curr_date, "%Y-%m-%d")
     before = curr_date - relativedelta(days=look_back_days)
 
-    if not online:
-        # read from YFin data
-        data = pd.read_csv(
-            os.path.join(
-                DATA_DIR,
-                f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-            )
+    # load the price frame and compute the indicator once for the whole window
+    try:
+        window = StockstatsUtils.get_stock_stats_window(
+            guess_korea_market(symbol),
+            indicator,
+            end_date,
+            look_back_days,
+            os.path.join(DATA_DIR, "market_data", "price_data"),
+            online=online,
         )
-        data["Date"] = pd.to_datetime(data["Date"], utc=True)
-        dates_in_df = data["Date"].astype(str).str[:10]
+    except Exception as e:
+        print(
+            f"Error getting stockstats indicator data for indicator {indicator} from {before.strftime('%Y-%m-%d')} to {end_date}: {e}"
+        )
+        # "No ..." 결과는 shared_tool_result에 캐시되지 않아 다음 호출에서 다시 시도
+        return f"No {indicator} data available for {symbol} from {before.strftime('%Y-%m-%d')} to {end_date}: {e}"
 
-        ind_string = ""
-        while curr_date >= before:
-            # only do the trading dates
-            if curr_date.strftime("%Y-%m-%d") in dates_in_df.values:
-                indicator_value = get_stockstats_indicator(
-                    symbol, indicator, curr_date.strftime("%Y-%m-%d"), online
-                )
+    return _format_indicator_window(indicator, window, before, end_date, online)
 
-                ind_string += f"{curr_date.strftime('%Y-%m-%d')}: {indicator_value}\n"
 
-            curr_date = curr_date - relativedelta(days=1)
-    else:
-        # online gathering
-        ind_string = ""
-        while curr_date >= before:
-            indicator_value = get_stockstats_indicator(
-                symbol, indicator, curr_date.strftime("%Y-%m-%d"), online
-            )
+@shared_tool_result
+def get_stock_stats_indicators_window_batch(
+    symbol: Annotated[str, "ticker symbol of the company"],
+    indicators: Annotated[
+        List[str], "technical indicators to get the analysis and report of"
+    ],
+    curr_date: Annotated[
+        str, "The current trading date you are trading on, YYYY-mm-dd"
+    ],
+    look_back_days: Annotated[int, "how many days to look back"],
+    online: Annotated[bool, "to fetch data online or offline"],
+) -> str:
+    """
+    Same report as get_stock_stats_indicators_window, for several indicators at once.
+    The price frame is loaded and wrapped a single time and every indicator is
+    computed on it, so N indicators cost one data load instead of N.
+    """
+    # keep the caller's order but drop repeated indicators
+    indicators = list(dict.fromkeys(indicators))
+    if len(indicators) == 0:
+        raise ValueError("At least one indicator must be requested.")
+    _check_supported_indicators(indicators)
 
-            ind_string += f"{curr_date.strftime('%Y-%m-%d')}: {indicator_value}\n"
+    end_date = curr_date
+    curr_date = datetime.strptime(curr_date, "%Y-%m-%d")
+    before = curr_date - relativedelta(days=look_back_days)
 
-            curr_date = curr_date - relativedelta(days=1)
+    try:
+        windows = StockstatsUtils.get_stock_stats_windows(
+            guess_korea_market(symbol),
+            indicators,
+            end_date,
+            look_back_days,
+            os.path.join(DATA_DIR, "market_data", "price_data"),
+            online=online,
+        )
+    except Exception as e:
+        print(
+            f"Error getting stockstats indicator data for indicators {indicators} from {before.strftime('%Y-%m-%d')} to {end_date}: {e}"
+        )
+        return f"No {', '.join(indicators)} data available for {symbol} from {before.strftime('%Y-%m-%d')} to {end_date}: {e}"
 
-    result_str = (
-        f"## {indicator} values from {before.strftime('%Y-%m-%d')} to {end_date}:\n\n"
-        + ind_string
-        + "\n\n"
-        + best_ind_params.get(indicator, "No description available.")
+    return "\n\n".join(
+        _format_indicator_window(indicator, windows[indicator], before, end_date, online)
+        for indicator in indicators
     )
 
-    return result_str
-
 
 def get_stockstats_indicator(
     symbol: Annotated[str, "ticker symbol of the company"],
@@ -852,25 +1021,16 @@ def get_YFin_data_window(
     before = date_obj - relativedelta(days=look_back_days)
     start_date = before.strftime("%Y-%m-%d")
 
-    # read in data
-    data = pd.read_csv(
+    # read in data (parsed once per process, sliced by binary search on the dates)
+    filtered_data = slice_offline_price_frame(
         os.path.join(
             DATA_DIR,
             f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-        )
+        ),
+        start_date,
+        curr_date,
     )
 
-    # Extract just the date part for comparison
-    data["DateOnly"] = data["Date"].str[:10]
-
-    # Filter data between the start and end dates (inclusive)
-    filtered_data = data[
-        (data["DateOnly"] >= start_date) & (data["DateOnly"] <= curr_date)
-    ]
-
-    # Drop the temporary column we created
-    filtered_data = filtered_data.drop("DateOnly", axis=1)
-
     # Set pandas display options to show the full DataFrame
     with pd.option_context(
         "display.max_rows", None, "display.max_columns", None, "display.width", None
@@ -883,6 +1043,19 @@ def get_YFin_data_window(
     )
 
 
+def _normalize_price_frame(data: pd.DataFrame) -> pd.DataFrame:
+    """Same layout for store reads and Ticker.history: naive dates, int volumes, fixed columns."""
+    # Remove timezone info from index for cleaner output
+    if data.index.tz is not None:
+        data.index = data.index.tz_localize(None)
+    data.index = pd.DatetimeIndex(data.index.normalize(), name="Date")
+    data = data.reindex(columns=PRICE_COLUMNS + ACTION_COLUMNS)
+    data["Volume"] = data["Volume"].fillna(0).astype("int64")
+    data[ACTION_COLUMNS] = data[ACTION_COLUMNS].fillna(0.0).astype("float64")
+    return data
+
+
+@shared_tool_result
 def get_YFin_data_online(
     symbol: Annotated[str, "ticker symbol of the company"],
     start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
@@ -892,12 +1065,26 @@ def get_YFin_data_online(
     datetime.strptime(start_date, "%Y-%m-%d")
     datetime.strptime(end_date, "%Y-%m-%d")
 
-    # Create ticker object
     symbol = guess_korea_market(symbol)
-    ticker = yf.Ticker(symbol.upper())
 
-    # Fetch historical data for the specified date range
-    data = ticker.history(start=start_date, end=end_date)
+    data = None
+    if end_date <= datetime.now().strftime("%Y-%m-%d"):
+        # Completed bars come from the local price store (warmed by prefetch_prices)
+        # when it already spans the range; end_date stays exclusive, as with Ticker.history
+        store = get_price_store()
+        last_date = (
+            datetime.strptime(end_date, "%Y-%m-%d") - relativedelta(days=1)
+        ).strftime("%Y-%m-%d")
+        if store.covers(symbol.upper(), start_date, last_date):
+            data = store.read(symbol.upper(), start_date, last_date, refresh=False)
+            data = data.set_index("Date")
+
+    if data is None:
+        # Create ticker object
+        ticker = yf.Ticker(symbol.upper())
+
+        # Fetch historical data for the specified date range
+        data = ticker.history(start=start_date, end=end_date)
 
     # Check if data is empty
     if data.empty:
@@ -905,9 +1092,7 @@ def get_YFin_data_online(
             f"No data found for symbol '{symbol}' between {start_date} and {end_date}"
         )
 
-    # Remove timezone info from index for cleaner output
-    if data.index.tz is not None:
-        data.index = data.index.tz_localize(None)
+    data = _normalize_price_frame(data)
 
     # Round numerical values to 2 decimal places for cleaner display
     numeric_columns = ["Open", "High", "Low", "Close", "Adj Close"]
@@ -931,29 +1116,17 @@ def get_YFin_data(
     start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
     end_date: Annotated[str, "End date in yyyy-mm-dd format"],
 ) -> str:
-    # read in data
-    data = pd.read_csv(
-        os.path.join(
-            DATA_DIR,
-            f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-        )
+    # read in data (parsed once per process, sliced by binary search on the dates)
+    data_path = os.path.join(
+        DATA_DIR,
+        f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
     )
-
     if end_date > "2025-03-25":
         raise Exception(
             f"Get_YFin_Data: {end_date} is outside of the data range of 2015-01-01 to 2025-03-25"
         )
 
-    # Extract just the date part for comparison
-    data["DateOnly"] = data["Date"].str[:10]
-
-    # Filter data between the start and end dates (inclusive)
-    filtered_data = data[
-        (data["DateOnly"] >= start_date) & (data["DateOnly"] <= end_date)
-    ]
-
-    # Drop the temporary column we created
-    filtered_data = filtered_data.drop("DateOnly", axis=1)
+    filtered_data = slice_offline_price_frame(data_path, start_date, end_date)
 
     # remove the index from the dataframe
     filtered_data = filtered_data.reset_index(drop=True)
@@ -961,6 +1134,7 @@ def get_YFin_data(
     return filtered_data
 
 
+@cached_response("openai.stock_news", vary_on_config=OPENAI_CACHE_CONFIG)
 def get_stock_news_openai(ticker, curr_date):
     config = get_config()
     client = OpenAI(base_url=config["backend_url"])
@@ -999,6 +1173,7 @@ def get_stock_news_openai(ticker, curr_date):
     return response.output[1].content[0].text
 
 
+@cached_response("openai.global_news", vary_on_config=OPENAI_CACHE_CONFIG)
 def get_global_news_openai(curr_date):
     config = get_config()
     client = OpenAI(base_url=config["backend_url"])
@@ -1034,13 +1209,13 @@ def get_global_news_openai(curr_date):
     return response.output[1].content[0].text
 
 
+@cached_response("openai.fundamentals", vary_on_config=OPENAI_CACHE_CONFIG)
 def get_fundamentals_openai(ticker, curr_date):
     config = get_config()
     client = OpenAI(base_url=config["backend_url"])
 
     if is_korea_stock(ticker):
-        from pykrx import stock
-        ticker_name = stock.get_market_ticker_name(ticker)
+        ticker_name = get_korea_stock_name(ticker)
         ticker = ticker + " " + ticker_name
 
     response = client.responses.create(
@@ -1075,6 +1250,7 @@ def get_fundamentals_openai(ticker, curr_date):
 
 
 
+@shared_tool_result
 def get_opendart_business_report(
     ticker: Annotated[str, "Korean stock ticker symbol (6-digit)"],
     curr_date: Annotated[str, "Current date in yyyy-mm-dd format"],
@@ -1093,11 +1269,9 @@ def get_opendart_business_report(
         return f"{ticker}는 한국 주식이 아니므로 OpenDART 사업보고서 분석을 수행할 수 없습니다."
 
     try:
-        import OpenDartReader
-        from .finnhub_utils import get_opendartreader_api_key
+        from .finnhub_utils import get_dart_client
 
-        dart_api_key = get_opendartreader_api_key()
-        dart = OpenDartReader.OpenDartReader(dart_api_key)
+        dart = get_dart_client()
 
         # 현재 연도 기준으로 최근 2개년의 사업보고서 조회
         current_year = int(curr_date[:4])
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import re
 import os
@@ -5,7 +6,9 @@ from datetime import datetime, timedelta
 from functools import lru_cache
 from typing import Any, Dict, List
 from urllib.parse import quote
-import requests
+
+from .ticker_utils import get_stock_name
+from .http_utils import cached_response, get_naver_client
 
 
 class NaverSearchClient:
@@ -97,38 +100,22 @@ class NaverSearchClient:
         except:
             return "언론사"
     
-    def search_news(self, query: str, display: int = 10, start: int = 1, sort: str = "date") -> Dict[str, Any]:
-        """
-        Naver News API를 사용한 뉴스 검색
-        
-        Args:
-            query: 검색어
-            display: 표시할 결과 수 (기본값: 10, 최대: 100)
-            start: 검색 시작 위치 (기본값: 1, 최대: 1000) 
-            sort: 정렬 방법 ("sim": 정확도순, "date": 날짜순)
-        """
-        
-        if not self.client_id or not self.client_secret:
-            print(f"[NaverNews] ❌ API 키 설정되지 않음 - 검색어: {query}")
-            return {
-                "query": query,
-                "total_count": 0,
-                "news": [],
-                "error": "Naver API credentials not configured"
-            }
-        
-        # 최신 뉴스 검색을 위한 쿼리 개선
-        current_year = datetime.now().year
-        
-        # 검색어에 최신 키워드 추가 (sort가 date일 때만)
-        enhanced_query = query
-            
-        print(f"[NaverNews] 🔍 뉴스 검색 시작 - 원본: '{query}' → 개선: '{enhanced_query}' (정렬: {sort})")
-        encoded_query = enhanced_query
+    def _credentials_error(self, query: str) -> Dict[str, Any]:
+        print(f"[NaverNews] ❌ API 키 설정되지 않음 - 검색어: {query}")
+        return {
+            "query": query,
+            "total_count": 0,
+            "news": [],
+            "error": "Naver API credentials not configured"
+        }
+
+    def _news_request(self, query: str, display: int, start: int, sort: str):
+        """뉴스 검색 요청의 (url, params, headers)를 만듭니다."""
+        print(f"[NaverNews] 🔍 뉴스 검색 시작 - 원본: '{query}' → 개선: '{query}' (정렬: {sort})")
         url = f"{self.base_url}/news.json"
         
         params = {
-            'query': encoded_query,
+            'query': query,
             'display': min(display, 100),  # 최대 100개
             'start': min(start, 1000),     # 최대 1000
             'sort': sort if sort in ['sim', 'date'] else 'date'  # 기본값을 date(최신순)로 변경
@@ -139,27 +126,60 @@ class NaverSearchClient:
             'X-Naver-Client-Secret': self.client_secret,
             'User-Agent': 'NaverSearchClient/1.0'
         }
+        print(f"[NaverNews] 📡 API 호출 중... URL: {url}")
+        return url, params, headers
+
+    def _handle_news_response(self, status_code: int, data_or_text, query: str) -> Dict[str, Any]:
+        if status_code == 200:
+            total_count = data_or_text.get('total', 0)
+            print(f"[NaverNews] ✅ API 응답 성공 - 총 {total_count}개 뉴스 발견")
+            return self._parse_naver_response(data_or_text, query, query)
+        print(f"[NaverNews] ❌ API 오류 - 상태코드: {status_code}")
+        raise Exception(f"Naver API Error {status_code}: {data_or_text}")
+
+    def _request_error(self, query: str, e: Exception) -> Dict[str, Any]:
+        print(f"[NaverNews] ❌ 요청 실패: {e}")
+        return {
+            "query": query,
+            "total_count": 0,
+            "news": [],
+            "error": str(e)
+        }
+
+    def search_news(self, query: str, display: int = 10, start: int = 1, sort: str = "date") -> Dict[str, Any]:
+        """
+        Naver News API를 사용한 뉴스 검색
+        
+        Args:
+            query: 검색어
+            display: 표시할 결과 수 (기본값: 10, 최대: 100)
+            start: 검색 시작 위치 (기본값: 1, 최대: 1000) 
+            sort: 정렬 방법 ("sim": 정확도순, "date": 날짜순)
+        """
+        
+        if not self.client_id or not self.client_secret:
+            return self._credentials_error(query)
+        
+        url, params, headers = self._news_request(query, display, start, sort)
         try:
-            print(f"[NaverNews] 📡 API 호출 중... URL: {url}")
-            response = requests.get(url, params=params, headers=headers, timeout=self.timeout_seconds)
-            
-            if response.status_code == 200:
-                data = response.json()
-                total_count = data.get('total', 0)
-                print(f"[NaverNews] ✅ API 응답 성공 - 총 {total_count}개 뉴스 발견")
-                return self._parse_naver_response(data, query, enhanced_query)
-            else:
-                print(f"[NaverNews] ❌ API 오류 - 상태코드: {response.status_code}")
-                raise Exception(f"Naver API Error {response.status_code}: {response.text}")
-                            
+            response = get_naver_client().get(url, params=params, headers=headers)
+            body = response.json() if response.status_code == 200 else response.text
+            return self._handle_news_response(response.status_code, body, query)
         except Exception as e:
-            print(f"[NaverNews] ❌ 요청 실패: {e}")
-            return {
-                "query": query,
-                "total_count": 0,
-                "news": [],
-                "error": str(e)
-            }
+            return self._request_error(query, e)
+
+    async def asearch_news(self, query: str, display: int = 10, start: int = 1, sort: str = "date") -> Dict[str, Any]:
+        """search_news의 async 버전 (공유 rate-limited 클라이언트 사용)"""
+        if not self.client_id or not self.client_secret:
+            return self._credentials_error(query)
+
+        url, params, headers = self._news_request(query, display, start, sort)
+        try:
+            response = await get_naver_client().aget(url, params=params, headers=headers)
+            body = response.json() if response.status_code == 200 else response.text
+            return self._handle_news_response(response.status_code, body, query)
+        except Exception as e:
+            return self._request_error(query, e)
     
     def _calculate_relevance_score(self, title: str, query: str) -> int:
         """제목과 쿼리의 관련성 점수 계산 (높을수록 관련성 높음)"""
@@ -360,7 +380,7 @@ class NaverSearchClient:
         }
         
         try:
-            response = requests.get(url, params=params, headers=headers, timeout=self.timeout_seconds)
+            response = get_naver_client().get(url, params=params, headers=headers)
             if response.status_code == 200:
                 data = response.json()
                 return self._parse_web_response(data, query)
@@ -405,36 +425,13 @@ def get_naver_search_client():
     return NaverSearchClient()
 
 
-def is_korea_stock(ticker: str):
-    """한국 주식 티커인지 확인"""
-    if ticker.isdigit() and len(ticker) == 6:
-        return True
-    return False
-
-
-def get_stock_name(ticker: str):
-    """
-    주식 티커에 대해 종목 이름을 반환합니다.
-    한국 주식이면 pykrx, 아니면 yfinance를 사용합니다.
-    """
-    if is_korea_stock(ticker):
-        try:
-            from pykrx import stock
-            ticker_name = stock.get_market_ticker_name(ticker)
-            return ticker_name
-        except Exception:
-            return ""
-    else:
-        try:
-            import yfinance as yf
-            ticker_obj = yf.Ticker(ticker)
-            info = ticker_obj.info
-            # shortName이 있으면 그걸, 없으면 longName, 둘 다 없으면 ""
-            return info.get("shortName") or info.get("longName") or ""
-        except Exception:
-            return ""
+def _is_naver_result(result: str) -> bool:
+    # 빈 결과와 API 에러 메시지는 캐시하지 않습니다
+    return bool(result) and not result.startswith("Naver News API Error")
 
 
+# Naver는 curr_date와 무관하게 최신 결과를 주므로 지난 날짜도 TTL 동안만 캐시
+@cached_response("naver.news", cache_if=_is_naver_result)
 def get_naver_news(
     query: str,
     curr_date: str,
@@ -456,15 +453,7 @@ def get_naver_news(
     
     print(f"[NaverNews] 🚀 뉴스 검색 함수 시작 - 쿼리: '{query}', 날짜: {curr_date}, 기간: {look_back_days}일")
     
-    # 한국 주식의 경우 종목명도 함께 검색
-    stock_name = get_stock_name(query)
-    if stock_name:
-        enhanced_query = f"{stock_name}"
-        print(f"[NaverNews] 🏢 한국 주식 인식 - '{query}' → '{stock_name}' 변경")
-    else:
-        enhanced_query = query
-        print(f"[NaverNews] 🌐 일반 검색어로 처리")
-    
+    enhanced_query = _enhance_query(query)
     client = get_naver_search_client()
     
     # 네이버 뉴스 검색
@@ -473,7 +462,43 @@ def get_naver_news(
         display=display,
         sort="date"  # 최신순으로 정렬
     )
-    
+    return _format_naver_news(query, curr_date, look_back_days, news_results)
+
+
+# Naver는 curr_date와 무관하게 최신 결과를 주므로 지난 날짜도 TTL 동안만 캐시
+@cached_response("naver.news", cache_if=_is_naver_result)
+async def aget_naver_news(
+    query: str,
+    curr_date: str,
+    look_back_days: int = 7,
+    display: int = 10
+) -> str:
+    """get_naver_news의 async 버전 (같은 응답 캐시 사용)"""
+    print(f"[NaverNews] 🚀 뉴스 검색 함수 시작 - 쿼리: '{query}', 날짜: {curr_date}, 기간: {look_back_days}일")
+
+    # 종목명 조회는 pykrx/yfinance(동기) 호출이라 스레드에서 실행
+    enhanced_query = await asyncio.to_thread(_enhance_query, query)
+    client = get_naver_search_client()
+
+    news_results = await client.asearch_news(
+        query=enhanced_query,
+        display=display,
+        sort="date"  # 최신순으로 정렬
+    )
+    return _format_naver_news(query, curr_date, look_back_days, news_results)
+
+
+def _enhance_query(query: str) -> str:
+    # 한국 주식의 경우 종목명도 함께 검색
+    stock_name = get_stock_name(query)
+    if stock_name:
+        print(f"[NaverNews] 🏢 한국 주식 인식 - '{query}' → '{stock_name}' 변경")
+        return f"{stock_name}"
+    print(f"[NaverNews] 🌐 일반 검색어로 처리")
+    return query
+
+
+def _format_naver_news(query: str, curr_date: str, look_back_days: int, news_results: Dict[str, Any]) -> str:
     if news_results.get("error"):
         print(f"[NaverNews] ❌ API 에러: {news_results['error']}")
         return f"Naver News API Error: {news_results['error']}"
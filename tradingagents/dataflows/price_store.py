@@ -0,0 +1,406 @@
+# per-symbol columnar OHLCV store backing the online price/indicator tools,
+# plus an in-process cache of the offline price CSVs
+
+import glob
+import os
+import threading
+import time
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Annotated, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+from .config import get_config
+from .ticker_utils import guess_korea_market
+
+PRICE_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+# corporate actions, kept so store reads match Ticker.history's columns
+ACTION_COLUMNS = ["Dividends", "Stock Splits"]
+BAR_DTYPE = np.dtype(
+    [("Date", "datetime64[D]")]
+    + [(column, "f8") for column in PRICE_COLUMNS + ACTION_COLUMNS]
+)
+HISTORY_YEARS = 15
+# refresh() removes store files unused for max_age_days at most this often
+EVICT_INTERVAL_SECONDS = 6 * 3600
+
+
+class PriceStore:
+    """
+    Daily bars kept as one structured NumPy array per symbol
+    (``{data_cache_dir}/price_store/{symbol}.npy``).
+
+    Reads memory-map the file and slice it by date with a binary search, so no
+    text is parsed. Refreshing only downloads the bars after the last stored
+    one; every write rewrites the file sorted and de-duplicated, which keeps it
+    compact. Store files that have not been refreshed for ``max_age_days`` are
+    removed by refresh(), at most once every EVICT_INTERVAL_SECONDS, so a
+    long-running server does not keep every symbol it ever read. The legacy
+    ``{symbol}-YFin-data-{start}-{end}.csv`` cache files are only removed when
+    asked (``cli prefetch`` calls evict_stale()).
+    """
+
+    def __init__(self, cache_dir: str, max_age_days: int = 30):
+        self.store_dir = os.path.join(cache_dir, "price_store")
+        self.legacy_dir = cache_dir
+        self.max_age_days = max_age_days
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._last_evicted: Optional[float] = None
+        self._evict_guard = threading.Lock()
+        os.makedirs(self.store_dir, exist_ok=True)
+
+    def _lock(self, symbol: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(symbol, threading.Lock())
+
+    def _path(self, symbol: str) -> str:
+        return os.path.join(self.store_dir, f"{symbol.upper()}.npy")
+
+    def _load(self, symbol: str) -> Optional[np.ndarray]:
+        try:
+            bars = np.load(self._path(symbol), mmap_mode="r")
+        except (FileNotFoundError, ValueError):
+            return None
+        # files written with an older bar layout are downloaded again in full
+        return bars if bars.dtype == BAR_DTYPE else None
+
+    def _write(self, symbol: str, bars: np.ndarray):
+        # sort by date and keep the newest copy of any duplicated bar
+        bars = bars[np.argsort(bars["Date"], kind="stable")[::-1]]
+        _, first = np.unique(bars["Date"], return_index=True)
+        bars = bars[first]
+
+        path = self._path(symbol)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.save(f, bars)
+        os.replace(tmp_path, path)
+
+    def _is_fresh(self, symbol: str) -> bool:
+        """A symbol counts as fresh once it has been refreshed today."""
+        try:
+            mtime = os.path.getmtime(self._path(symbol))
+        except OSError:
+            return False
+        return datetime.fromtimestamp(mtime).date() == date.today()
+
+    @staticmethod
+    def frame_to_bars(data: pd.DataFrame) -> np.ndarray:
+        """Convert a yfinance frame (Date index or column) to the store layout."""
+        if "Date" not in data.columns:
+            data = data.reset_index()
+            data = data.rename(columns={data.columns[0]: "Date"})
+        dates = pd.to_datetime(data["Date"])
+        if dates.dt.tz is not None:
+            dates = dates.dt.tz_localize(None)
+
+        bars = np.empty(len(data), dtype=BAR_DTYPE)
+        bars["Date"] = dates.values.astype("datetime64[D]")
+        for column in PRICE_COLUMNS:
+            bars[column] = pd.to_numeric(data[column], errors="coerce").to_numpy(
+                dtype="f8"
+            )
+        for column in ACTION_COLUMNS:
+            bars[column] = (
+                pd.to_numeric(data[column], errors="coerce").fillna(0).to_numpy(dtype="f8")
+                if column in data.columns
+                else 0.0
+            )
+        return bars[~np.isnan(bars["Close"])]
+
+    @staticmethod
+    def _download(symbol: str, start: str, end: str) -> np.ndarray:
+        data = yf.download(
+            symbol,
+            start=start,
+            end=end,
+            multi_level_index=False,
+            progress=False,
+            auto_adjust=True,
+            actions=True,
+        )
+        if data is None or data.empty:
+            return np.empty(0, dtype=BAR_DTYPE)
+        return PriceStore.frame_to_bars(data)
+
+    def write(self, symbol: str, bars: np.ndarray, replace: bool = False):
+        """Merge bars that were fetched elsewhere (e.g. a bulk download) into the store."""
+        with self._lock(symbol):
+            stored = None if replace else self._load(symbol)
+            if stored is not None and len(stored) > 0:
+                bars = np.concatenate([np.asarray(stored), bars])
+            self._write(symbol, bars)
+
+    def pending_start(self, symbol: str, history_start: str) -> Optional[str]:
+        """First date a refresh has to download for symbol, or None if it is fresh."""
+        stored = self._load(symbol)
+        if stored is None or len(stored) == 0:
+            return history_start
+        if self._is_fresh(symbol):
+            return None
+        # re-fetch the last stored bar too, to detect split/dividend re-adjustments
+        return str(stored["Date"][-1])
+
+    def covers(self, symbol: str, start_date: str, end_date: str) -> bool:
+        """Whether the stored bars span start_date..end_date (inclusive) without a refresh."""
+        stored = self._load(symbol)
+        if stored is None or len(stored) == 0:
+            return False
+        if stored["Date"][0] > np.datetime64(start_date, "D"):
+            return False
+        # refreshed today means every completed bar is stored
+        return self._is_fresh(symbol) or stored["Date"][-1] >= np.datetime64(end_date, "D")
+
+    def merge_trailing(self, symbol: str, new_bars: np.ndarray) -> bool:
+        """
+        Append bars downloaded from the last stored date onwards.
+        Returns False when the adjusted history has changed and the symbol
+        needs a full reload instead.
+        """
+        with self._lock(symbol):
+            stored = self._load(symbol)
+            if stored is None or len(stored) == 0:
+                if len(new_bars) > 0:
+                    self._write(symbol, new_bars)
+                return True
+
+            last_date = stored["Date"][-1]
+            overlap = new_bars[new_bars["Date"] == last_date]
+            if len(overlap) > 0 and not np.isclose(
+                overlap["Close"][0], stored["Close"][-1], rtol=1e-6
+            ):
+                return False
+            if len(new_bars) == len(overlap):
+                # no bars since the last refresh, just mark the file fresh
+                os.utime(self._path(symbol))
+                return True
+            self._write(symbol, np.concatenate([np.asarray(stored), new_bars]))
+            return True
+
+    def refresh(self, symbol: str) -> np.ndarray:
+        """Append the bars missing since the last stored one and return the full history."""
+        today = pd.Timestamp.today().normalize()
+        # the end date is exclusive, so today's partial bar is never stored
+        end = today.strftime("%Y-%m-%d")
+        history_start = (today - pd.DateOffset(years=HISTORY_YEARS)).strftime(
+            "%Y-%m-%d"
+        )
+
+        self._evict_if_due(keep=symbol)
+        start = self.pending_start(symbol, history_start)
+        if start is not None:
+            new_bars = self._download(symbol, start, end)
+            # an empty download is left alone so the next call retries it
+            if len(new_bars) > 0 and not self.merge_trailing(symbol, new_bars):
+                # adjusted history changed, reload it in full
+                bars = self._download(symbol, history_start, end)
+                if len(bars) > 0:
+                    self.write(symbol, bars, replace=True)
+
+        return self._load(symbol)
+
+    def read(
+        self,
+        symbol: Annotated[str, "ticker symbol"],
+        start_date: Annotated[Optional[str], "first date to return, YYYY-mm-dd"] = None,
+        end_date: Annotated[Optional[str], "last date to return (inclusive), YYYY-mm-dd"] = None,
+        refresh: Annotated[bool, "download missing trailing bars first"] = True,
+    ) -> pd.DataFrame:
+        """Return the bars between start_date and end_date as a DataFrame with a Date column."""
+        bars = self.refresh(symbol) if refresh else self._load(symbol)
+        if bars is None or len(bars) == 0:
+            return pd.DataFrame(columns=["Date"] + PRICE_COLUMNS)
+
+        lo, hi = 0, len(bars)
+        if start_date:
+            lo = np.searchsorted(bars["Date"], np.datetime64(start_date, "D"), side="left")
+        if end_date:
+            hi = np.searchsorted(bars["Date"], np.datetime64(end_date, "D"), side="right")
+
+        window = np.array(bars[lo:hi])
+        data = pd.DataFrame({column: window[column] for column in BAR_DTYPE.names})
+        data["Date"] = data["Date"].astype("datetime64[ns]")
+        return data
+
+    def _evict_store_files(self, keep: Optional[str] = None) -> int:
+        """Remove store files not refreshed for max_age_days (except keep's)."""
+        removed = 0
+        cutoff = time.time() - self.max_age_days * 86400
+        for path in glob.glob(os.path.join(self.store_dir, "*.npy")):
+            symbol = os.path.basename(path)[: -len(".npy")]
+            if keep is not None and symbol == keep.upper():
+                continue
+            with self._lock(symbol):
+                try:
+                    if os.path.getmtime(path) < cutoff:
+                        os.remove(path)
+                        removed += 1
+                except OSError:
+                    pass
+        return removed
+
+    def _evict_if_due(self, keep: Optional[str] = None):
+        with self._evict_guard:
+            now = time.monotonic()
+            if (
+                self._last_evicted is not None
+                and now - self._last_evicted < EVICT_INTERVAL_SECONDS
+            ):
+                return
+            self._last_evicted = now
+        self._evict_store_files(keep)
+
+    def evict_stale(self):
+        """Remove legacy date-stamped CSV caches and store files unused for max_age_days."""
+        removed = 0
+        for path in glob.glob(os.path.join(self.legacy_dir, "*-YFin-data-*.csv")):
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                pass
+        return removed + self._evict_store_files()
+
+
+def _download_many(symbols, start, end, max_retries, retry_wait):
+    """One threaded multi-symbol yf.download, retrying only the symbols that came back empty."""
+    bars = {}
+    remaining = list(symbols)
+    for attempt in range(max_retries):
+        try:
+            data = yf.download(
+                remaining,
+                start=start,
+                end=end,
+                group_by="ticker",
+                threads=True,
+                progress=False,
+                auto_adjust=True,
+                actions=True,
+            )
+        except Exception as e:
+            print(f"Bulk price download failed ({len(remaining)} symbols): {e}")
+            data = None
+
+        if data is not None and not data.empty:
+            downloaded = set(data.columns.get_level_values(0))
+            for symbol in remaining:
+                if symbol not in downloaded:
+                    continue
+                symbol_bars = PriceStore.frame_to_bars(data[symbol])
+                if len(symbol_bars) > 0:
+                    bars[symbol] = symbol_bars
+
+        remaining = [symbol for symbol in remaining if symbol not in bars]
+        if not remaining or attempt == max_retries - 1:
+            break
+        time.sleep(retry_wait * 2**attempt)
+    return bars
+
+
+def prefetch_prices(
+    symbols: Annotated[List[str], "tickers to warm the price store for"],
+    chunk_size: Annotated[int, "symbols per yf.download call"] = 50,
+    max_retries: Annotated[int, "download attempts per chunk"] = 3,
+    retry_wait: Annotated[float, "base back-off between attempts, in seconds"] = 2.0,
+) -> Dict[str, str]:
+    """
+    Warm the price store for a whole watchlist with chunked multi-symbol
+    downloads, so later analyses read every symbol from the store.
+    Symbols that are already fresh are skipped; the others are grouped by the
+    date their refresh has to start from and downloaded together.
+
+    Returns a status per resolved symbol: "fresh", "updated", "reloaded" or "failed".
+    """
+    store = get_price_store()
+    today = pd.Timestamp.today().normalize()
+    end = today.strftime("%Y-%m-%d")
+    history_start = (today - pd.DateOffset(years=HISTORY_YEARS)).strftime("%Y-%m-%d")
+
+    status = {}
+    pending: Dict[str, List[str]] = {}
+    for symbol in dict.fromkeys(guess_korea_market(s.strip().upper()) for s in symbols):
+        start = store.pending_start(symbol, history_start)
+        if start is None:
+            status[symbol] = "fresh"
+        else:
+            pending.setdefault(start, []).append(symbol)
+
+    reload = []
+    for start, group in pending.items():
+        for i in range(0, len(group), chunk_size):
+            chunk = group[i : i + chunk_size]
+            downloaded = _download_many(chunk, start, end, max_retries, retry_wait)
+            for symbol in chunk:
+                if symbol not in downloaded:
+                    status[symbol] = "failed"
+                elif store.merge_trailing(symbol, downloaded[symbol]):
+                    status[symbol] = "updated"
+                else:
+                    reload.append(symbol)
+
+    for i in range(0, len(reload), chunk_size):
+        chunk = reload[i : i + chunk_size]
+        downloaded = _download_many(chunk, history_start, end, max_retries, retry_wait)
+        for symbol in chunk:
+            if symbol in downloaded:
+                store.write(symbol, downloaded[symbol], replace=True)
+                status[symbol] = "reloaded"
+            else:
+                status[symbol] = "failed"
+
+    return status
+
+
+_stores: Dict[str, PriceStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_price_store() -> PriceStore:
+    """Return the process-wide store for the configured data_cache_dir."""
+    config = get_config()
+    cache_dir = config["data_cache_dir"]
+    with _stores_lock:
+        store = _stores.get(cache_dir)
+        if store is None:
+            store = PriceStore(cache_dir, config.get("price_store_max_age_days", 30))
+            _stores[cache_dir] = store
+    return store
+
+
+@lru_cache(maxsize=64)
+def _load_offline_price_frame(path: str, mtime: float):
+    data = pd.read_csv(path)
+    dates = pd.DatetimeIndex(pd.to_datetime(data["Date"].astype(str).str[:10]))
+    return data, dates
+
+
+def get_offline_price_frame(
+    path: Annotated[str, "path of a {symbol}-YFin-data-*.csv price file"],
+):
+    """
+    Parse an offline price CSV once per process and return it with a DatetimeIndex
+    of its bar dates. Cached frames are keyed on the file's mtime, so a replaced
+    file is re-read. Callers must not mutate the returned frame.
+    """
+    return _load_offline_price_frame(path, os.path.getmtime(path))
+
+
+def slice_offline_price_frame(
+    path: Annotated[str, "path of a {symbol}-YFin-data-*.csv price file"],
+    start_date: Annotated[str, "first date to return, YYYY-mm-dd"],
+    end_date: Annotated[str, "last date to return (inclusive), YYYY-mm-dd"],
+) -> pd.DataFrame:
+    """Return the rows between start_date and end_date, keeping the file's row labels."""
+    data, dates = get_offline_price_frame(path)
+    start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+
+    if dates.is_monotonic_increasing:
+        lo = dates.searchsorted(start, side="left")
+        hi = dates.searchsorted(end, side="right")
+        return data.iloc[lo:hi].copy()
+    return data[(dates >= start) & (dates <= end)].copy()
@@ -3,9 +3,14 @@ import time
 import json
 from datetime import datetime, timedelta
 from contextlib import contextmanager
-from typing import Annotated
+from functools import lru_cache
+from typing import Annotated, Callable, Dict, List, Tuple
 import os
 import re
+import sqlite3
+import threading
+
+from .config import get_config
 
 ticker_to_company = {
     "AAPL": "Apple",
@@ -49,87 +54,258 @@ ticker_to_company = {
 }
 
 
-def fetch_top_from_category(
+REDDIT_INDEX_FILE = "reddit_index.sqlite3"
+
+_INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS posts (
+    path TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    post_date TEXT NOT NULL,
+    upvotes INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    PRIMARY KEY (path, line)
+);
+CREATE INDEX IF NOT EXISTS posts_by_date ON posts (path, post_date, upvotes DESC, line);
+CREATE TABLE IF NOT EXISTS post_matches (
+    path TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    match_key TEXT NOT NULL,
+    matched INTEGER NOT NULL,
+    PRIMARY KEY (path, match_key, line)
+);
+"""
+
+
+class RedditIndex:
+    """
+    Reddit JSONL 코퍼스에 대한 SQLite 인덱스.
+    게시물마다 subreddit 파일, UTC 날짜, upvotes, 바이트 오프셋을 저장해서
+    날짜 범위 조회 시 해당 날짜의 줄만 읽어 JSON 파싱합니다.
+    파일 크기나 mtime이 바뀌면 그 파일만 다시 인덱싱합니다.
+    """
+
+    def __init__(self, index_path: str):
+        self.index_path = index_path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_INDEX_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.index_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _index_file(conn, path: str, size: int, mtime_ns: int):
+        rows = []
+        offset = 0
+        with open(path, "rb") as f:
+            for line_no, line in enumerate(f):
+                # skip empty lines
+                if line.strip():
+                    parsed_line = json.loads(line)
+                    post_date = datetime.utcfromtimestamp(
+                        parsed_line["created_utc"]
+                    ).strftime("%Y-%m-%d")
+                    rows.append(
+                        (path, line_no, post_date, parsed_line["ups"], offset, len(line))
+                    )
+                offset += len(line)
+        conn.execute("DELETE FROM posts WHERE path = ?", (path,))
+        conn.execute("DELETE FROM post_matches WHERE path = ?", (path,))
+        conn.executemany("INSERT INTO posts VALUES (?, ?, ?, ?, ?, ?)", rows)
+        conn.execute(
+            "INSERT OR REPLACE INTO files VALUES (?, ?, ?)", (path, size, mtime_ns)
+        )
+
+    def ensure_indexed(self, category_dir: str) -> List[str]:
+        """Index new or modified .jsonl files; returns the subreddit files in listdir order."""
+        paths = [
+            os.path.abspath(os.path.join(category_dir, data_file))
+            for data_file in os.listdir(category_dir)
+            if data_file.endswith(".jsonl")
+        ]
+        with self._lock, self._connect() as conn:
+            for path in paths:
+                stat = os.stat(path)
+                known = conn.execute(
+                    "SELECT size, mtime_ns FROM files WHERE path = ?", (path,)
+                ).fetchone()
+                if known != (stat.st_size, stat.st_mtime_ns):
+                    self._index_file(conn, path, stat.st_size, stat.st_mtime_ns)
+        return paths
+
+    def top_posts(
+        self,
+        path: str,
+        start_date: str,
+        end_date: str,
+        limit_per_day: int,
+        match_key: str = None,
+        matcher: Callable[[dict], bool] = None,
+    ) -> List[Tuple[str, dict]]:
+        """
+        Return (post_date, parsed post) for the top limit_per_day posts of each day in
+        [start_date, end_date], ordered by date, then upvotes (desc), then position in the file.
+        With a match_key, only posts accepted by matcher are kept. Match results are stored
+        in the index so a post is checked at most once per match_key.
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT p.post_date, p.line, p.offset, p.length, m.matched FROM posts p"
+                " LEFT JOIN post_matches m"
+                " ON m.path = p.path AND m.line = p.line AND m.match_key = ?"
+                " WHERE p.path = ? AND p.post_date BETWEEN ? AND ?"
+                " AND (m.matched IS NULL OR m.matched = 1)"
+                " ORDER BY p.post_date, p.upvotes DESC, p.line",
+                (match_key or "", path, start_date, end_date),
+            ).fetchall()
+        if not rows:
+            return []
+
+        posts = []
+        new_matches = []
+        taken: Dict[str, int] = {}
+        with open(path, "rb") as f:
+            for post_date, line_no, offset, length, matched in rows:
+                if taken.get(post_date, 0) >= limit_per_day:
+                    continue
+                f.seek(offset)
+                parsed_line = json.loads(f.read(length))
+                if match_key and matched is None:
+                    matched = matcher(parsed_line)
+                    new_matches.append((path, line_no, match_key, int(matched)))
+                    if not matched:
+                        continue
+                posts.append((post_date, parsed_line))
+                taken[post_date] = taken.get(post_date, 0) + 1
+
+        if new_matches:
+            with self._connect() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO post_matches VALUES (?, ?, ?, ?)",
+                    new_matches,
+                )
+        return posts
+
+
+_indexes: Dict[str, RedditIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_reddit_index() -> RedditIndex:
+    """Return the process-wide Reddit index for the configured data_cache_dir."""
+    index_path = os.path.join(get_config()["data_cache_dir"], REDDIT_INDEX_FILE)
+    with _indexes_lock:
+        index = _indexes.get(index_path)
+        if index is None:
+            index = RedditIndex(index_path)
+            _indexes[index_path] = index
+    return index
+
+
+@lru_cache(maxsize=None)
+def company_matcher(query: str) -> Callable[[dict], bool]:
+    """
+    Build the company-news filter for a ticker once: the company names in
+    ticker_to_company plus the ticker itself, compiled into a single
+    case-insensitive alternation that scans the title and selftext once each.
+    """
+    search_terms = ticker_to_company[query].split(" OR ")
+    search_terms.append(query)
+    pattern = re.compile(
+        "|".join(f"(?:{term})" for term in search_terms), re.IGNORECASE
+    )
+
+    def matches(parsed_line: dict) -> bool:
+        return bool(
+            pattern.search(parsed_line["title"])
+            or pattern.search(parsed_line["selftext"])
+        )
+
+    return matches
+
+
+def fetch_top_from_category_window(
     category: Annotated[
         str, "Category to fetch top post from. Collection of subreddits."
     ],
-    date: Annotated[str, "Date to fetch top posts from."],
-    max_limit: Annotated[int, "Maximum number of posts to fetch."],
+    start_date: Annotated[str, "First date (yyyy-mm-dd) to fetch top posts from."],
+    end_date: Annotated[str, "Last date (yyyy-mm-dd) to fetch top posts from."],
+    max_limit: Annotated[int, "Maximum number of posts to fetch per day."],
     query: Annotated[str, "Optional query to search for in the subreddit."] = None,
     data_path: Annotated[
         str,
         "Path to the data folder. Default is 'reddit_data'.",
     ] = "reddit_data",
 ):
-    base_path = data_path
-
-    all_content = []
+    """
+    Same as calling fetch_top_from_category once per day from start_date to end_date
+    and concatenating the results, but served from the Reddit index in one pass.
+    """
+    category_dir = os.path.join(data_path, category)
+    num_files = len(os.listdir(category_dir))
 
-    if max_limit < len(os.listdir(os.path.join(base_path, category))):
+    if max_limit < num_files:
         raise ValueError(
             "REDDIT FETCHING ERROR: max limit is less than the number of files in the category. Will not be able to fetch any posts"
         )
 
-    limit_per_subreddit = max_limit // len(
-        os.listdir(os.path.join(base_path, category))
-    )
-
-    for data_file in os.listdir(os.path.join(base_path, category)):
-        # check if data_file is a .jsonl file
-        if not data_file.endswith(".jsonl"):
-            continue
+    limit_per_subreddit = max_limit // num_files
 
-        all_content_curr_subreddit = []
+    index = get_reddit_index()
+    # if is company_news, keep only posts that mention the company's name (query)
+    match_key = matcher = None
+    if "company" in category and query:
+        # cached matches are keyed by the search terms so editing ticker_to_company invalidates them
+        match_key = f"{query}={ticker_to_company[query]}"
+        matcher = company_matcher(query)
 
-        with open(os.path.join(base_path, category, data_file), "rb") as f:
-            for i, line in enumerate(f):
-                # skip empty lines
-                if not line.strip():
-                    continue
+    # date -> top posts of each subreddit, in subreddit file order
+    posts_by_date: Dict[str, List[dict]] = {}
 
-                parsed_line = json.loads(line)
+    for path in index.ensure_indexed(category_dir):
+        for post_date, parsed_line in index.top_posts(
+            path, start_date, end_date, limit_per_subreddit, match_key, matcher
+        ):
+            post = {
+                "title": parsed_line["title"],
+                "content": parsed_line["selftext"],
+                "url": parsed_line["url"],
+                "upvotes": parsed_line["ups"],
+                "posted_date": post_date,
+            }
+            posts_by_date.setdefault(post_date, []).append(post)
 
-                # select only lines that are from the date
-                post_date = datetime.utcfromtimestamp(
-                    parsed_line["created_utc"]
-                ).strftime("%Y-%m-%d")
-                if post_date != date:
-                    continue
-
-                # if is company_news, check that the title or the content has the company's name (query) mentioned
-                if "company" in category and query:
-                    search_terms = []
-                    if "OR" in ticker_to_company[query]:
-                        search_terms = ticker_to_company[query].split(" OR ")
-                    else:
-                        search_terms = [ticker_to_company[query]]
-
-                    search_terms.append(query)
-
-                    found = False
-                    for term in search_terms:
-                        if re.search(
-                            term, parsed_line["title"], re.IGNORECASE
-                        ) or re.search(term, parsed_line["selftext"], re.IGNORECASE):
-                            found = True
-                            break
-
-                    if not found:
-                        continue
-
-                post = {
-                    "title": parsed_line["title"],
-                    "content": parsed_line["selftext"],
-                    "url": parsed_line["url"],
-                    "upvotes": parsed_line["ups"],
-                    "posted_date": post_date,
-                }
-
-                all_content_curr_subreddit.append(post)
-
-        # sort all_content_curr_subreddit by upvote_ratio in descending order
-        all_content_curr_subreddit.sort(key=lambda x: x["upvotes"], reverse=True)
+    all_content = []
+    for post_date in sorted(posts_by_date):
+        all_content.extend(posts_by_date[post_date])
+    return all_content
 
-        all_content.extend(all_content_curr_subreddit[:limit_per_subreddit])
 
-    return all_content
+def fetch_top_from_category(
+    category: Annotated[
+        str, "Category to fetch top post from. Collection of subreddits."
+    ],
+    date: Annotated[str, "Date to fetch top posts from."],
+    max_limit: Annotated[int, "Maximum number of posts to fetch."],
+    query: Annotated[str, "Optional query to search for in the subreddit."] = None,
+    data_path: Annotated[
+        str,
+        "Path to the data folder. Default is 'reddit_data'.",
+    ] = "reddit_data",
+):
+    return fetch_top_from_category_window(
+        category, date, date, max_limit, query=query, data_path=data_path
+    )
@@ -1,21 +1,18 @@
 import pandas as pd
 import yfinance as yf
 from stockstats import wrap
-from typing import Annotated
+from typing import Annotated, Dict, List
 import os
-from .config import get_config
+from .price_store import get_price_store, get_offline_price_frame
+
+
+NON_TRADING_DAY = "N/A: Not a trading day (weekend or holiday)"
 
 
 class StockstatsUtils:
     @staticmethod
-    def get_stock_stats(
+    def get_stock_stats_frame(
         symbol: Annotated[str, "ticker symbol for the company"],
-        indicator: Annotated[
-            str, "quantitative indicators based off of the stock data for the company"
-        ],
-        curr_date: Annotated[
-            str, "curr date for retrieving stock price data, YYYY-mm-dd"
-        ],
         data_dir: Annotated[
             str,
             "directory where the stock data is stored.",
@@ -25,57 +22,57 @@ class StockstatsUtils:
             "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
         ] = False,
     ):
-        df = None
+        """
+        Load the OHLCV price history for a symbol and wrap it with stockstats.
+        The returned frame has its "Date" column normalised to YYYY-mm-dd strings
+        so callers can compute any number of indicators on it without reloading.
+        """
         data = None
 
         if not online:
             try:
-                data = pd.read_csv(
+                data, _ = get_offline_price_frame(
                     os.path.join(
                         data_dir,
                         f"{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
                     )
                 )
-                df = wrap(data)
             except FileNotFoundError:
                 raise Exception("Stockstats fail: Yahoo Finance data not fetched yet!")
+            df = wrap(data.copy())
+            df["Date"] = df["Date"].astype(str).str[:10]
         else:
-            # Get today's date as YYYY-mm-dd to add to cache
-            today_date = pd.Timestamp.today()
-            curr_date = pd.to_datetime(curr_date)
-
-            end_date = today_date
-            start_date = today_date - pd.DateOffset(years=15)
-            start_date = start_date.strftime("%Y-%m-%d")
-            end_date = end_date.strftime("%Y-%m-%d")
-
-            # Get config and ensure cache directory exists
-            config = get_config()
-            os.makedirs(config["data_cache_dir"], exist_ok=True)
-
-            data_file = os.path.join(
-                config["data_cache_dir"],
-                f"{symbol}-YFin-data-{start_date}-{end_date}.csv",
-            )
-
-            if os.path.exists(data_file):
-                data = pd.read_csv(data_file)
-                data["Date"] = pd.to_datetime(data["Date"])
-            else:
-                data = yf.download(
-                    symbol,
-                    start=start_date,
-                    end=end_date,
-                    multi_level_index=False,
-                    progress=False,
-                    auto_adjust=True,
-                )
-                data = data.reset_index()
-                data.to_csv(data_file, index=False)
+            # served from the per-symbol columnar store, which only downloads
+            # the bars missing since its last refresh
+            data = get_price_store().read(symbol)
+            if data.empty:
+                raise Exception(f"Stockstats fail: no price data available for {symbol}")
 
             df = wrap(data)
             df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
-            curr_date = curr_date.strftime("%Y-%m-%d")
+
+        return df
+
+    @staticmethod
+    def get_stock_stats(
+        symbol: Annotated[str, "ticker symbol for the company"],
+        indicator: Annotated[
+            str, "quantitative indicators based off of the stock data for the company"
+        ],
+        curr_date: Annotated[
+            str, "curr date for retrieving stock price data, YYYY-mm-dd"
+        ],
+        data_dir: Annotated[
+            str,
+            "directory where the stock data is stored.",
+        ],
+        online: Annotated[
+            bool,
+            "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
+        ] = False,
+    ):
+        df = StockstatsUtils.get_stock_stats_frame(symbol, data_dir, online=online)
+        curr_date = pd.to_datetime(curr_date).strftime("%Y-%m-%d")
 
         df[indicator]  # trigger stockstats to calculate the indicator
         matching_rows = df[df["Date"].str.startswith(curr_date)]
@@ -84,4 +81,87 @@ class StockstatsUtils:
             indicator_value = matching_rows[indicator].values[0]
             return indicator_value
         else:
-            return "N/A: Not a trading day (weekend or holiday)"
+            return NON_TRADING_DAY
+
+    @staticmethod
+    def get_stock_stats_window(
+        symbol: Annotated[str, "ticker symbol for the company"],
+        indicator: Annotated[
+            str, "quantitative indicators based off of the stock data for the company"
+        ],
+        curr_date: Annotated[
+            str, "curr date for retrieving stock price data, YYYY-mm-dd"
+        ],
+        look_back_days: Annotated[int, "how many days to look back"],
+        data_dir: Annotated[
+            str,
+            "directory where the stock data is stored.",
+        ],
+        online: Annotated[
+            bool,
+            "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
+        ] = False,
+    ) -> pd.Series:
+        """
+        Compute an indicator once and return its values for every calendar day
+        from curr_date back to curr_date - look_back_days (newest first).
+        Days without a bar are filled with NON_TRADING_DAY.
+        """
+        df = StockstatsUtils.get_stock_stats_frame(symbol, data_dir, online=online)
+        df[indicator]  # trigger stockstats to calculate the indicator
+
+        return StockstatsUtils.slice_indicator_window(
+            df, indicator, curr_date, look_back_days
+        )
+
+    @staticmethod
+    def get_stock_stats_windows(
+        symbol: Annotated[str, "ticker symbol for the company"],
+        indicators: Annotated[
+            List[str],
+            "quantitative indicators based off of the stock data for the company",
+        ],
+        curr_date: Annotated[
+            str, "curr date for retrieving stock price data, YYYY-mm-dd"
+        ],
+        look_back_days: Annotated[int, "how many days to look back"],
+        data_dir: Annotated[
+            str,
+            "directory where the stock data is stored.",
+        ],
+        online: Annotated[
+            bool,
+            "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
+        ] = False,
+    ) -> Dict[str, pd.Series]:
+        """
+        Like get_stock_stats_window, but computes several indicators on one
+        shared price frame. Returns a dict of indicator -> window series.
+        """
+        df = StockstatsUtils.get_stock_stats_frame(symbol, data_dir, online=online)
+
+        windows = {}
+        for indicator in indicators:
+            df[indicator]  # trigger stockstats to calculate the indicator
+            windows[indicator] = StockstatsUtils.slice_indicator_window(
+                df, indicator, curr_date, look_back_days
+            )
+        return windows
+
+    @staticmethod
+    def slice_indicator_window(
+        df: pd.DataFrame,
+        indicator: str,
+        curr_date: str,
+        look_back_days: int,
+    ) -> pd.Series:
+        """Reindex an already computed indicator column onto the look-back calendar."""
+        values = pd.Series(df[indicator].to_numpy(), index=df["Date"].to_numpy())
+        values = values[~values.index.duplicated()]
+
+        calendar = pd.date_range(
+            end=pd.to_datetime(curr_date), periods=look_back_days + 1, freq="D"
+        )[::-1].strftime("%Y-%m-%d")
+
+        window = values.reindex(calendar).astype(object)
+        return window.where(calendar.isin(values.index), NON_TRADING_DAY)
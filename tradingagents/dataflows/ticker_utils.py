@@ -0,0 +1,262 @@
+# resolves Korean tickers to their Yahoo Finance exchange suffix
+
+import json
+import os
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional
+
+import yfinance as yf
+
+from .config import get_config
+
+# Optional KOSPI/KOSDAQ listing snapshot ({"005930": ".KS", ...}) shipped next to
+# this module. Regenerate it with build_krx_listing_snapshot().
+KRX_LISTING_SNAPSHOT = os.path.join(os.path.dirname(__file__), "krx_listing.json")
+KOREA_MARKET_CACHE_FILE = "korea_market_cache.json"
+# KRX ticker -> 종목명 목록, 하루 한 번 갱신
+KRX_STOCK_NAMES_FILE = "krx_stock_names.json"
+KRX_MARKETS = ("KOSPI", "KOSDAQ", "KONEX")
+# 종목명 갱신 실패 후 다시 시도하기까지 기다리는 시간 (KRX 장애 중 매 조회마다 재요청 방지)
+KRX_STOCK_NAMES_RETRY_SECONDS = 600
+
+_market_cache: Optional[Dict[str, str]] = None
+_market_cache_lock = threading.Lock()
+
+_stock_names: Optional[Dict[str, str]] = None
+_stock_names_date: Optional[date] = None
+_stock_names_failed_at: Optional[float] = None
+_stock_names_lock = threading.Lock()
+# pykrx 갱신은 한 스레드만 수행 (조회는 _stock_names_lock만 잠깐 잡음)
+_stock_names_refresh_lock = threading.Lock()
+
+
+def is_korea_stock(ticker: str):
+    if ticker.isdigit() and len(ticker) == 6:
+        return True
+    return False
+
+
+def _market_cache_path():
+    return os.path.join(get_config()["data_cache_dir"], KOREA_MARKET_CACHE_FILE)
+
+
+def _load_market_cache() -> Dict[str, str]:
+    """Load the snapshot and the on-disk cache once per process (caller holds the lock)."""
+    global _market_cache
+    if _market_cache is None:
+        cache = {}
+        # entries learned at runtime take precedence over the bundled snapshot
+        for path in (KRX_LISTING_SNAPSHOT, _market_cache_path()):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    cache.update(json.load(f))
+            except (OSError, ValueError):
+                continue
+        _market_cache = cache
+    return _market_cache
+
+
+def _save_market_cache(cache: Dict[str, str]):
+    path = _market_cache_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _lookup_korea_market(ticker: str) -> Optional[str]:
+    """yfinance로 코스피(.KS) / 코스닥(.KQ) 여부를 확인합니다."""
+    try:
+        info_ks = yf.Ticker(ticker + ".KS").info
+        if info_ks and "shortName" in info_ks and info_ks.get("exchange") == "KSC":
+            return ".KS"
+    except Exception:
+        pass
+    try:
+        info_kq = yf.Ticker(ticker + ".KQ").info
+        if info_kq and "shortName" in info_kq and info_kq.get("exchange") == "KOE":
+            return ".KQ"
+    except Exception:
+        pass
+    return None
+
+
+def guess_korea_market(ticker: str):
+    """
+    한국 주식 티커에 시장 접미사(.KS / .KQ)를 붙여 반환합니다.
+    결과는 프로세스 메모리와 data_cache_dir의 캐시 파일에 저장되므로
+    한 번 확인된 티커는 이후 네트워크 호출 없이 바로 반환됩니다.
+    """
+    # 이미 .KS나 .KQ가 붙어 있으면 제거
+    if ticker.endswith(".KS") or ticker.endswith(".KQ"):
+        ticker = ticker[:-3]
+    if not is_korea_stock(ticker):
+        return ticker
+
+    with _market_cache_lock:
+        suffix = _load_market_cache().get(ticker)
+    if suffix is not None:
+        return ticker + suffix
+
+    suffix = _lookup_korea_market(ticker)
+    if suffix is None:
+        # lookup failures are not cached so a transient outage can recover
+        return ticker
+
+    with _market_cache_lock:
+        cache = _load_market_cache()
+        cache[ticker] = suffix
+        try:
+            _save_market_cache(cache)
+        except OSError as e:
+            print(f"Failed to persist Korean market cache: {e}")
+    return ticker + suffix
+
+
+def build_krx_listing_snapshot(path: str = KRX_LISTING_SNAPSHOT) -> Dict[str, str]:
+    """Write a KOSPI/KOSDAQ ticker -> suffix snapshot from the KRX listing (pykrx)."""
+    from pykrx import stock
+
+    listing = {}
+    for market, suffix in (("KOSPI", ".KS"), ("KOSDAQ", ".KQ")):
+        for ticker in stock.get_market_ticker_list(market=market):
+            listing[ticker] = suffix
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(listing, f, sort_keys=True)
+
+    global _market_cache
+    with _market_cache_lock:
+        _market_cache = None
+    return listing
+
+
+def _stock_names_path():
+    return os.path.join(get_config()["data_cache_dir"], KRX_STOCK_NAMES_FILE)
+
+
+def _fetch_krx_stock_names() -> Dict[str, str]:
+    """시장별 등락률 표(종목명 포함)를 한 번씩 받아 종목명 목록을 만듭니다."""
+    from pykrx import stock
+
+    today = date.today()
+    # 휴장일에도 최근 거래일이 포함되도록 일주일 범위로 조회
+    fromdate = (today - timedelta(days=7)).strftime("%Y%m%d")
+    todate = today.strftime("%Y%m%d")
+    names = {}
+    for market in KRX_MARKETS:
+        df = stock.get_market_price_change(fromdate, todate, market=market)
+        names.update(df["종목명"].to_dict())
+    if not names:
+        raise ValueError("KRX returned an empty listing")
+    return names
+
+
+def _stock_names_backing_off() -> bool:
+    """최근 갱신 실패 후 재시도 대기 중인지 (caller holds _stock_names_lock)."""
+    return (
+        _stock_names_failed_at is not None
+        and time.monotonic() - _stock_names_failed_at < KRX_STOCK_NAMES_RETRY_SECONDS
+    )
+
+
+def _load_krx_stock_names() -> Dict[str, str]:
+    """
+    KRX 종목명 목록을 반환합니다.
+    data_cache_dir의 파일이 오늘 만들어진 것이면 그대로 읽고, 아니면 pykrx로 다시 받습니다.
+    갱신은 _stock_names_lock 밖에서 한 스레드만 수행하고 끝나면 목록을 교체하므로,
+    그동안 다른 스레드는 이전 목록을 사용합니다 (이전 목록이 없을 때만 갱신을 기다림).
+    갱신에 실패하면 KRX_STOCK_NAMES_RETRY_SECONDS 동안은 다시 받지 않고 이전 목록을 씁니다.
+    """
+    global _stock_names, _stock_names_date, _stock_names_failed_at
+    today = date.today()
+    with _stock_names_lock:
+        current, current_date = _stock_names, _stock_names_date
+        backing_off = _stock_names_backing_off()
+    if current is not None and current_date == today:
+        return current
+    if backing_off:
+        return current or {}
+    if not _stock_names_refresh_lock.acquire(blocking=current is None):
+        return current
+
+    try:
+        with _stock_names_lock:
+            # 기다리는 동안 다른 스레드가 갱신했거나 갱신에 실패했을 수 있음
+            if _stock_names is not None and _stock_names_date == today:
+                return _stock_names
+            if _stock_names_backing_off():
+                return _stock_names or {}
+            current = _stock_names
+
+        path = _stock_names_path()
+        cached = None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            is_fresh = datetime.fromtimestamp(os.path.getmtime(path)).date() == today
+        except (OSError, ValueError):
+            is_fresh = False
+
+        names = cached if is_fresh else None
+        if names is None:
+            try:
+                names = _fetch_krx_stock_names()
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(names, f, ensure_ascii=False, sort_keys=True)
+                os.replace(tmp_path, path)
+            except Exception as e:
+                print(f"Failed to refresh KRX stock names: {e}")
+                # 갱신에 실패하면 이전 목록을 그대로 사용하고
+                # KRX_STOCK_NAMES_RETRY_SECONDS가 지난 뒤에 다시 시도
+                fallback = current or cached or {}
+                with _stock_names_lock:
+                    _stock_names_failed_at = time.monotonic()
+                    if _stock_names is None and fallback:
+                        _stock_names = fallback
+                return fallback
+
+        with _stock_names_lock:
+            _stock_names, _stock_names_date = names, today
+            _stock_names_failed_at = None
+        return names
+    finally:
+        _stock_names_refresh_lock.release()
+
+
+def get_korea_stock_name(ticker: str):
+    """
+    한국 주식 티커에 대해 종목 이름을 반환합니다. (pykrx 사용)
+    KRX 종목 목록은 프로세스당 하루 한 번만 불러옵니다.
+    """
+    if not is_korea_stock(ticker):
+        return ""
+    ticker_name = _load_krx_stock_names().get(ticker)
+    if ticker_name:
+        return ticker_name
+    # 목록에 없는 종목(신규 상장 등)은 개별 조회
+    try:
+        from pykrx import stock
+        return stock.get_market_ticker_name(ticker)
+    except Exception:
+        return ""
+
+
+def get_stock_name(ticker: str):
+    """
+    주식 티커에 대해 종목 이름을 반환합니다.
+    한국 주식이면 KRX 종목 목록, 아니면 yfinance를 사용합니다.
+    """
+    if is_korea_stock(ticker):
+        return get_korea_stock_name(ticker)
+    try:
+        info = yf.Ticker(ticker).info
+        # shortName이 있으면 그걸, 없으면 longName, 둘 다 없으면 ""
+        return info.get("shortName") or info.get("longName") or ""
+    except Exception:
+        return ""
@@ -1,8 +1,15 @@
+import asyncio
 import os
 import json
+import inspect
+import threading
+import time
 import pandas as pd
+from collections import OrderedDict
+from concurrent.futures import Future
 from datetime import date, timedelta, datetime
-from typing import Annotated
+from functools import wraps
+from typing import Annotated, Any, Awaitable, Callable, Dict, Hashable, Optional
 
 SavePathType = Annotated[str, "File path to save data. If None, data is not saved."]
 
@@ -37,3 +44,191 @@ def get_next_weekday(date):
         return next_weekday
     else:
         return date
+
+
+def _running_loop():
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+class SingleFlightCache:
+    """
+    TTL and size bounded memo. Concurrent callers asking for the same key while
+    it is being computed wait for that one computation instead of starting their own.
+    A sync caller on the event loop thread that owns an async computation cannot
+    wait for it (the loop would never run again), so it computes its own value.
+    """
+
+    def __init__(self, ttl_seconds: float = 600, maxsize: int = 128):
+        self.ttl_seconds = ttl_seconds
+        self.maxsize = maxsize
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._inflight = {}  # key -> Future
+        self._flight_loops = {}  # key -> event loop running an async owner
+        self._lock = threading.Lock()
+
+    def _claim(self, key: Hashable, loop=None):
+        """
+        (cached value, None) on a hit, else (None, (future, is_owner, owner_loop)) for
+        the flight. loop is the caller's event loop when it computes asynchronously.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                return entry[1], None
+            future = self._inflight.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self._inflight[key] = future
+                if loop is not None:
+                    self._flight_loops[key] = loop
+            owner_loop = self._flight_loops.get(key)
+        return None, (future, is_owner, owner_loop)
+
+    def _fail(self, key: Hashable, future: Future, error: BaseException):
+        with self._lock:
+            self._inflight.pop(key, None)
+            self._flight_loops.pop(key, None)
+        future.set_exception(error)
+
+    def _finish(self, key: Hashable, future: Future, value: Any, cache_if):
+        with self._lock:
+            self._inflight.pop(key, None)
+            self._flight_loops.pop(key, None)
+            if cache_if is None or cache_if(value):
+                self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        future.set_result(value)
+
+    def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Any],
+        cache_if: Optional[Callable[[Any], bool]] = None,
+    ):
+        value, flight = self._claim(key)
+        if flight is None:
+            return value
+        future, is_owner, owner_loop = flight
+        if not is_owner:
+            if owner_loop is not None and owner_loop is _running_loop():
+                # blocking here would deadlock the loop the owner needs to finish
+                return compute()
+            return future.result()
+
+        try:
+            value = compute()
+        except BaseException as e:
+            self._fail(key, future, e)
+            raise
+        self._finish(key, future, value, cache_if)
+        return value
+
+    async def aget_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[Any]],
+        cache_if: Optional[Callable[[Any], bool]] = None,
+    ):
+        """
+        get_or_compute for coroutines. A computation already running for the key,
+        in a thread or in another task, is awaited without blocking the event loop.
+        """
+        value, flight = self._claim(key, asyncio.get_running_loop())
+        if flight is None:
+            return value
+        future, is_owner, _ = flight
+        if not is_owner:
+            return await asyncio.wrap_future(future)
+
+        try:
+            value = await compute()
+        except BaseException as e:
+            self._fail(key, future, e)
+            raise
+        self._finish(key, future, value, cache_if)
+        return value
+
+    def get(self, key: Hashable, default: Any = None):
+        """Cached value for key (refreshing its LRU position), without computing it."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                return default
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: Hashable, value: Any):
+        """Store a value computed outside get_or_compute (e.g. by a batch call)."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def single_flight(
+    ttl_seconds: float = 600,
+    maxsize: int = 128,
+    cache_if: Optional[Callable[[Any], bool]] = None,
+    normalize: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+    cache: Optional[SingleFlightCache] = None,
+):
+    """
+    Decorator memoizing a function on its bound arguments with a SingleFlightCache.
+
+    normalize maps the bound arguments to canonical values, which are used both
+    for the key and for the call. Passing another function's `cache` lets a sync
+    function and its async version share one memo (their parameter names must
+    match). Coroutine functions are supported.
+    """
+
+    def decorator(func):
+        memo = cache if cache is not None else SingleFlightCache(ttl_seconds, maxsize)
+        signature = inspect.signature(func)
+
+        def bind(args, kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            if normalize is not None:
+                bound.arguments.update(normalize(dict(bound.arguments)))
+            # lists (e.g. indicator sets) are keyed by their contents
+            key = tuple(
+                (name, tuple(value) if isinstance(value, list) else value)
+                for name, value in bound.arguments.items()
+            )
+            return key, bound
+
+        if inspect.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                key, bound = bind(args, kwargs)
+                return await memo.aget_or_compute(
+                    key, lambda: func(*bound.args, **bound.kwargs), cache_if
+                )
+
+            async_wrapper.cache = memo
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key, bound = bind(args, kwargs)
+            return memo.get_or_compute(
+                key, lambda: func(*bound.args, **bound.kwargs), cache_if
+            )
+
+        wrapper.cache = memo
+        return wrapper
+
+    return decorator
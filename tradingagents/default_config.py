@@ -8,6 +8,22 @@ DEFAULT_CONFIG = {
         os.path.abspath(os.path.join(os.path.dirname(__file__), ".")),
         "dataflows/data_cache",
     ),
+    # Price store files not refreshed for this many days are evicted
+    "price_store_max_age_days": 30,
+    # Finnhub quota shared by every analysis in this process (free tier: 60/min)
+    "finnhub_requests_per_minute": 60,
+    "finnhub_max_retries": 3,
+    "finnhub_timeout": 30,
+    # On-disk API response cache: ranges ending before today never expire,
+    # ranges touching today are reused for response_cache_ttl_seconds
+    "response_cache_ttl_seconds": 900,
+    "response_cache_max_mb": 256,
+    # Persistent LLM response cache: None (off), "read_through", "record_only"
+    # or "replay_only" (no LLM calls; unrecorded prompts fail).
+    # llm_cache_path: SQLite file for the recordings; None -> data_cache_dir
+    "llm_cache": None,
+    "llm_cache_path": None,
+    "llm_cache_max_mb": 512,
     # LLM settings
     "llm_provider": "openai",
     "deep_think_llm": "gpt-4o",
@@ -17,7 +33,38 @@ DEFAULT_CONFIG = {
     "max_debate_rounds": 1,
     "max_risk_discuss_rounds": 1,
     "max_recur_limit": 100,
+    # Keep the last debate_keep_turns debate turns verbatim and fold older ones into
+    # a running summary, so each debate prompt's history stays near the token budget.
+    # The budget is one number for every node, or per graph node name, e.g.
+    # {"Research Manager": 6000, "Risk Judge": 6000, "default": 3000}
+    "debate_compaction": False,
+    "debate_keep_turns": 2,
+    "debate_token_budget": 3000,
+    # Agent memories (past situations and lessons) live in memory for the process,
+    # one collection per session_id when set. memory_persist True stores them in one
+    # on-disk collection per memory name and embedding model, shared by every run and
+    # session in memory_dir; None -> data_cache_dir
+    "memory_persist": False,
+    "memory_dir": None,
+    # "chroma", or "numpy" (normalized embedding matrix in a memory-mapped .npy
+    # plus a .json sidecar; no chromadb needed)
+    "memory_backend": "chroma",
+    # "openai" (backend_url embeddings endpoint) or "hashing" (offline, no network)
+    "memory_embedder": "openai",
+    "hashing_embedding_dim": 512,
     # Tool settings
     # OJH
     "online_tools": True,
+    # Fetch prices, indicators, news, insider data and statements concurrently
+    # before the analysts run so their tool calls are served from cache
+    "data_prefetch": False,
+    # Run the selected analysts as concurrent branches (each with its own
+    # message history) instead of one after another
+    "parallel_analysts": False,
+    # Analyses run at once by TradingAgentsGraph.propagate_many
+    "batch_max_concurrency": 4,
+    # Save graph state after every node (SQLite, needs langgraph-checkpoint-sqlite)
+    # so a failed run resumes from its last completed node; None -> data_cache_dir
+    "checkpointing": False,
+    "checkpoint_db": None,
 }
@@ -7,6 +7,7 @@ from .propagation import Propagator
 from .reflection import Reflector
 from .signal_processing import SignalProcessor
 from .confidence_processing import ConfidenceProcessor
+from .data_prefetch import DataPrefetcher
 
 __all__ = [
     "TradingAgentsGraph",
@@ -15,5 +16,6 @@ __all__ = [
     "Propagator",
     "Reflector",
     "SignalProcessor",
-    "ConfidenceProcessor"
+    "ConfidenceProcessor",
+    "DataPrefetcher",
 ]
@@ -0,0 +1,64 @@
+# TradingAgents/graph/checkpointing.py
+
+import asyncio
+import os
+import sqlite3
+from typing import Any, Dict
+
+CHECKPOINT_DB_FILE = "graph_checkpoints.sqlite3"
+
+
+def _checkpoint_db_path(config: Dict[str, Any]) -> str:
+    return config.get("checkpoint_db") or os.path.join(
+        config["data_cache_dir"], CHECKPOINT_DB_FILE
+    )
+
+
+def create_checkpointer(config: Dict[str, Any]):
+    """
+    SQLite checkpointer for the trading graph (requires langgraph-checkpoint-sqlite).
+
+    Every completed node is saved under the run id (thread_id), so a run that dies
+    part way can be resumed from the last completed node instead of from START.
+    The langgraph SqliteSaver is sync only; its async methods are served here from
+    a worker thread so astream/apropagate can use the same database.
+    """
+    try:
+        from langgraph.checkpoint.sqlite import SqliteSaver
+    except ImportError as e:
+        raise ImportError(
+            "checkpointing requires langgraph-checkpoint-sqlite: "
+            "pip install langgraph-checkpoint-sqlite"
+        ) from e
+
+    class ThreadedSqliteSaver(SqliteSaver):
+        async def aget_tuple(self, config):
+            return await asyncio.to_thread(self.get_tuple, config)
+
+        async def alist(self, config, *, filter=None, before=None, limit=None):
+            checkpoints = await asyncio.to_thread(
+                lambda: list(
+                    self.list(config, filter=filter, before=before, limit=limit)
+                )
+            )
+            for checkpoint in checkpoints:
+                yield checkpoint
+
+        async def aput(self, config, checkpoint, metadata, new_versions):
+            return await asyncio.to_thread(
+                self.put, config, checkpoint, metadata, new_versions
+            )
+
+        async def aput_writes(self, config, writes, task_id, task_path=""):
+            return await asyncio.to_thread(
+                self.put_writes, config, writes, task_id, task_path
+            )
+
+        async def adelete_thread(self, thread_id):
+            return await asyncio.to_thread(self.delete_thread, thread_id)
+
+    path = _checkpoint_db_path(config)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    # the saver serializes access with its own lock, so one connection is shared
+    conn = sqlite3.connect(path, check_same_thread=False)
+    return ThreadedSqliteSaver(conn)
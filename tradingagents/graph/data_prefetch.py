@@ -0,0 +1,134 @@
+# TradingAgents/graph/data_prefetch.py
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Tuple
+
+import tradingagents.dataflows.interface as interface
+from tradingagents.dataflows.ticker_utils import get_korea_stock_name, is_korea_stock
+
+# Indicator set requested up front for the market analyst (a subset of BEST_IND_PARAMS)
+DEFAULT_INDICATORS = [
+    "close_50_sma",
+    "close_200_sma",
+    "close_5_ema",
+    "macd",
+    "macds",
+    "macdh",
+    "rsi",
+    "boll",
+    "boll_ub",
+    "boll_lb",
+    "atr",
+    "vwma",
+]
+assert set(DEFAULT_INDICATORS) <= set(interface.BEST_IND_PARAMS), (
+    "DEFAULT_INDICATORS must only name indicators in BEST_IND_PARAMS"
+)
+
+# Finnhub company news look-back fetched up front; only the prefetch uses this wider
+# window, analyst calls fetch exactly the range they ask for
+NEWS_LOOK_BACK_DAYS = 30
+
+
+class DataPrefetcher:
+    """
+    Gathers the standard data bundle for (ticker, trade date) concurrently before the
+    analysts run, so the analysts' own tool calls are served locally.
+
+    The analysts choose indicator sets, look-backs and queries themselves, so exact
+    tool-result hits are not relied on. The jobs warm the layers those calls share:
+    the price store (every indicator set and price window reads from it), the
+    response cache (Finnhub news for the NEWS_LOOK_BACK_DAYS window; insider data
+    and statements use the Toolkit's fixed arguments), and the tool result memo, which sync and async tools share on
+    normalized arguments (ticker case, query whitespace, statement frequency).
+    """
+
+    def __init__(self, config: Dict[str, Any], max_workers: int = 8):
+        self.config = config
+        self.max_workers = max_workers
+
+    def build_jobs(
+        self, ticker: str, trade_date: str, selected_analysts: List[str]
+    ) -> List[Tuple[str, Callable, tuple]]:
+        """(name, function, args) for every fetch the selected analysts usually need."""
+        online = self.config["online_tools"]
+        jobs = []
+
+        if "market" in selected_analysts:
+            # also refreshes the price store the analyst's other indicator/price calls read
+            jobs.append(
+                (
+                    "indicators",
+                    interface.get_stock_stats_indicators_window_batch,
+                    (ticker, DEFAULT_INDICATORS, trade_date, 30, online),
+                )
+            )
+
+        if "social" in selected_analysts and not online:
+            jobs.append(
+                ("reddit company news", interface.get_reddit_company_news, (ticker, trade_date, 7, 5))
+            )
+
+        if "news" in selected_analysts:
+            if online:
+                jobs.append(
+                    ("finnhub news", interface.get_finnhub_news, (ticker, trade_date, NEWS_LOOK_BACK_DAYS))
+                )
+                # news is searched by ticker or, for Korean stocks, by company name
+                queries = [ticker]
+                if is_korea_stock(ticker):
+                    name = get_korea_stock_name(ticker)
+                    if name and name != ticker:
+                        queries.append(name)
+                for query in queries:
+                    jobs.append((f"google news ({query})", interface.get_google_news, (query, trade_date, 30)))
+                    jobs.append((f"naver news ({query})", interface.get_naver_news_sync, (query, trade_date, 7)))
+            else:
+                jobs.append(("reddit global news", interface.get_reddit_global_news, (trade_date, 7, 5)))
+
+        # web search tools (get_*_openai) are LLM calls, so they are left to the analysts
+        if "fundamentals" in selected_analysts and online:
+            jobs.extend(
+                [
+                    ("insider sentiment", interface.get_finnhub_company_insider_sentiment, (ticker, trade_date, 30)),
+                    ("insider transactions", interface.get_finnhub_company_insider_transactions, (ticker, trade_date, 30)),
+                    ("balance sheet", interface.get_simfin_balance_sheet, (ticker, "annual", trade_date)),
+                    ("cash flow", interface.get_simfin_cashflow, (ticker, "annual", trade_date)),
+                    ("income statement", interface.get_simfin_income_statements, (ticker, "annual", trade_date)),
+                ]
+            )
+            if is_korea_stock(ticker):
+                jobs.append(("opendart report", interface.get_opendart_business_report, (ticker, trade_date)))
+
+        return jobs
+
+    def prefetch(
+        self, ticker: str, trade_date: str, selected_analysts: List[str]
+    ) -> Dict[str, bool]:
+        """Run all jobs concurrently; returns job name -> whether it produced data."""
+        jobs = self.build_jobs(ticker, trade_date, selected_analysts)
+        status = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(func, *args): name for name, func, args in jobs
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    status[name] = bool(future.result())
+                except Exception as e:
+                    # a failed prefetch only means the analyst fetches it itself
+                    print(f"[Data Prefetch] {name} 실패: {e}")
+                    status[name] = False
+        print(f"[Data Prefetch] {ticker} {trade_date}: {status}")
+        return status
+
+    def create_node(self, selected_analysts: List[str]):
+        def data_prefetch_node(state):
+            self.prefetch(
+                state["company_of_interest"], state["trade_date"], selected_analysts
+            )
+            # the bundle lives in the caches; nothing is added to the graph state
+            return {}
+
+        return data_prefetch_node
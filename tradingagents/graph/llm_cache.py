@@ -0,0 +1,130 @@
+# TradingAgents/graph/llm_cache.py
+
+import json
+import os
+from typing import Any, Dict, Optional
+
+from langchain_core.caches import BaseCache
+from langchain_core.messages import message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, Generation
+
+from tradingagents.dataflows.http_utils import ResponseCache
+
+LLM_CACHE_FILE = "llm_cache.sqlite3"
+LLM_CACHE_NAMESPACE = "llm"
+LLM_CACHE_MODES = ("read_through", "record_only", "replay_only")
+
+
+class LLMCacheMiss(LookupError):
+    """Raised in replay_only mode when a prompt has no recorded response."""
+
+
+def _normalize_prompt(prompt: str) -> str:
+    """Drop message ids (random per run) so the same conversation maps to one key."""
+    try:
+        messages = json.loads(prompt)
+    except ValueError:
+        return prompt
+    if not isinstance(messages, list):
+        return prompt
+    for message in messages:
+        if isinstance(message, dict) and isinstance(message.get("kwargs"), dict):
+            message["kwargs"].pop("id", None)
+    return json.dumps(messages, sort_keys=True)
+
+
+def _generation_to_dict(generation: Generation) -> Dict[str, Any]:
+    data = {"text": generation.text, "generation_info": generation.generation_info}
+    if isinstance(generation, ChatGeneration):
+        message = generation.message
+        if message.id is not None:
+            # a replayed message gets a fresh run id instead of the recorded one
+            message = message.model_copy(update={"id": None})
+        data["message"] = message_to_dict(message)
+    return data
+
+
+def _generation_from_dict(data: Dict[str, Any]) -> Generation:
+    if "message" in data:
+        return ChatGeneration(
+            message=messages_from_dict([data["message"]])[0],
+            generation_info=data["generation_info"],
+        )
+    return Generation(text=data["text"], generation_info=data["generation_info"])
+
+
+class LLMResponseCache(BaseCache):
+    """
+    Content-addressed cache of chat model responses, set as the `cache` of the
+    quick/deep thinking LLMs.
+
+    LangChain passes every lookup the serialized messages and an llm_string that
+    covers the model, its parameters and any bound tools, so the key is the hash of
+    both. Entries never expire and are stored in a ResponseCache SQLite file, which
+    evicts the least recently used entries once max_bytes is exceeded.
+
+    Modes:
+        read_through: return a recorded response, otherwise call the LLM and record it
+        record_only: always call the LLM and record (refreshes existing entries)
+        replay_only: never call the LLM; a prompt with no recording raises LLMCacheMiss
+    """
+
+    def __init__(self, store: ResponseCache, mode: str = "read_through"):
+        if mode not in LLM_CACHE_MODES:
+            raise ValueError(
+                f"Unsupported llm_cache mode: {mode} (choose from {', '.join(LLM_CACHE_MODES)})"
+            )
+        self.store = store
+        self.mode = mode
+
+    def _key(self, prompt: str, llm_string: str) -> str:
+        return ResponseCache.make_key(
+            LLM_CACHE_NAMESPACE,
+            {"prompt": _normalize_prompt(prompt), "llm_string": llm_string},
+        )
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[list]:
+        if self.mode == "record_only":
+            return None
+        found, value = self.store.get(LLM_CACHE_NAMESPACE, self._key(prompt, llm_string))
+        if found:
+            return [_generation_from_dict(generation) for generation in value]
+        if self.mode == "replay_only":
+            raise LLMCacheMiss(
+                "No recorded LLM response for this prompt (llm_cache mode is replay_only)"
+            )
+        return None
+
+    def update(self, prompt: str, llm_string: str, return_val: list) -> None:
+        if self.mode == "replay_only":
+            return
+        generations = [_generation_to_dict(generation) for generation in return_val]
+        self.store.set(
+            LLM_CACHE_NAMESPACE, self._key(prompt, llm_string), generations, immutable=True
+        )
+
+    def clear(self, **kwargs: Any) -> None:
+        self.store.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return self.store.stats()
+
+
+def create_llm_cache(config: Dict[str, Any]) -> Optional[LLMResponseCache]:
+    """
+    LLM cache for config["llm_cache"] (a mode name), or None when it is not set.
+    Stored in config["llm_cache_path"] (None -> data_cache_dir/llm_cache.sqlite3).
+    """
+    mode = config.get("llm_cache")
+    if not mode:
+        return None
+    path = config.get("llm_cache_path") or os.path.join(
+        config["data_cache_dir"], LLM_CACHE_FILE
+    )
+    # recorded responses never expire; only the size bound evicts them
+    store = ResponseCache(
+        path,
+        ttl_seconds=None,
+        max_bytes=config.get("llm_cache_max_mb", 512) * 1024 * 1024,
+    )
+    return LLMResponseCache(store, mode)
@@ -24,7 +24,14 @@ class Propagator:
             "company_of_interest": company_name,
             "trade_date": str(trade_date),
             "investment_debate_state": InvestDebateState(
-                {"history": "", "current_response": "", "count": 0}
+                {
+                    "history": "",
+                    "current_response": "",
+                    "count": 0,
+                    "turns": [],
+                    "summary": "",
+                    "summarized_turns": 0,
+                }
             ),
             "risk_debate_state": RiskDebateState(
                 {
@@ -33,6 +40,9 @@ class Propagator:
                     "current_safe_response": "",
                     "current_neutral_response": "",
                     "count": 0,
+                    "turns": [],
+                    "summary": "",
+                    "summarized_turns": 0,
                 }
             ),
             "market_report": "",
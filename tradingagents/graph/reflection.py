@@ -1,8 +1,18 @@
 # TradingAgents/graph/reflection.py
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any
 from langchain_openai import ChatOpenAI
 
+# memory key -> (component type, state path of the report reflected on)
+REFLECTION_COMPONENTS = {
+    "bull": ("BULL", ("investment_debate_state", "bull_history")),
+    "bear": ("BEAR", ("investment_debate_state", "bear_history")),
+    "trader": ("TRADER", ("trader_investment_plan",)),
+    "invest_judge": ("INVEST JUDGE", ("investment_debate_state", "judge_decision")),
+    "risk_manager": ("RISK JUDGE", ("risk_debate_state", "judge_decision")),
+}
+
 
 class Reflector:
     """Handles reflection on decisions and updating memory."""
@@ -121,3 +131,43 @@ class Reflector:
             "RISK JUDGE", judge_decision, situation, returns_losses
         )
         risk_manager_memory.add_situations([(situation, result)])
+
+    def reflect_all(self, current_state, returns_losses, memories, max_workers=None):
+        """
+        Reflect on every component in memories (REFLECTION_COMPONENTS key -> memory).
+
+        The reflections are independent LLM calls, so they run concurrently; the
+        memory writes happen afterwards, once all calls have returned. A failed
+        reflection does not discard the others: the successful ones are stored
+        and the first error is raised after that.
+        """
+        situation = self._extract_current_situation(current_state)
+
+        def reflect(key):
+            component_type, path = REFLECTION_COMPONENTS[key]
+            report = current_state
+            for field in path:
+                report = report[field]
+            return self._reflect_on_component(
+                component_type, report, situation, returns_losses
+            )
+
+        with ThreadPoolExecutor(max_workers=max_workers or len(memories) or 1) as executor:
+            futures = {key: executor.submit(reflect, key) for key in memories}
+
+        results = {}
+        errors = []
+        for key, future in futures.items():
+            try:
+                results[key] = future.result()
+            except Exception as e:
+                print(f"[Reflection] {key} 회고 실패: {e}")
+                errors.append(e)
+
+        # 모든 메모리가 같은 상황 텍스트를 임베딩하므로 공유 임베딩 캐시로 한 번만 계산됨
+        for key, result in results.items():
+            memories[key].add_situations([(situation, result)])
+
+        if errors:
+            raise errors[0]
+        return results
@@ -3,6 +3,7 @@
 import os
 from pathlib import Path
 import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import date
 from typing import Dict, Any, Tuple, List, Optional
 
@@ -21,6 +22,7 @@ from tradingagents.agents.utils.agent_states import (
     RiskDebateState,
 )
 from tradingagents.dataflows.interface import set_config
+from tradingagents.dataflows.http_utils import async_http_session
 
 from .conditional_logic import ConditionalLogic
 from .setup import GraphSetup
@@ -28,6 +30,8 @@ from .propagation import Propagator
 from .reflection import Reflector
 from .signal_processing import SignalProcessor
 from .confidence_processing import ConfidenceProcessor
+from .checkpointing import create_checkpointer
+from .llm_cache import create_llm_cache
 
 
 class TradingAgentsGraph:
@@ -64,16 +68,19 @@ class TradingAgentsGraph:
             exist_ok=True,
         )
 
+        # Optional persistent LLM response cache (read_through / record_only / replay_only)
+        self.llm_cache = create_llm_cache(self.config)
+
         # Initialize LLMs
         if self.config["llm_provider"].lower() == "openai" or self.config["llm_provider"] == "ollama" or self.config["llm_provider"] == "openrouter":
-            self.deep_thinking_llm = ChatOpenAI(model=self.config["deep_think_llm"], base_url=self.config["backend_url"])
-            self.quick_thinking_llm = ChatOpenAI(model=self.config["quick_think_llm"], base_url=self.config["backend_url"])
+            self.deep_thinking_llm = ChatOpenAI(model=self.config["deep_think_llm"], base_url=self.config["backend_url"], cache=self.llm_cache)
+            self.quick_thinking_llm = ChatOpenAI(model=self.config["quick_think_llm"], base_url=self.config["backend_url"], cache=self.llm_cache)
         elif self.config["llm_provider"].lower() == "anthropic":
-            self.deep_thinking_llm = ChatAnthropic(model=self.config["deep_think_llm"], base_url=self.config["backend_url"])
-            self.quick_thinking_llm = ChatAnthropic(model=self.config["quick_think_llm"], base_url=self.config["backend_url"])
+            self.deep_thinking_llm = ChatAnthropic(model=self.config["deep_think_llm"], base_url=self.config["backend_url"], cache=self.llm_cache)
+            self.quick_thinking_llm = ChatAnthropic(model=self.config["quick_think_llm"], base_url=self.config["backend_url"], cache=self.llm_cache)
         elif self.config["llm_provider"].lower() == "google":
-            self.deep_thinking_llm = ChatGoogleGenerativeAI(model=self.config["deep_think_llm"])
-            self.quick_thinking_llm = ChatGoogleGenerativeAI(model=self.config["quick_think_llm"])
+            self.deep_thinking_llm = ChatGoogleGenerativeAI(model=self.config["deep_think_llm"], cache=self.llm_cache)
+            self.quick_thinking_llm = ChatGoogleGenerativeAI(model=self.config["quick_think_llm"], cache=self.llm_cache)
         else:
             raise ValueError(f"Unsupported LLM provider: {self.config['llm_provider']}")
         
@@ -113,8 +120,15 @@ class TradingAgentsGraph:
         self.ticker = None
         self.log_states_dict = {}  # date to full state dict
 
+        # Optional SQLite checkpoints so interrupted runs resume where they stopped
+        self.checkpointer = None
+        if self.config.get("checkpointing", False):
+            self.checkpointer = create_checkpointer(self.config)
+
         # Set up the graph
-        self.graph = self.graph_setup.setup_graph(selected_analysts)
+        self.graph = self.graph_setup.setup_graph(
+            selected_analysts, checkpointer=self.checkpointer
+        )
 
     def _create_tool_nodes(self) -> Dict[str, ToolNode]:
         """Create tool nodes for different data sources."""
@@ -124,9 +138,11 @@ class TradingAgentsGraph:
                     # online tools
                     self.toolkit.get_YFin_data_online,
                     self.toolkit.get_stockstats_indicators_report_online,
+                    self.toolkit.get_stockstats_indicators_batch_report_online,
                     # offline tools
                     self.toolkit.get_YFin_data,
                     self.toolkit.get_stockstats_indicators_report,
+                    self.toolkit.get_stockstats_indicators_batch_report,
                 ]
             ),
             "social": ToolNode(
@@ -163,17 +179,131 @@ class TradingAgentsGraph:
             ),
         }
 
-    def propagate(self, company_name, trade_date):
-        """Run the trading agents graph for a company on a specific date."""
+    def propagate(self, company_name, trade_date, run_id=None):
+        """Run the trading agents graph for a company on a specific date.
+
+        With checkpointing enabled, run_id (default "<ticker>_<date>") names the run;
+        if an earlier run with that id did not finish, it resumes from its last
+        completed node.
+        """
 
         self.ticker = company_name
 
+        final_state = self._run_graph(company_name, trade_date, run_id)
+
+        # Store current state for reflection
+        self.curr_state = final_state
+
+        # Log state
+        self._log_state(trade_date, final_state)
+
+        # Return decision and processed signal
+        return final_state, self.process_signal(final_state["final_trade_decision"])
+
+    def propagate_many(self, jobs, max_concurrency=None):
+        """
+        Run the graph for many (company_name, trade_date) jobs.
+
+        All jobs share this instance's LLM clients, memories, toolkit caches and
+        compiled graph; up to max_concurrency of them run at once. Results are
+        yielded as jobs finish, as dicts with ticker, trade_date, final_state,
+        decision and error (a failed job does not stop the batch).
+        Unlike propagate, curr_state is not updated, so reflect per job is not
+        available after a batch.
+        """
+        max_concurrency = max_concurrency or self.config.get("batch_max_concurrency", 4)
+
+        def run_job(company_name, trade_date):
+            final_state = self._run_graph(company_name, trade_date)
+            self._write_state_log(
+                company_name,
+                trade_date,
+                {str(trade_date): self._state_log_entry(final_state)},
+            )
+            return final_state, self.process_signal(final_state["final_trade_decision"])
+
+        executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        try:
+            futures = {
+                executor.submit(run_job, company_name, trade_date): (company_name, trade_date)
+                for company_name, trade_date in jobs
+            }
+            for future in as_completed(futures):
+                company_name, trade_date = futures[future]
+                result = {
+                    "ticker": company_name,
+                    "trade_date": str(trade_date),
+                    "final_state": None,
+                    "decision": None,
+                    "error": None,
+                }
+                try:
+                    result["final_state"], result["decision"] = future.result()
+                except Exception as e:
+                    print(f"Batch job {company_name} {trade_date} failed: {e}")
+                    result["error"] = e
+                yield result
+        finally:
+            # a consumer that stops early should not wait for jobs not yet started
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _initial_input(self, company_name, trade_date, run_id=None):
+        """Initial state, graph args and checkpoint thread id (None without checkpoints)."""
+
         # Initialize state
         init_agent_state = self.propagator.create_initial_state(
             company_name, trade_date
         )
         args = self.propagator.get_graph_args()
 
+        if self.checkpointer is None:
+            return init_agent_state, args, None
+
+        run_id = run_id or f"{company_name}_{trade_date}"
+        args["config"]["configurable"] = {"thread_id": run_id}
+        return init_agent_state, args, run_id
+
+    def _graph_input(self, company_name, trade_date, run_id=None):
+        """Initial state and graph args for a run, or (None, args) to resume one."""
+
+        init_agent_state, args, run_id = self._initial_input(
+            company_name, trade_date, run_id
+        )
+        if run_id is None:
+            return init_agent_state, args
+
+        snapshot = self.graph.get_state(args["config"])
+        if snapshot.next:
+            print(f"Resuming run {run_id} at {', '.join(snapshot.next)}")
+            return None, args
+        if snapshot.values:
+            # the previous run with this id finished; start over on a clean thread
+            self.checkpointer.delete_thread(run_id)
+        return init_agent_state, args
+
+    async def _agraph_input(self, company_name, trade_date, run_id=None):
+        """Async version of _graph_input (checkpoint reads do not block the event loop)."""
+
+        init_agent_state, args, run_id = self._initial_input(
+            company_name, trade_date, run_id
+        )
+        if run_id is None:
+            return init_agent_state, args
+
+        snapshot = await self.graph.aget_state(args["config"])
+        if snapshot.next:
+            print(f"Resuming run {run_id} at {', '.join(snapshot.next)}")
+            return None, args
+        if snapshot.values:
+            # the previous run with this id finished; start over on a clean thread
+            await self.checkpointer.adelete_thread(run_id)
+        return init_agent_state, args
+
+    def _run_graph(self, company_name, trade_date, run_id=None):
+        """Run the graph once and return the final state."""
+
+        init_agent_state, args = self._graph_input(company_name, trade_date, run_id)
+
         if self.debug:
             # Debug mode with tracing
             trace = []
@@ -184,10 +314,47 @@ class TradingAgentsGraph:
                     chunk["messages"][-1].pretty_print()
                     trace.append(chunk)
 
+            return trace[-1]
+
+        # Standard mode without tracing
+        return self.graph.invoke(init_agent_state, **args)
+
+    async def astream(self, company_name, trade_date, run_id=None):
+        """
+        Async iterator over the graph's state values for one analysis.
+        Nodes await their LLM and tool calls, so many analyses can share one event loop.
+        """
+        init_agent_state, args = await self._agraph_input(
+            company_name, trade_date, run_id
+        )
+
+        # one pooled async HTTP client per API for the run, closed when it ends
+        async with async_http_session():
+            async for chunk in self.graph.astream(init_agent_state, **args):
+                yield chunk
+
+    async def apropagate(self, company_name, trade_date, run_id=None):
+        """Async version of propagate."""
+
+        self.ticker = company_name
+
+        if self.debug:
+            # Debug mode with tracing
+            trace = []
+            async for chunk in self.astream(company_name, trade_date, run_id):
+                if len(chunk["messages"]) == 0:
+                    pass
+                else:
+                    chunk["messages"][-1].pretty_print()
+                    trace.append(chunk)
+
             final_state = trace[-1]
         else:
-            # Standard mode without tracing
-            final_state = self.graph.invoke(init_agent_state, **args)
+            init_agent_state, args = await self._agraph_input(
+                company_name, trade_date, run_id
+            )
+            async with async_http_session():
+                final_state = await self.graph.ainvoke(init_agent_state, **args)
 
         # Store current state for reflection
         self.curr_state = final_state
@@ -196,11 +363,17 @@ class TradingAgentsGraph:
         self._log_state(trade_date, final_state)
 
         # Return decision and processed signal
-        return final_state, self.process_signal(final_state["final_trade_decision"])
+        return final_state, await self.signal_processor.aprocess_signal(
+            final_state["final_trade_decision"]
+        )
 
     def _log_state(self, trade_date, final_state):
         """Log the final state to a JSON file."""
-        self.log_states_dict[str(trade_date)] = {
+        self.log_states_dict[str(trade_date)] = self._state_log_entry(final_state)
+        self._write_state_log(self.ticker, trade_date, self.log_states_dict)
+
+    def _state_log_entry(self, final_state):
+        return {
             "company_of_interest": final_state["company_of_interest"],
             "trade_date": final_state["trade_date"],
             "market_report": final_state["market_report"],
@@ -230,32 +403,30 @@ class TradingAgentsGraph:
             "final_trade_decision": final_state["final_trade_decision"],
         }
 
+    def _write_state_log(self, ticker, trade_date, log_states):
         # Save to file
-        directory = Path(f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/")
+        directory = Path(f"eval_results/{ticker}/TradingAgentsStrategy_logs/")
         directory.mkdir(parents=True, exist_ok=True)
 
         with open(
-            f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/full_states_log_{trade_date}.json",
+            f"eval_results/{ticker}/TradingAgentsStrategy_logs/full_states_log_{trade_date}.json",
             "w",
         ) as f:
-            json.dump(self.log_states_dict, f, indent=4)
+            json.dump(log_states, f, indent=4)
 
     def reflect_and_remember(self, returns_losses):
         """Reflect on decisions and update memory based on returns."""
-        self.reflector.reflect_bull_researcher(
-            self.curr_state, returns_losses, self.bull_memory
-        )
-        self.reflector.reflect_bear_researcher(
-            self.curr_state, returns_losses, self.bear_memory
-        )
-        self.reflector.reflect_trader(
-            self.curr_state, returns_losses, self.trader_memory
-        )
-        self.reflector.reflect_invest_judge(
-            self.curr_state, returns_losses, self.invest_judge_memory
-        )
-        self.reflector.reflect_risk_manager(
-            self.curr_state, returns_losses, self.risk_manager_memory
+        # 다섯 회고를 동시에 실행하고, 메모리 기록은 모두 끝난 뒤 한꺼번에 수행
+        return self.reflector.reflect_all(
+            self.curr_state,
+            returns_losses,
+            {
+                "bull": self.bull_memory,
+                "bear": self.bear_memory,
+                "trader": self.trader_memory,
+                "invest_judge": self.invest_judge_memory,
+                "risk_manager": self.risk_manager_memory,
+            },
         )
 
     def process_signal(self, full_signal):